@@ -1,4 +1,4 @@
-from qfluentwidgets import QConfig, OptionsConfigItem, ConfigItem, OptionsValidator, BoolValidator
+from qfluentwidgets import QConfig, OptionsConfigItem, ConfigItem, OptionsValidator, BoolValidator, RangeConfigItem, RangeValidator
 from qfluentwidgets import qconfig, setTheme, Theme
 
 def on_theme_changed(value):
@@ -23,6 +23,9 @@ class MyConfig(QConfig):
     enable_equilizer = ConfigItem("Playback", "EnableEqualizer", True, validator= BoolValidator(), restart=True)
     endless_play = ConfigItem("Playback", "EndlessPlay", True, validator= BoolValidator(), restart=True)
     normalize_audio = ConfigItem("Playback", "NormalizeAudio", True, validator= BoolValidator(), restart=True)
+
+    thumbnail_cache_quota = RangeConfigItem("Cache", "ThumbnailQuotaMB", 512, RangeValidator(64, 8192))
+    cover_memory_cache = RangeConfigItem("Cache", "CoverMemoryMB", 96, RangeValidator(16, 1024))
     
 cfg =  MyConfig()
 qconfig.load('config/config.json', cfg)
\ No newline at end of file
@@ -107,9 +107,29 @@ CREATE TABLE IF NOT EXISTS queue (
     song_id TEXT,
     play_position INTEGER NOT NULL,
     file_path TEXT,  -- Store file path here if is local
+    shuffle_origin INTEGER,  -- position before the queue was shuffled, NULL if it is not
+    track TEXT,  -- the queued track as JSON
     PRIMARY KEY(song_id, play_position)
 );
 
+-- 13.1 State of the queue as a whole, a single row
+CREATE TABLE IF NOT EXISTS queue_state (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    shuffle_seed INTEGER  -- seed of the shuffle, NULL if the queue is not shuffled
+);
+
+-- 13.2 Queue edits made after the queue table was written, folded into it now and then
+CREATE TABLE IF NOT EXISTS queue_journal (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    op TEXT NOT NULL,  -- insert, remove or move
+    position INTEGER NOT NULL,
+    destination INTEGER,  -- row a moved song ended up at
+    song_id TEXT,
+    file_path TEXT,
+    shuffle_origin INTEGER,
+    track TEXT  -- the inserted track as JSON
+);
+
 --14. Liked Album
 CREATE TABLE IF NOT EXISTS liked_albums (
     album_id TEXT PRIMARY KEY,
@@ -152,10 +172,94 @@ CREATE TABLE IF NOT EXISTS local_directory_songs (
     song_id TEXT,
     file_path TEXT NOT NULL,  -- Store file path here if songs can be in multiple directories
     added_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-    PRIMARY KEY (folder_id, song_id),
+    PRIMARY KEY (folder_id, file_path),  -- copies of one file share their song id
     FOREIGN KEY (folder_id) REFERENCES local_directories(id) ON DELETE CASCADE,
     FOREIGN KEY (song_id) REFERENCES local_songs(id) ON DELETE CASCADE
 );
+CREATE INDEX IF NOT EXISTS idx_local_directory_songs_song_id ON local_directory_songs(song_id);
+-- 19.1 Files seen by the local library scanner, a rescan only reads files whose size or mtime changed
+CREATE TABLE IF NOT EXISTS local_files (
+    folder_id TEXT NOT NULL,
+    path TEXT NOT NULL,
+    song_id TEXT,  -- NULL if the tags could not be read
+    size INTEGER NOT NULL,
+    mtime REAL NOT NULL,
+    inode INTEGER,  -- recognises a moved or renamed file without hashing it again
+    scanned_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (folder_id, path),
+    FOREIGN KEY (folder_id) REFERENCES local_directories(id) ON DELETE CASCADE
+);
+-- 19.2 Artists and albums of the songs in local folders, derived from their tags
+CREATE TABLE IF NOT EXISTS local_artists (
+    id TEXT PRIMARY KEY,  -- xxh3 of the key
+    key TEXT NOT NULL,  -- case and accent folded name
+    name TEXT NOT NULL,
+    song_count INTEGER NOT NULL DEFAULT 0,
+    total_duration INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_local_artists_key ON local_artists(key);
+CREATE TABLE IF NOT EXISTS local_albums (
+    id TEXT PRIMARY KEY,
+    key TEXT NOT NULL,
+    name TEXT NOT NULL,
+    artist TEXT,
+    song_count INTEGER NOT NULL DEFAULT 0,
+    total_duration INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_local_albums_key ON local_albums(key);
+CREATE TABLE IF NOT EXISTS local_song_artists (
+    song_id TEXT NOT NULL,
+    artist_id TEXT NOT NULL,
+    duration INTEGER NOT NULL DEFAULT 0,  -- of the song, subtracted again when the link goes
+    PRIMARY KEY (song_id, artist_id),
+    FOREIGN KEY (song_id) REFERENCES local_songs(id) ON DELETE CASCADE,
+    FOREIGN KEY (artist_id) REFERENCES local_artists(id) ON DELETE CASCADE
+);
+CREATE INDEX IF NOT EXISTS idx_local_song_artists_artist_id ON local_song_artists(artist_id);
+CREATE TABLE IF NOT EXISTS local_album_songs (
+    song_id TEXT PRIMARY KEY,
+    album_id TEXT NOT NULL,
+    duration INTEGER NOT NULL DEFAULT 0,
+    FOREIGN KEY (song_id) REFERENCES local_songs(id) ON DELETE CASCADE,
+    FOREIGN KEY (album_id) REFERENCES local_albums(id) ON DELETE CASCADE
+);
+CREATE INDEX IF NOT EXISTS idx_local_album_songs_album_id ON local_album_songs(album_id);
+-- counts and durations follow the links, an artist or album without songs is dropped
+CREATE TRIGGER IF NOT EXISTS local_song_artists_insert AFTER INSERT ON local_song_artists BEGIN
+    UPDATE local_artists SET song_count = song_count + 1, total_duration = total_duration + NEW.duration
+    WHERE id = NEW.artist_id;
+END;
+CREATE TRIGGER IF NOT EXISTS local_song_artists_delete AFTER DELETE ON local_song_artists BEGIN
+    UPDATE local_artists SET song_count = song_count - 1, total_duration = total_duration - OLD.duration
+    WHERE id = OLD.artist_id;
+    DELETE FROM local_artists WHERE id = OLD.artist_id AND song_count <= 0;
+END;
+CREATE TRIGGER IF NOT EXISTS local_album_songs_insert AFTER INSERT ON local_album_songs BEGIN
+    UPDATE local_albums SET song_count = song_count + 1, total_duration = total_duration + NEW.duration
+    WHERE id = NEW.album_id;
+END;
+CREATE TRIGGER IF NOT EXISTS local_album_songs_delete AFTER DELETE ON local_album_songs BEGIN
+    UPDATE local_albums SET song_count = song_count - 1, total_duration = total_duration - OLD.duration
+    WHERE id = OLD.album_id;
+    DELETE FROM local_albums WHERE id = OLD.album_id AND song_count <= 0;
+END;
+-- 19.3 Likely duplicate songs of the local folders and downloads, rebuilt by every dedupe pass
+CREATE TABLE IF NOT EXISTS local_duplicates (
+    song_id TEXT PRIMARY KEY,  -- not always a local_songs row, downloads are not scanned into it
+    group_id TEXT NOT NULL,  -- song id kept for the group
+    file_path TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_local_duplicates_group_id ON local_duplicates(group_id);
+-- 19.4 Files of the download folders read by the dedupe pass, only new and changed ones are read again
+CREATE TABLE IF NOT EXISTS download_files (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime REAL NOT NULL,
+    song_id TEXT,  -- NULL if the tags could not be read
+    title TEXT,
+    artists TEXT,
+    duration REAL
+);
 --19. Album Histroy
 CREATE TABLE IF NOT EXISTS album_history (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -59,6 +59,7 @@ def resource_path(relative_path: str) -> str:
     return os.path.join(base_path, relative_path)
 
 import asyncio
+import multiprocessing
 import os
 import sys
 from enum import Enum
@@ -88,9 +89,18 @@ from src.interfaces.about_page import AboutPage
 from src.interfaces.music_queue import MusicQueue
 from src.interfaces.playerInterface import PlayerInterface
 from src.interfaces.settingInterface import SettingInterface
+from config.config import cfg
 from src.interfaces.view.localview import LocalView
 from src.utility.check_net_connectivity import is_connected_to_internet
 from src.utility.database_utility import DatabaseManager
+from src.utility.downloader.thumbnail_service import ThumbnailService
+from src.utility.thumbnail_cache import ThumbnailCacheManager
+from src.utility.image_cache import ImageCache, ImageLoader
+from src.utility.blur_cache import BlurCache
+from src.utility.local_scanner import MetadataPool
+from src.utility.cover_extractor import CoverExtractor
+from src.utility.library_watcher import LibraryWatcher
+from src.utility.duplicate_finder import DuplicateFinder
 from src.utility.enums import ImageFolder
 from src.utility.iconManager import ThemedIcon
 from src.utility.misc import is_online_song, get_audio_url
@@ -261,6 +271,7 @@ class LocalManager:
         self.database_manager = database_manager
         self.parent = parent
         self.local_views = dict()
+        self.duplicates = dict()
 
     def add_local_view(self, folder_id, folder_path):
         if folder_id in self.local_views.keys():
@@ -271,7 +282,24 @@ class LocalManager:
         self.parent.stackedWidget.addWidget(local_view)
         self.parent.switchTo(local_view)
         self.local_view_signal(local_view)
+        local_view.set_duplicates(self.duplicates)
+        local_view.load()
 
+    def on_duplicates_found(self, groups: dict):
+        self.duplicates = groups
+        for local_view in self.local_views.values():
+            local_view.set_duplicates(groups)
+
+
+    def on_songs_changed(self, folder_id: str, songs: list):
+        local_view = self.local_views.get(folder_id)
+        if local_view is not None:
+            local_view.add_songs(songs)
+
+    def on_songs_removed(self, folder_id: str, paths: list):
+        local_view = self.local_views.get(folder_id)
+        if local_view is not None:
+            local_view.remove_songs(paths)
 
     def local_view_signal(self, local_view: LocalView):
         local_view.add_audio_to_queue.connect(self.parent.add_song_to_queue)
@@ -294,14 +322,36 @@ class MainWindow(FluentWindow):
         self.info_msg_handler = InfoTime(self, pos=InfoBarPosition.BOTTOM, duration=2000)
         self.view_manager = ViewManager(self.stackedWidget, self.data_fetcher, self.database_manager, self)
         self.local_view_manager = LocalManager(self.database_manager, self)
+        self.library_watcher = LibraryWatcher(self.database_manager, self)
+        self.library_watcher.songsChanged.connect(self.local_view_manager.on_songs_changed)
+        self.library_watcher.songsRemoved.connect(self.local_view_manager.on_songs_removed)
+        QTimer.singleShot(2000, self._watch_local_directories)
+        self.duplicate_finder = DuplicateFinder(self.database_manager, cfg.downloadFolder.value, self)
+        self.duplicate_finder.finished.connect(self.local_view_manager.on_duplicates_found)
+        self.library_watcher.songsChanged.connect(self.duplicate_finder.schedule)
+        self.library_watcher.songsRemoved.connect(self.duplicate_finder.schedule)
+        # the groups of the last pass right away, a fresh pass once startup settled
+        QTimer.singleShot(2000, self._load_duplicates)
+        self.duplicate_finder.schedule()
         # setup ui
         self.is_safe_to_close = False
         # to store task async
         # QTimer.singleShot(3000, self.initInterface)
         self.initInterface()
+        self.duplicate_finder.finished.connect(self.queue.set_duplicates)
         # connecting signals
         self.signal_handler = SignalHandler(self)
 
+        # keep the thumbnail cache under its quota
+        self.thumbnail_cache_timer = QTimer(self)
+        self.thumbnail_cache_timer.setInterval(10 * 60 * 1000)
+        self.thumbnail_cache_timer.timeout.connect(self.trim_thumbnail_cache)
+        self.thumbnail_cache_timer.start()
+        QTimer.singleShot(60 * 1000, self.trim_thumbnail_cache)
+        cfg.thumbnail_cache_quota.valueChanged.connect(lambda value: self.trim_thumbnail_cache())
+        ImageCache.instance().set_budget(cfg.cover_memory_cache.value * 1024 * 1024)
+        cfg.cover_memory_cache.valueChanged.connect(lambda value: ImageCache.instance().set_budget(value * 1024 * 1024))
+
         # self._load_last_played()
         # self._load_last_queue()
 
@@ -338,6 +388,7 @@ class MainWindow(FluentWindow):
         self.queue = MusicQueue(self.database_manager, self)
         self.queue.setObjectName("queue")
         self.queue.hide()
+        self.queue.shuffleChanged.connect(self.set_shuffle_button)
 
         #about Page
         yaml_path = resource_path("app-info.yaml")
@@ -451,6 +502,26 @@ class MainWindow(FluentWindow):
         self.switchTo(self.searchResultInterface)
         self.searchResultInterface.load_search(query)
 
+    @asyncSlot()
+    async def trim_thumbnail_cache(self):
+        protected_ids = await self.database_manager.get_protected_artwork_ids()
+        if protected_ids is None:
+            logger.warning("Thumbnail cache not trimmed, the artwork to keep could not be read")
+            return
+        ThumbnailCacheManager.instance().trim(protected_ids, cfg.thumbnail_cache_quota.value * 1024 * 1024)
+
+    @asyncSlot()
+    async def _load_duplicates(self):
+        groups = await self.database_manager.get_duplicates()
+        self.local_view_manager.on_duplicates_found(groups)
+        self.queue.set_duplicates(groups)
+
+    @asyncSlot()
+    async def _watch_local_directories(self):
+        directories = await self.database_manager.get_local_directories()
+        for folder_id, folder_path, *_ in directories or []:
+            self.library_watcher.watch(folder_id, folder_path)
+
     @asyncSlot()
     async def _load_last_played(self):
         logger.info("Loading last played song")
@@ -479,10 +550,16 @@ class MainWindow(FluentWindow):
         # self.lyricsInterface.setBackgroundImage()
         self.lyricsInterface.clear_lyrics()
         QTimer.singleShot(100, lambda: self.lyricsInterface.setBackgroundImage(cover))
+        QTimer.singleShot(1000, self._prefetch_next_background)
         self.lyricsInterface.start_animation()
         self.bottomPlayer.set_song(track_data)
         QTimer.singleShot(3000, lambda: self.lyricsInterface.fetch_song_lyrics(track_data.get('videoId')))
 
+    def _prefetch_next_background(self):
+        next_song = self.queue.peek_next_song()
+        if next_song and next_song.get("videoId"):
+            self.lyricsInterface.prefetch_background(f"{ImageFolder.SONG.path}\\{next_song.get('videoId')}.png")
+
     def set_queue_data(self, id_: str, tracks: dict, selected_idx: int = 0):
         self.queue.setQueueData(id_, tracks, selected_idx)
 
@@ -677,18 +754,27 @@ class MainWindow(FluentWindow):
     def on_like_clicked(self):
         logger.info("like clicked")
 
-    def on_shuffle_clicked(self):
+    def on_shuffle_clicked(self, shuffle: bool = True):
         logger.info("shuffle clicked")
+        if not shuffle:
+            if self.queue.unshuffle():
+                self.info_msg_handler.success_msg("Unshuffled", "Queue back in its order")
+                logger.success("Queue unshuffled")
+            return
         if self.queue.shuffle_widgets():
             self.info_msg_handler.success_msg("Shuffled", "Queue shuffled")
             logger.success("Queue shuffled")
         else:
-            self.bottomPlayer.shuffleButton.blockSignals(True)
-            self.bottomPlayer.set_shuffle(False)
-            self.bottomPlayer.shuffleButton.blockSignals(False)
+            self.set_shuffle_button(False)
             self.info_msg_handler.warning_msg("No songs", "No songs in queue")
             logger.warning("No songs in queue")
 
+    def set_shuffle_button(self, shuffle: bool):
+        """Show the shuffle state without shuffling again."""
+        self.bottomPlayer.shuffleButton.blockSignals(True)
+        self.bottomPlayer.set_shuffle(shuffle)
+        self.bottomPlayer.shuffleButton.blockSignals(False)
+
     def on_download_clicked(self):
         logger.info("download clicked")
 
@@ -725,6 +811,13 @@ class MainWindow(FluentWindow):
         await self.database_manager.close()
         self.data_fetcher.stop()
         self.data_fetcher.exit(0)
+        ImageLoader.instance().shutdown()
+        BlurCache.instance().shutdown()
+        MetadataPool.instance().shutdown()
+        CoverExtractor.instance().shutdown()
+        ThumbnailService.instance().shutdown()
+        ThumbnailCacheManager.instance().shutdown()
+        logger.debug(f"Cover cache: {ImageCache.instance().stats()}")
         self.bottomPlayer.stop()
         self.bottomPlayer.deleteLater()
         self.data_fetcher.deleteLater()
@@ -821,6 +914,7 @@ class SignalHandler(QObject):
 
         local = self.ui.localInterface
         local.directoryClicked.connect(self.ui._add_folder_view)
+        local.directoryAdded.connect(self.ui.library_watcher.watch)
 
     def _stats_signals(self):
         stats = self.ui.statsInterface
@@ -880,6 +974,8 @@ def main():
 
 
 if __name__ == "__main__":
+    # metadata workers are started through multiprocessing, needed in frozen builds
+    multiprocessing.freeze_support()
     main()
 
 
@@ -32,6 +32,7 @@ setup(
         "aiosqlite",
         "aiofiles",
         "pillow",
+        "numpy",
         "pyyaml",
         "setuptools"
     ],
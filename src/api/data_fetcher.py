@@ -7,11 +7,11 @@ from queue import PriorityQueue
 import ytmusicapi
 from PySide6.QtCore import QThread, Signal, QMutex, QMutexLocker
 import cachetools
-from ytmusicapi import YTMusic
 from typing import Tuple, Dict, Any, Optional
 from loguru import logger
 
 import sys
+from src.api.pagination import PagingYTMusic, fetch_search_page, fetch_playlist_page
 from src.utility.song_utils import get_stream_url
 
 
@@ -27,6 +27,8 @@ class YTMusicMethod(Enum):
     GET_STREAM_URL = "get_stream_url"
     GET_WATCH_PLAYLIST = "get_watch_playlist"
     GET_LYRICS = "get_lyrics"
+    SEARCH_PAGE = "search_page"
+    GET_PLAYLIST_PAGE = "get_playlist_page"
 
 class RequestPriority(Enum):
     HIGH = 0
@@ -50,7 +52,7 @@ class DataFetcherWorker(QThread):
     def __init__(self):
         super().__init__()
         self.request_queue = PriorityQueue(maxsize=50)
-        self._ytmusic = YTMusic()
+        self._ytmusic = PagingYTMusic()
         self._active = True
         self._pending_requests = {}
         self._request_timeouts = {}
@@ -139,6 +141,8 @@ class DataFetcherWorker(QThread):
                 case YTMusicMethod.GET_WATCH_PLAYLIST: return self._ytmusic.get_watch_playlist(*args, **kwargs)
                 case YTMusicMethod.GET_STREAM_URL: return get_stream_url(*args, **kwargs)
                 case YTMusicMethod.GET_LYRICS: return self._ytmusic.get_lyrics(*args, **kwargs)
+                case YTMusicMethod.SEARCH_PAGE: return fetch_search_page(self._ytmusic, *args, **kwargs)
+                case YTMusicMethod.GET_PLAYLIST_PAGE: return fetch_playlist_page(self._ytmusic, *args, **kwargs)
 
         except Exception as e:
             if "429" in str(e):  # Rate limited
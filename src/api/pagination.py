@@ -0,0 +1,173 @@
+from typing import Any, Dict, Optional
+
+from loguru import logger
+from ytmusicapi import YTMusic
+
+PAGE_SIZE = 20
+PLAYLIST_PAGE_SIZE = 100
+
+
+class PagingYTMusic(YTMusic):
+    """YTMusic client that remembers the last raw response.
+
+    ytmusicapi follows continuations internally and never hands the token back, so the
+    raw response is kept around to pull the token out after a normal first-page call.
+    """
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.last_response: Optional[dict] = None
+
+    def _send_request(self, endpoint: str, body: Dict, additionalParams: str = "") -> Dict:
+        response = super()._send_request(endpoint, body, additionalParams)
+        self.last_response = response
+        return response
+
+
+def find_continuation(node: Any) -> Optional[str]:
+    """Depth-first search for the first continuation token in a raw response.
+
+    Handles both the old ``nextContinuationData`` layout and the newer
+    ``continuationItemRenderer``/``continuationCommand`` layout.
+    """
+    stack = [node]
+    while stack:
+        current = stack.pop()
+        if isinstance(current, dict):
+            next_data = current.get("nextContinuationData")
+            if isinstance(next_data, dict) and next_data.get("continuation"):
+                return next_data["continuation"]
+            command = current.get("continuationCommand")
+            if isinstance(command, dict) and command.get("token"):
+                return command["token"]
+            stack.extend(reversed(list(current.values())))
+        elif isinstance(current, list):
+            stack.extend(reversed(current))
+    return None
+
+
+def _find_key(node: Any, key: str) -> Any:
+    """Return the first value stored under ``key`` anywhere in ``node``."""
+    stack = [node]
+    while stack:
+        current = stack.pop()
+        if isinstance(current, dict):
+            if key in current:
+                return current[key]
+            stack.extend(reversed(list(current.values())))
+        elif isinstance(current, list):
+            stack.extend(reversed(current))
+    return None
+
+
+def _continuation_contents(response: dict) -> list:
+    """Items of a continuation response, for both response layouts."""
+    items = _find_key(response.get("continuationContents", {}), "contents")
+    if items is None:
+        items = _find_key(response.get("onResponseReceivedActions", []), "continuationItems")
+    return [item for item in (items or []) if "continuationItemRenderer" not in item]
+
+
+def _playlist_continuation(response: dict) -> Optional[str]:
+    """Token of the next playlist page in a browse response, a first page or a continuation.
+
+    Playlists page the way ``get_continuations_2025`` does: the token is carried by the last
+    item of the track shelf, or of the continuation items of a later page.
+    """
+    from ytmusicapi.continuations import CONTINUATION_ITEMS, get_continuation_token
+    from ytmusicapi.navigation import nav
+
+    items = nav(response, CONTINUATION_ITEMS, True)
+    if items is None:
+        shelf = _find_key(response, "musicPlaylistShelfRenderer") or _find_key(response, "musicShelfRenderer") or {}
+        items = shelf.get("contents")
+    return get_continuation_token(items) if items else None
+
+
+def _continuation_params(token: str) -> str:
+    return f"&ctoken={token}&continuation={token}"
+
+
+def _parse_search_contents(ytmusic: YTMusic, contents: list, filter: str) -> list:
+    from ytmusicapi.parsers.search import parse_search_results
+
+    result_type = filter[:-1] if filter else None
+    category = filter.capitalize() if filter else None
+    try:
+        return parse_search_results(contents, ytmusic.parser.get_search_result_types(), result_type, category)
+    except (AttributeError, TypeError):
+        # older ytmusicapi releases take no result type table
+        return parse_search_results(contents, result_type, category)
+
+
+def _search_body(query: str, filter: str) -> dict:
+    from ytmusicapi.parsers.search import get_search_params
+
+    body = {"query": query}
+    params = get_search_params(filter, None, False)
+    if params:
+        body["params"] = params
+    return body
+
+
+def fetch_search_page(ytmusic: PagingYTMusic, query: str, filter: str = "songs",
+                      continuation: Optional[str] = None) -> Dict[str, Any]:
+    """Fetch one page of filtered search results.
+
+    Args:
+        ytmusic (PagingYTMusic): client used for the request.
+        query (str): search query.
+        filter (str): ytmusicapi search filter, pagination only exists for filtered searches.
+        continuation (str, optional): token returned by the previous page, None for the first page.
+
+    Returns:
+        dict: {"results": list, "continuation": str | None}
+    """
+    if continuation is None:
+        results = ytmusic.search(query, filter=filter, limit=PAGE_SIZE)
+        token = find_continuation(ytmusic.last_response)
+        return {"results": results, "continuation": token}
+
+    try:
+        response = ytmusic._send_request("search", _search_body(query, filter), _continuation_params(continuation))
+        results = _parse_search_contents(ytmusic, _continuation_contents(response), filter)
+    except (ImportError, KeyError, TypeError) as e:
+        logger.error(f"Search continuation failed for '{query}': {e}")
+        return {"results": [], "continuation": None}
+    return {"results": results, "continuation": find_continuation(response) if results else None}
+
+
+def fetch_playlist_page(ytmusic: PagingYTMusic, playlist_id: str,
+                        continuation: Optional[str] = None) -> Dict[str, Any]:
+    """Fetch one page of playlist tracks.
+
+    The first page is the regular ``get_playlist`` dict (title, description, tracks...)
+    limited to about one page of tracks, later pages only carry ``tracks``. Both carry the
+    ``continuation`` token of the following page, or None once the playlist is exhausted.
+    A later page is requested with the token alone, like ytmusicapi pages playlists.
+    """
+    if continuation is None:
+        playlist = ytmusic.get_playlist(playlist_id, limit=PLAYLIST_PAGE_SIZE)
+        track_count = playlist.get("trackCount") or 0
+        token = None
+        if len(playlist.get("tracks", [])) < track_count:
+            # get_playlist may have followed continuations already, the last response has the next token
+            try:
+                token = _playlist_continuation(ytmusic.last_response or {})
+            except (ImportError, IndexError, KeyError, TypeError) as e:
+                logger.error(f"Playlist continuation not found for '{playlist_id}': {e}")
+        playlist["continuation"] = token
+        return playlist
+
+    try:
+        from ytmusicapi.continuations import CONTINUATION_ITEMS, get_continuation_token
+        from ytmusicapi.navigation import nav
+        from ytmusicapi.parsers.playlists import parse_playlist_items
+
+        response = ytmusic._send_request("browse", {"continuation": continuation})
+        items = nav(response, CONTINUATION_ITEMS, True) or []
+        tracks = parse_playlist_items(items)
+        token = get_continuation_token(items) if tracks else None
+    except (ImportError, IndexError, KeyError, TypeError) as e:
+        logger.error(f"Playlist continuation failed for '{playlist_id}': {e}")
+        return {"tracks": [], "continuation": None}
+    return {"tracks": tracks, "continuation": token}
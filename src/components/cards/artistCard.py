@@ -7,6 +7,7 @@ import sys
 
 from src.utility.enums import PlaceHolder
 from src.utility.enums import ImageFolder
+from src.utility.image_cache import load_cover
 from pathlib import Path
 
 from PySide6.QtWidgets import QFrame, QHBoxLayout, QApplication, QVBoxLayout, QSpacerItem, QSizePolicy
@@ -105,9 +106,11 @@ class ArtistCard(CardWidget):
     def setCover(self, cover_path):
         if Path(cover_path).exists() and self.cover_path != cover_path:
             self.cover_path = cover_path
-            self.coverLabel.clear()
-            self.coverLabel.setImage(cover_path)
-            self.coverLabel.setRadius(75)
+            load_cover(cover_path, self.coverLabel, self._show_cover)
+
+    def _show_cover(self, image):
+        self.coverLabel.setImage(image)
+        self.coverLabel.setRadius(75)
             
     
     
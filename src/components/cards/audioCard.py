@@ -13,6 +13,7 @@ from enum import Enum
 from src.common.myLabel import MyTitleLabel, MyBodyLabel, HoverOverlayImageLabel, ClickableTitleLabel, ClickableBodyLabel
 from src.common.myFrame import VerticalFrame, HorizontalFrame, FlowFrame
 from src.utility.enums import ImageFolder
+from src.utility.image_cache import load_cover
 
 
 from PySide6.QtWidgets import QFrame, QHBoxLayout, QApplication, QVBoxLayout, QSpacerItem, QSizePolicy, QLabel
@@ -315,9 +316,8 @@ class AudioCard(AudioCardBase):
     def setCover(self, cover_path):
         if not Path(cover_path).exists():
             return
-        self.coverLabel.clear()
-        self.coverLabel.setImage(cover_path)
         self.coverLabel.setFixedSize(64, 64)
+        load_cover(cover_path, self.coverLabel)
         
     def setCount(self, count):
         if isinstance(count, int):
@@ -359,7 +359,7 @@ class AudioCard(AudioCardBase):
         if "duration" in kwargs:
             self.durationLabel.setText(kwargs["duration"])
         if "cover_path" in kwargs:
-            self.coverLabel.setImage(kwargs["cover_path"])
+            self.setCover(kwargs["cover_path"])
         
     def hideDuration(self, hide):
         if hide:
@@ -9,6 +9,7 @@ from src.common.myFrame import HorizontalFrame, VerticalFrame
 from src.common.myButton import PrimaryRotatingButton
 from src.common.myLabel import MyTitleLabel, MyBodyLabel
 from src.utility.enums import PlaceHolder
+from src.utility.image_cache import load_cover
 from src.utility.iconManager import ThemedIcon
 
 from PySide6.QtWidgets import QFrame, QHBoxLayout, QApplication, QVBoxLayout, QSpacerItem, QSizePolicy
@@ -149,9 +150,7 @@ class DownloadCard(SimpleCardWidget):
     def set_cover(self, cover_path: str):
         if cover_path is None or not Path(cover_path).exists():
             return
-        size = self.cover_label.size()
-        self.cover_label.setImage(cover_path)
-        self.cover_label.setFixedSize(size)
+        load_cover(cover_path, self.cover_label)
         
     def set_request_id(self, request_id: str):
         self.request_id = request_id
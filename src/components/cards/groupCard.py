@@ -6,6 +6,7 @@ import sys
 
 from src.common.myFrame import VerticalFrame, HorizontalFrame
 from src.utility.enums import PlaceHolder
+from src.utility.image_cache import load_cover
 # print(sys.path)
 
 from PySide6.QtWidgets import QFrame, QHBoxLayout, QApplication, QVBoxLayout, QSpacerItem, QSizePolicy
@@ -87,8 +88,8 @@ class GroupCard(GroupCardBase):
         return self.cardId
         
     def setCover(self, cover_path):
-        self.coverLabel.setImage(cover_path)
         self.coverLabel.setFixedSize(QSize(150, 150))
+        load_cover(cover_path, self.coverLabel)
         
     def getTitle(self):
         return self.titleLabel.text()
@@ -11,6 +11,7 @@ import time
 
 from src.common.myLabel import ClickableBodyLabel
 from src.utility.enums import PlaceHolder, ImageFolder
+from src.utility.image_cache import load_cover
 # print(sys.path)
 
 from PySide6.QtWidgets import QFrame, QApplication, QVBoxLayout, QSpacerItem, QSizePolicy
@@ -153,9 +154,9 @@ class PortraitCardBase(ElevatedCardWidget):
         
     def setCover(self, cover_path: str):
         if cover_path and Path(cover_path).exists() and cover_path != self.cover_path:
-            self.coverLabel.setImage(cover_path)
             self.cover_path = cover_path
             self.coverLabel.setFixedSize(150, 150)
+            load_cover(cover_path, self.coverLabel)
         
     def getTitle(self):
         return self.titleLabel.text()
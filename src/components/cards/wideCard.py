@@ -12,6 +12,7 @@ import sys
 from src.utility.iconManager import ThemedIcon
 from src.common.myLabel import MyBodyLabel, MyTitleLabel
 from src.utility.enums import PlaceHolder
+from src.utility.image_cache import load_cover
 from src.common.myFrame import VerticalFrame, HorizontalFrame
 
 
@@ -137,11 +138,9 @@ class WideCard(HorizontalFrame):
         self.addWidget(self.infoContainer)
 
     def setImage(self, image_path):
-        size = self.coverLabel.size()
         if Path(image_path).exists():
             self.cover_path = image_path
-            self.coverLabel.setImage(image_path)
-            self.coverLabel.setFixedSize(size)
+            load_cover(image_path, self.coverLabel)
     
     def setTitle(self, title: str):
         self.titleLabel.setText(title)
@@ -10,6 +10,7 @@ from pathlib import Path
 
 from src.common.myScroll import SideScrollWidget, HorizontalScrollWidget, VerticalScrollWidget
 from src.common.myFrame import VerticalFrame, HorizontalFrame, FlowFrame
+from src.utility.image_cache import load_cover
 
 
 from PySide6.QtWidgets import QFrame, QHBoxLayout, QApplication, QVBoxLayout, QSpacerItem, QSizePolicy, QStackedWidget, QFileDialog
@@ -94,8 +95,8 @@ class AddPlaylistDialog(FramelessDialog):
         
     def set_cover_image(self, file_path):
         self.cover_path = file_path
-        self.coverImage.setImage(file_path)
         self.coverImage.setFixedSize(175, 175)
+        load_cover(file_path, self.coverImage)
         
     def remove_cover_image(self):
         self.cover_path = None
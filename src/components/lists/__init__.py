@@ -0,0 +1,4 @@
+__all__ = ["trackList", "queueList"]
+
+from .trackList import TrackListModel, TrackProxyModel, TrackDelegate, TrackListView, TrackRole, CoverRole
+from .queueList import QueueListModel, QueueListView
@@ -0,0 +1,200 @@
+import bisect
+
+from src.components.lists.trackList import TrackListModel, TrackListView, TrackRole, CoverRole
+from src.utility.play_queue import PlayQueue
+
+from PySide6.QtWidgets import QAbstractItemView
+from PySide6.QtCore import Qt, QAbstractListModel, QMimeData, QModelIndex
+
+
+QUEUE_ROWS_MIME = "application/x-beatroot-queue-rows"
+
+
+class QueueListModel(QAbstractListModel):
+    """Rows of a ``PlayQueue``, every edit of the queue goes through the model so views follow.
+
+    Rows can be dragged to a new place by a ``QueueListView``, the move is applied to the
+    queue with ``moveRows``. A filter shows only the tracks whose title contains a text;
+    rows of the view then map to rows of the queue through ``queue_row`` and ``view_row``.
+    """
+
+    def __init__(self, play_queue: PlayQueue, parent=None):
+        super().__init__(parent)
+        self.play_queue = play_queue
+        self.query = ""
+        self._filtered = None  # queue rows shown while filtering, ascending
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.play_queue) if self._filtered is None else len(self._filtered)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or index.row() >= self.rowCount():
+            return None
+        track = self.play_queue[self.queue_row(index.row())]
+        if role == TrackRole:
+            return track
+        if role == Qt.ItemDataRole.DisplayRole:
+            return track.get("title", "Unknown")
+        if role == CoverRole:
+            return TrackListModel.cover_path(track)
+        return None
+
+    def flags(self, index):
+        if not index.isValid():
+            # dropped between rows
+            return Qt.ItemFlag.ItemIsDropEnabled
+        flags = Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable
+        if self._filtered is None:
+            flags |= Qt.ItemFlag.ItemIsDragEnabled
+        return flags
+
+    def supportedDropActions(self):
+        return Qt.DropAction.MoveAction
+
+    def mimeTypes(self):
+        return [QUEUE_ROWS_MIME]
+
+    def mimeData(self, indexes):
+        # only moved inside the view, the rows are all a drop needs
+        data = QMimeData()
+        data.setData(QUEUE_ROWS_MIME, ",".join(str(index.row()) for index in indexes).encode())
+        return data
+
+    def moveRows(self, source_parent, source_row, count, destination_parent, destination_child):
+        """Move one row before ``destination_child``, how ``QListView`` applies an internal drop."""
+        if count != 1 or self._filtered is not None or source_parent.isValid() or destination_parent.isValid():
+            return False
+        if not 0 <= source_row < len(self.play_queue) or not 0 <= destination_child <= len(self.play_queue):
+            return False
+        destination = destination_child - 1 if destination_child > source_row else destination_child
+        self.move(source_row, destination)
+        return True
+
+    def queue_row(self, row: int) -> int:
+        return row if self._filtered is None else self._filtered[row]
+
+    def view_row(self, queue_row: int) -> int | None:
+        """Row a queue row is shown at, None if the filter hides it."""
+        if self._filtered is None:
+            return queue_row if 0 <= queue_row < len(self.play_queue) else None
+        row = bisect.bisect_left(self._filtered, queue_row)
+        return row if row < len(self._filtered) and self._filtered[row] == queue_row else None
+
+    def reset(self, tracks: list[dict], current: int = 0) -> int:
+        self.beginResetModel()
+        row = self.play_queue.reset(tracks, current)
+        self._filter()
+        self.endResetModel()
+        return row
+
+    def clear(self):
+        self.beginResetModel()
+        self.play_queue.clear()
+        self._filter()
+        self.endResetModel()
+
+    def insert(self, track: dict, row: int = -1) -> int:
+        if self._filtered is not None:
+            self.beginResetModel()
+            row = self.play_queue.insert(track, row)
+            self._filter()
+            self.endResetModel()
+            return row
+        if track.get("videoId") is None or track["videoId"] in self.play_queue:
+            return -1
+        if row < 0 or row > len(self.play_queue):
+            row = len(self.play_queue)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self.play_queue.insert(track, row)
+        self.endInsertRows()
+        return row
+
+    def remove(self, row: int) -> dict:
+        if self._filtered is not None:
+            self.beginResetModel()
+            track = self.play_queue.remove(row)
+            self._filter()
+            self.endResetModel()
+            return track
+        self.beginRemoveRows(QModelIndex(), row, row)
+        track = self.play_queue.remove(row)
+        self.endRemoveRows()
+        return track
+
+    def move(self, source: int, destination: int) -> int:
+        destination = max(0, min(destination, len(self.play_queue) - 1))
+        if source == destination:
+            return destination
+        if self._filtered is not None:
+            self.beginResetModel()
+            self.play_queue.move(source, destination)
+            self._filter()
+            self.endResetModel()
+            return destination
+        # Qt counts the destination before the row is taken out
+        self.beginMoveRows(QModelIndex(), source, source, QModelIndex(),
+                           destination + 1 if destination > source else destination)
+        self.play_queue.move(source, destination)
+        self.endMoveRows()
+        return destination
+
+    def shuffle(self, seed: int | None = None) -> bool:
+        if len(self.play_queue) <= 1:
+            return False
+        self.beginResetModel()
+        self.play_queue.shuffle(seed)
+        self._filter()
+        self.endResetModel()
+        return True
+
+    def unshuffle(self) -> bool:
+        if not self.play_queue.shuffled:
+            return False
+        self.beginResetModel()
+        self.play_queue.unshuffle()
+        self._filter()
+        self.endResetModel()
+        return True
+
+    def set_groups(self, groups: dict) -> int:
+        self.beginResetModel()
+        dropped = self.play_queue.set_groups(groups)
+        self._filter()
+        self.endResetModel()
+        return dropped
+
+    def set_filter(self, query: str) -> int:
+        """Show only tracks whose title contains ``query``, every track for an empty one.
+
+        Returns:
+            int: rows shown
+        """
+        self.beginResetModel()
+        self.query = query.strip().lower()
+        self._filter()
+        self.endResetModel()
+        return self.rowCount()
+
+    def _filter(self):
+        if not self.query:
+            self._filtered = None
+            return
+        self._filtered = [
+            row for row, track in enumerate(self.play_queue.tracks)
+            if self.query in str(track.get("title", "")).lower()
+        ]
+
+
+class QueueListView(TrackListView):
+    """Virtualised play queue, rows are reordered by dragging them."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
+        self.setDragEnabled(True)
+        self.setAcceptDrops(True)
+        self.setDropIndicatorShown(True)
+        self.setDragDropMode(QAbstractItemView.DragDropMode.InternalMove)
+        self.setDefaultDropAction(Qt.DropAction.MoveAction)
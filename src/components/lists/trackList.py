@@ -0,0 +1,393 @@
+from collections import OrderedDict
+
+from qfluentwidgets import ListView, isDarkTheme, themeColor
+from qfluentwidgets.components.widgets.list_view import ListItemDelegate
+
+from src.utility.cover_extractor import CoverExtractor, song_cover_path
+from src.utility.enums import PlaceHolder, SortType
+from src.utility.image_cache import ImageLoader
+from src.utility.track_index import TrackIndex
+
+import os
+
+from PySide6.QtWidgets import QAbstractItemView, QListView, QStyleOptionViewItem
+from PySide6.QtCore import Qt, QAbstractListModel, QModelIndex, QObject, QPoint, QRect, QRectF, QSize, Signal
+from PySide6.QtGui import QColor, QFont, QImage, QPainter, QPainterPath
+
+
+TrackRole = Qt.ItemDataRole.UserRole + 1  # the track dict
+CoverRole = Qt.ItemDataRole.UserRole + 2  # stored cover path, None if there is none (yet)
+
+
+class TrackListModel(QAbstractListModel):
+    """Flat list of track dicts, as stored for ``AudioCard``, keyed by file path.
+
+    Replaces a widget per track: views only ask for the rows they paint, so adding ten
+    thousand tracks costs a list append and one ``rowsInserted``. Tracks with the path of
+    a listed track replace it in place.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._tracks = list()
+        self._rows = dict()  # {path: row}
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._tracks)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        track = self._tracks[index.row()]
+        if role == TrackRole:
+            return track
+        if role == Qt.ItemDataRole.DisplayRole:
+            return track.get("title", "Unknown")
+        if role == Qt.ItemDataRole.ToolTipRole:
+            return track.get("path")
+        if role == CoverRole:
+            return self.cover_path(track)
+        return None
+
+    @staticmethod
+    def cover_path(track: dict) -> str | None:
+        if track.get("path"):
+            # local file, its embedded cover is extracted the first time it is shown
+            return CoverExtractor.instance().request(track["videoId"], track["path"])
+        cover = song_cover_path(track.get("videoId"))
+        return cover if os.path.exists(cover) else None
+
+    def set_tracks(self, tracks: list[dict]):
+        self.beginResetModel()
+        self._tracks = list(tracks)
+        self._reindex()
+        self.endResetModel()
+
+    def add_tracks(self, tracks: list[dict]):
+        """Append new tracks in one insert, tracks already listed are updated in place."""
+        new, changed = list(), list()
+        for track in tracks:
+            row = self._rows.get(track["path"])
+            if row is None:
+                new.append(track)
+                continue
+            self._tracks[row] = track
+            changed.append(row)
+        if changed:
+            # one signal for the batch, a sorted view reorders once
+            self.dataChanged.emit(self.index(min(changed)), self.index(max(changed)))
+        # a folder may list the same file twice in one batch
+        new = list({track["path"]: track for track in new}.values())
+        if not new:
+            return
+        first = len(self._tracks)
+        self.beginInsertRows(QModelIndex(), first, first + len(new) - 1)
+        self._tracks.extend(new)
+        for row, track in enumerate(new, first):
+            self._rows[track["path"]] = row
+        self.endInsertRows()
+
+    def remove_paths(self, paths: list[str]):
+        rows = sorted({self._rows[path] for path in paths if path in self._rows}, reverse=True)
+        if not rows:
+            return
+        # one removal per run of adjacent rows, last run first so earlier rows keep their index
+        end = start = rows[0]
+        for row in rows[1:] + [-2]:
+            if row == start - 1:
+                start = row
+                continue
+            self.beginRemoveRows(QModelIndex(), start, end)
+            del self._tracks[start:end + 1]
+            self.endRemoveRows()
+            end = start = row
+        self._reindex()
+
+    def track(self, row: int) -> dict | None:
+        return self._tracks[row] if 0 <= row < len(self._tracks) else None
+
+    def tracks(self) -> list[dict]:
+        return list(self._tracks)
+
+    def row_of(self, path: str) -> int | None:
+        return self._rows.get(path)
+
+    def _reindex(self):
+        self._rows = {track["path"]: row for row, track in enumerate(self._tracks)}
+
+
+class TrackProxyModel(QAbstractListModel):
+    """Sorted and filtered rows of a ``TrackListModel``, ordered by a ``TrackIndex``.
+
+    A plain list model rather than a ``QAbstractProxyModel``: ``QListView`` asks the model
+    for an index of every row whenever it lays out, and a Python ``index()`` made that
+    three times slower at 50k rows. Rows map to source rows through the index order; a new
+    sort, filter or batch of source rows is one layout change that keeps the selection.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.index_ = TrackIndex()
+        self.source = None
+        self.sort_type = None  # source order
+        self.query = ""
+        self.duplicates = None  # {song_id: group id} collapsed to one row, None shows every row
+        self._order = list()  # source row of every row
+        self._positions = None  # {source row: row}, built when first needed
+
+    def set_source(self, model: TrackListModel):
+        self.source = model
+        model.modelReset.connect(self._on_reset)
+        model.rowsInserted.connect(self._on_inserted)
+        model.rowsAboutToBeRemoved.connect(self._on_about_to_remove)
+        model.dataChanged.connect(self._on_data_changed)
+        self._on_reset()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._order)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or index.row() >= len(self._order):
+            return None
+        return self.source.data(self.source.index(self._order[index.row()]), role)
+
+    def source_row(self, row: int) -> int:
+        return self._order[row]
+
+    def row_of(self, source_row: int) -> int | None:
+        if self._positions is None:
+            self._positions = {source: row for row, source in enumerate(self._order)}
+        return self._positions.get(source_row)
+
+    def sort_by(self, sort_type: SortType | None):
+        self.sort_type = sort_type
+        self._relayout()
+
+    def set_filter(self, query: str):
+        self.query = query
+        self._relayout()
+
+    def set_duplicates(self, groups: dict | None):
+        """Show one row per song and duplicate group, every row for None."""
+        self.duplicates = groups
+        self._relayout()
+
+    def tracks(self) -> list[dict]:
+        """Tracks in the order shown."""
+        return [self.source.track(row) for row in self._order]
+
+    def _order_rows(self) -> list[int]:
+        order = self.index_.order(self.sort_type)
+        matches = self.index_.matches(self.query)
+        if matches is not None:
+            order = [row for row in order if row in matches]
+        if self.duplicates is not None:
+            order = self.index_.collapse(order, self.duplicates)
+        return order
+
+    def _relayout(self, moved=None):
+        """Rebuild the order as one layout change.
+
+        Args:
+            moved: callable mapping a source row from before the change to its row after,
+                -1 for a removed row; rows keep their number if not given
+        """
+        self.layoutAboutToBeChanged.emit()
+        persistent = self.persistentIndexList()
+        sources = [self._order[index.row()] if index.row() < len(self._order) else -1 for index in persistent]
+        if moved is not None:
+            sources = [moved(row) if row >= 0 else -1 for row in sources]
+        self._order = self._order_rows()
+        self._positions = None
+        if persistent:
+            rows = [self.row_of(row) for row in sources]
+            self.changePersistentIndexList(persistent, [QModelIndex() if row is None else self.index(row) for row in rows])
+        self.layoutChanged.emit()
+
+    def _on_reset(self):
+        self.beginResetModel()
+        self.index_.reset(self.source.tracks())
+        self._order = self._order_rows()
+        self._positions = None
+        self.endResetModel()
+
+    def _on_inserted(self, parent, first, last):
+        count = last - first + 1
+        if first == len(self.index_):
+            self.index_.append([self.source.track(row) for row in range(first, last + 1)])
+        else:
+            # inserted in the middle, the index only appends
+            self.index_.reset(self.source.tracks())
+        self._relayout(lambda row: row + count if row >= first else row)
+
+    def _on_about_to_remove(self, parent, first, last):
+        # applied before the source drops the rows, the view never sees them without a row
+        count = last - first + 1
+        self.index_.remove(list(range(first, last + 1)))
+        self._relayout(lambda row: -1 if first <= row <= last else row - count if row > last else row)
+
+    def _on_data_changed(self, top_left, bottom_right, roles=()):
+        for row in range(top_left.row(), bottom_right.row() + 1):
+            self.index_.update(row, self.source.track(row))
+        self._relayout()
+
+
+class TrackDelegate(ListItemDelegate):
+    """Paints a track row the way ``AudioCard`` lays it out: number, cover, title over
+    artists, album and duration.
+
+    Covers are requested from ``ImageLoader`` for painted rows only. Every row gets a
+    lightweight receiver object so rows scrolled out of view can have their pending
+    decode dropped; only the ``MAX_RECEIVERS`` most recently painted rows keep one.
+    """
+    ROW_HEIGHT = 72
+    COVER_SIZE = 56
+    MAX_RECEIVERS = 128
+
+    def __init__(self, parent: QListView):
+        super().__init__(parent)
+        self.view = parent
+        self.placeholder = QImage(PlaceHolder.SONG.path)
+        self.titleFont = QFont("Segoe UI", 12)
+        self.titleFont.setWeight(QFont.Weight.DemiBold)
+        self.bodyFont = QFont("Segoe UI", 10)
+        self._receivers = OrderedDict()  # {cover path: QObject}
+        self._painting = False
+        self._hit = None
+        CoverExtractor.instance().extracted.connect(lambda *_: self.view.viewport().update())
+
+    def sizeHint(self, option, index):
+        return QSize(option.rect.width(), self.ROW_HEIGHT)
+
+    def paint(self, painter: QPainter, option: QStyleOptionViewItem, index: QModelIndex):
+        track = index.data(TrackRole)
+        if track is None:
+            return
+        painter.save()
+        painter.setRenderHints(QPainter.RenderHint.Antialiasing | QPainter.RenderHint.SmoothPixmapTransform)
+        rect = option.rect.adjusted(4, 2, -4, -2)
+        row = index.row()
+
+        painter.setPen(Qt.PenStyle.NoPen)
+        if row in self.selectedRows:
+            color = QColor(themeColor())
+            color.setAlpha(50)
+            painter.setBrush(color)
+            painter.drawRoundedRect(rect, 5, 5)
+        elif row == self.hoverRow:
+            painter.setBrush(QColor(255, 255, 255, 20) if isDarkTheme() else QColor(68, 68, 68, 25))
+            painter.drawRoundedRect(rect, 5, 5)
+
+        text = QColor(255, 255, 255) if isDarkTheme() else QColor(0, 0, 0)
+        secondary = QColor(text)
+        secondary.setAlpha(160)
+        left, top, height = rect.left() + 8, rect.top(), rect.height()
+
+        painter.setFont(self.bodyFont)
+        painter.setPen(secondary)
+        painter.drawText(QRect(left, top, 36, height), Qt.AlignmentFlag.AlignVCenter | Qt.AlignmentFlag.AlignRight, str(row + 1))
+        left += 48
+
+        cover_rect = QRectF(left, top + (height - self.COVER_SIZE) / 2, self.COVER_SIZE, self.COVER_SIZE)
+        clip = QPainterPath()
+        clip.addRoundedRect(cover_rect, 4, 4)
+        painter.save()
+        painter.setClipPath(clip)
+        painter.drawImage(cover_rect, self._cover(index) or self.placeholder)
+        painter.restore()
+        left += self.COVER_SIZE + 12
+
+        right = rect.right() - 8
+        duration_rect = QRect(right - 64, top, 64, height)
+        album_width = max(0, int((right - left) * 0.3))
+        album_rect = QRect(duration_rect.left() - album_width - 12, top, album_width, height)
+        text_width = album_rect.left() - 12 - left
+
+        duration = self.text(track.get("duration") or track.get("length")) or "00:00"
+        painter.drawText(duration_rect, Qt.AlignmentFlag.AlignVCenter | Qt.AlignmentFlag.AlignRight, duration)
+        metrics = painter.fontMetrics()
+        painter.drawText(album_rect, Qt.AlignmentFlag.AlignVCenter | Qt.AlignmentFlag.AlignLeft,
+                         metrics.elidedText(self.text(track.get("album")) or "Unknown", Qt.TextElideMode.ElideRight, album_width))
+        painter.drawText(QRect(left, top + height // 2 + 2, text_width, height // 2 - 2), Qt.AlignmentFlag.AlignTop,
+                         metrics.elidedText(self.text(track.get("artists")) or "Unknown", Qt.TextElideMode.ElideRight, text_width))
+
+        painter.setFont(self.titleFont)
+        painter.setPen(text)
+        painter.drawText(QRect(left, top, text_width, height // 2 - 2), Qt.AlignmentFlag.AlignBottom,
+                         painter.fontMetrics().elidedText(track.get("title") or "Unknown", Qt.TextElideMode.ElideRight, text_width))
+        painter.restore()
+
+    @classmethod
+    def text(cls, value) -> str:
+        """Shown text of a field, online tracks carry albums as dicts and artists as lists of them."""
+        if isinstance(value, dict):
+            return str(value.get("name") or "")
+        if isinstance(value, (list, tuple)):
+            return ", ".join(filter(None, (cls.text(item) for item in value)))
+        return "" if value is None else str(value)
+
+    def _cover(self, index: QModelIndex) -> QImage | None:
+        cover = index.data(CoverRole)
+        if not cover:
+            return None
+        self._hit = None
+        self._painting = True
+        try:
+            ImageLoader.instance().load(cover, self._receiver(cover), self._deliver,
+                                        self.COVER_SIZE * self.view.devicePixelRatioF())
+        finally:
+            self._painting = False
+        return self._hit
+
+    def _deliver(self, image: QImage):
+        if self._painting:
+            # cached, drawn by the paint asking for it
+            self._hit = image
+        else:
+            self.view.viewport().update()
+
+    def _receiver(self, cover: str) -> QObject:
+        receiver = self._receivers.get(cover)
+        if receiver is None:
+            receiver = self._receivers[cover] = QObject(self)
+            if len(self._receivers) > self.MAX_RECEIVERS:
+                # its pending decode, if any, is dropped with it
+                self._receivers.popitem(last=False)[1].deleteLater()
+        else:
+            self._receivers.move_to_end(cover)
+        return receiver
+
+
+class TrackListView(ListView):
+    """Virtualised track list, only the visible rows are painted."""
+    trackClicked = Signal(dict, int)  # track, row
+    trackMenuRequested = Signal(dict, int, QPoint)  # track, row, global position
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setItemDelegate(TrackDelegate(self))
+        # every row has the same height, the view never measures rows it does not show
+        self.setUniformItemSizes(True)
+        self.setVerticalScrollMode(QAbstractItemView.ScrollMode.ScrollPerPixel)
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+        self.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
+        self.clicked.connect(self._on_clicked)
+        self.customContextMenuRequested.connect(self._on_context_menu)
+
+    def setModel(self, model):
+        super().setModel(model)
+        # the delegate paints the selection by row number, rows move with the model
+        for signal in (model.modelReset, model.layoutChanged, model.rowsInserted, model.rowsRemoved, model.rowsMoved):
+            signal.connect(self.updateSelectedRows)
+
+    def _on_clicked(self, index: QModelIndex):
+        track = index.data(TrackRole)
+        if track is not None:
+            self.trackClicked.emit(track, index.row())
+
+    def _on_context_menu(self, pos: QPoint):
+        index = self.indexAt(pos)
+        track = index.data(TrackRole)
+        if track is not None:
+            self.trackMenuRequested.emit(track, index.row(), self.viewport().mapToGlobal(pos))
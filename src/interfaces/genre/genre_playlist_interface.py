@@ -24,6 +24,7 @@ class GenrePlaylistView(FlowScrollWidget):
         self.setObjectName('GenrePlaylistView')
         self.thumbnail_downloader = ThumbnailDownloader(self)
         self.thumbnail_downloader.download_finished.connect(self.set_card_cover)
+        self.thumbnail_downloader.watch_scroll_area(self.scrollArea)
         
     def set_card_cover(self, path, uid):
         object_name = f"{uid}_card"
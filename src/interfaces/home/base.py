@@ -103,6 +103,7 @@ class HomeScreen(VerticalScrollWidget):
         
         self.thumbnail_downloader = ThumbnailDownloader(self)
         self.thumbnail_downloader.download_finished.connect(self.set_card_cover)
+        self.thumbnail_downloader.watch_scroll_area(self.scrollArea)
         self.thumbnail_urls = list()
         self.thumbnail_names = list()
         self.thumbnail_output_dirs = list()
@@ -201,6 +202,7 @@ class HomeScreen(VerticalScrollWidget):
         
     def createSideScrollArea(self, title):
         scroll_area = SideScrollWidget(title, self)
+        self.thumbnail_downloader.watch_scroll_area(scroll_area.scrollArea)
         return scroll_area
     
     def createCard(self, content):
@@ -8,6 +8,7 @@ from qasync import QEventLoop, asyncSlot, asyncClose
 
 from src.components.cards.portraitCard import PortraitAlbumCard
 from src.interfaces.library.base import LibraryInterfaceBase
+from src.utility.cover_extractor import song_cover_path
 from src.utility.database_utility import DatabaseManager
 from src.utility.enums import ImageFolder
 
@@ -27,6 +28,8 @@ class AlbumInterface(LibraryInterfaceBase):
     @asyncSlot()
     async def fetch_data(self):
         asyncio.create_task(self.database_manager.get_liked_albums(self.on_fetched))
+        for album in await self.database_manager.get_local_albums():
+            self.add_local_album(album)
         
     async def on_fetched(self, results: list[dict]):
         if results is None:
@@ -54,6 +57,23 @@ class AlbumInterface(LibraryInterfaceBase):
         album.playButton.clicked.connect(lambda: self.albumPlayClicked.emit(album_id))
         self.addCard(album)
         
+    def add_local_album(self, album_data: dict):
+        """Card of an album of the local folders, shown with the cover of one of its songs."""
+        if self.findChild(PortraitAlbumCard, f"{album_data['id']}_card"):
+            return
+        album = PortraitAlbumCard(self)
+        album.addButton.hide()
+        album.playButton.hide()
+        album.setObjectName(f"{album_data['id']}_card")
+        album.setTitle(album_data["name"])
+        album.setAlbumId(album_data["id"])
+        album.setInfo(album_data["artist"])
+        album.infoLabel.show()
+        album.setToolTip(f"{album_data['song_count']} local songs, {album_data['duration']}")
+        if album_data["cover_id"]:
+            album.setCover(song_cover_path(album_data["cover_id"]))
+        self.addCard(album)
+        
     @asyncClose
     async def closeEvent(self, event):
         logger.info("PlaylistInterface closed")
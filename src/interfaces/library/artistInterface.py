@@ -38,6 +38,8 @@ class ArtistInterface(LibraryInterfaceBase):
     @asyncSlot()
     async def fetch_data(self):
         asyncio.create_task(self.database_manager.get_liked_artists(self.on_fetched))
+        for artist in await self.database_manager.get_local_artists():
+            self.add_local_artist(artist)
         
     
     async def on_fetched(self, results: list):
@@ -61,6 +63,16 @@ class ArtistInterface(LibraryInterfaceBase):
         artist_card.setCover(path)
         artist_card.clicked.connect(lambda: self.artistClicked.emit(artist_id))
         self.addCard(artist_card)
+        
+    def add_local_artist(self, artist: dict):
+        """Card of an artist of the local folders, it has no online page to open."""
+        if self.findChild(ArtistCard, f"{artist['id']}_card"):
+            return
+        artist_card = ArtistCard()
+        artist_card.setArtistName(artist["name"])
+        artist_card.setArtistId(artist["id"])
+        artist_card.setToolTip(f"{artist['song_count']} local songs, {artist['duration']}")
+        self.addCard(artist_card)
             
     @asyncClose
     async def closeEvent(self, event):
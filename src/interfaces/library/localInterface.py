@@ -11,7 +11,8 @@ import sys
 from src.common.myScroll import FlowScrollWidget
 from src.components.cards.groupCard import GroupCard
 from src.interfaces.library.base import LibraryInterfaceBase
-from src.utility.song_utils import get_songs_from_dir, get_metadata, create_dir_cover_art, generate_xxhash_uid
+from src.utility.song_utils import get_songs_from_dir, get_metadata, create_dir_cover_art, folder_uid
+from src.utility.local_scanner import walk_audio_files
 from src.utility.database_utility import DatabaseManager
 
 from pathlib import Path
@@ -25,6 +26,7 @@ from PySide6.QtWidgets import QGraphicsDropShadowEffect
 
 class LocalInterface(LibraryInterfaceBase):
     directoryClicked = Signal(str, str)
+    directoryAdded = Signal(str, str)  # folder id, path
     def __init__(self, database_manager: DatabaseManager, parent = None):
         super().__init__(parent=parent)
         self.setObjectName("localInterface")
@@ -51,13 +53,15 @@ class LocalInterface(LibraryInterfaceBase):
     async def on_folder_selected(self, path):
         print(path)
         path = Path(path)
-        dir_songs = get_songs_from_dir(path)
-        if len(dir_songs) > 0:
+        # any song in the folder or its sub folders
+        has_songs = await asyncio.to_thread(lambda: next(walk_audio_files(str(path)), None) is not None)
+        if has_songs:
             # if create_dir_cover_art(path):
             #     cover_path = path / "folder.jpg"
-            folder_id = generate_xxhash_uid(path)
+            folder_id = folder_uid(path)
             asyncio.create_task(self.database_manager.insert_local_directory(folder_id, path.__str__()))
             card = self._create_directory(folder_id, path.__str__())
+            self.directoryAdded.emit(folder_id, path.__str__())
             self.addWidget(card)
             
         else:
@@ -12,14 +12,14 @@ import random
 from src.common.myScroll import SideScrollWidget, HorizontalScrollWidget, VerticalScrollWidget
 from src.common.myFrame import VerticalFrame, HorizontalFrame, FlowFrame
 from src.utility.enums import PlaceHolder
-from src.utility.image_utility import blur_pixmap
+from src.utility.blur_cache import BlurCache
 from src.api.data_fetcher import YTMusicMethod, DataFetcherWorker
 from src.animation.skeleton_screen_animation import RectSkeletonScreen
 from src.utility.misc import is_online_song
 
 
 from PySide6.QtWidgets import QFrame, QHBoxLayout, QApplication, QVBoxLayout, QSpacerItem, QSizePolicy, QStackedWidget
-from PySide6.QtCore import Qt, QSize, Signal, QPoint, QTimer
+from PySide6.QtCore import Qt, QSize, Signal, QPoint, QTimer, QRectF
 from PySide6.QtGui import QFont, QColor, QImage, QIcon, QPainter, QPixmap, QTextCursor, QPalette, QBrush, QTextCharFormat
 from PySide6.QtWidgets import QGraphicsDropShadowEffect, QTextBrowser, QGraphicsOpacityEffect
 from PySide6.QtWidgets import QGraphicsItem, QGraphicsScene, QGraphicsBlurEffect, QGraphicsPixmapItem
@@ -35,12 +35,10 @@ class LyricsInterface(VerticalFrame):
         self.title = "Unknown"
         self.artist = "Unknown"
         
-        self.original_pixmap = None  # Cache the original image
-        self.blurred_pixmap = None  # Cache the blurred image
+        self.blurred_pixmap = None  # blurred background, scaled to the widget when painted
+        self.background_key = None  # (song id, radius) of the background being shown
         self.blur_radius = 10
-        self.resize_timer = QTimer()  # Timer to debounce resize events
-        self.resize_timer.setSingleShot(True)
-        self.resize_timer.timeout.connect(self.handle_resize)
+        BlurCache.instance().ready.connect(self._on_blur_ready)
         
         self.setBackgroundImage(PlaceHolder.LYRICS.path)
         
@@ -142,33 +140,43 @@ class LyricsInterface(VerticalFrame):
         self.blur_radius = radius
         
     def setBackgroundImage(self, image_path: str):
-        """Set the background image of the widget."""
-        # Load the image and cache it
+        """Set the background to the blurred image, keyed by its file name (the song id)."""
         if image_path is None or  not Path(image_path).exists():
             image_path = PlaceHolder.LYRICS.path
-        self.original_pixmap = QPixmap(image_path)
-
-        # Apply blur effect to the original image and cache the result
-        self.blurred_pixmap = blur_pixmap(self.original_pixmap, self.blur_radius)
-
-        # Update the background with the blurred image
+        song_id = Path(image_path).stem
+        self.background_key = (song_id, self.blur_radius)
+        # the blur is rendered in the background unless it is cached
+        image = BlurCache.instance().get(song_id, image_path, self.blur_radius)
+        if image is not None:
+            self._on_blur_ready(song_id, self.blur_radius, image)
+
+    def prefetch_background(self, image_path: str):
+        """Render the blurred background of an upcoming track ahead of time."""
+        if image_path and Path(image_path).exists():
+            BlurCache.instance().prefetch(Path(image_path).stem, image_path, self.blur_radius)
+
+    def _on_blur_ready(self, song_id: str, radius: int, image: QImage):
+        if (song_id, radius) != self.background_key:
+            return
+        self.blurred_pixmap = QPixmap.fromImage(image)
         self.update_background()
-        self.update()
-        self.repaint()
 
     def update_background(self):
-        """Update the background image based on the current widget size."""
-        if self.blurred_pixmap is None:
-            return
-
-        # Scale the cached blurred pixmap to the size of the widget
-        scaled_pixmap = self.blurred_pixmap.scaled(self.size(), Qt.KeepAspectRatioByExpanding, Qt.SmoothTransformation)
+        """Repaint the background, the blurred pixmap is scaled to the widget while painting."""
+        self.update()
 
-        # Set the scaled pixmap as the background of the widget
-        self.setAutoFillBackground(True)
-        palette = self.palette()
-        palette.setBrush(QPalette.ColorRole.Window, QBrush(scaled_pixmap))
-        self.setPalette(palette)
+    def paintEvent(self, event):
+        if self.blurred_pixmap is not None and not self.blurred_pixmap.isNull():
+            # crop the pixmap to the aspect ratio of the widget, like KeepAspectRatioByExpanding
+            source = self.blurred_pixmap.rect()
+            scale = min(source.width() / max(1, self.width()), source.height() / max(1, self.height()))
+            width, height = self.width() * scale, self.height() * scale
+            source = QRectF((source.width() - width) / 2, (source.height() - height) / 2, width, height)
+            painter = QPainter(self)
+            painter.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform)
+            painter.drawPixmap(QRectF(self.rect()), self.blurred_pixmap, source)
+            painter.end()
+        super().paintEvent(event)
         
     def setBackgroundImageCSS(self, url):
         """Set the background image of the widget using CSS."""
@@ -320,13 +328,8 @@ class LyricsInterface(VerticalFrame):
 
     def resizeEvent(self, event):
         self.zoomContainer.move(self.width() - self.zoomContainer.width() - 20, self.height() - self.zoomContainer.height() - 20)
-        self.resize_timer.start(100)
         return super().resizeEvent(event)
     
-    def handle_resize(self):
-        """Update the background after the resize event is complete."""
-        self.update_background()
-    
     def noLyricsSetup(self):
         if hasattr(self, "text_browser"):
             self.text_browser.hide()
@@ -19,6 +19,7 @@ from src.components.player.musicplayer import MusicPlayer
 from src.api.data_fetcher import YTMusicMethod, DataFetcherWorker
 from src.utility.database_utility import DatabaseManager
 from src.utility.misc import is_online_song
+from src.utility.image_cache import load_cover
 
 from PySide6.QtWidgets import QApplication
 from PySide6.QtCore import Signal, QTimer, QObject
@@ -308,9 +309,7 @@ class PlayerInterface(PlayerScreen):
     def set_cover(self, cover_path: str) -> None:
         """Set the cover image."""
         if Path(cover_path).exists():
-            size = self.coverLabel.size()
-            self.coverLabel.setImage(cover_path)
-            self.coverLabel.setFixedSize(size)
+            load_cover(cover_path, self.coverLabel)
         else:
             logger.error(f"Cover image not found: {cover_path}")
             
@@ -7,7 +7,7 @@ import sys
 
 from loguru import logger
 
-from src.api.data_fetcher import DataFetcherWorker, YTMusicMethod
+from src.api.data_fetcher import DataFetcherWorker, YTMusicMethod, RequestPriority
 from src.interfaces.search.results_screen import SearchResultScreen
 from src.interfaces.search.sketeton_animation import SearchResultSkeleton
 from src.utility.check_net_connectivity import is_connected_to_internet
@@ -35,8 +35,11 @@ class SearchResultInterface(QStackedWidget):
         
         self.data_fetcher = data_fetcher
         self.data_fetcher.data_fetched.connect(self._on_fetching_finished)
+        self.data_fetcher.error_occurred.connect(self._on_fetching_error)
         self.query = None
         self.search_request_id = None
+        self.page_request_id = None
+        self.songs_continuation = None
         
         
         self.search_results_screen = SearchResultScreen(self)
@@ -87,8 +90,18 @@ class SearchResultInterface(QStackedWidget):
             logger.success(f"Data succesfully fetched for search query: {self.query}")
             self._on_search_fetched(data)
             return
+        if uid == self.page_request_id:
+            self._on_songs_page_fetched(data)
+            return
             
         logger.info(f"uid didnt match: { uid}")
+        
+    def _on_fetching_error(self, error: str, uid: str):
+        if uid and uid == self.page_request_id:
+            # the continuation is kept, load more asks for the same page again
+            logger.error(f"Songs page could not be fetched: {error}")
+            self.page_request_id = None
+            self.search_results_screen.set_load_more_busy(False)
     
     def load_search(self, query):
         if query == "":
@@ -111,14 +124,31 @@ class SearchResultInterface(QStackedWidget):
         if self.query is None or self.query == "":
             logger.warning("No query to load more results for.")
             return
-        limit = self.search_results_screen.song_count + 10
+        if self.page_request_id is not None:
+            logger.info("Songs page already requested")
+            return
+        # first "load more" starts the filtered songs listing, later ones follow its continuation
         try:
-            self.search_request_id = self.data_fetcher.add_request(YTMusicMethod.SEARCH, self.query, filter="songs", limit= limit)
+            self.page_request_id = self.data_fetcher.add_request(
+                YTMusicMethod.SEARCH_PAGE, self.query, "songs", self.songs_continuation
+            )
         except Exception as e:
             logger.exception(f"Error starting data fetcher: {e}")
-            self.switch_to(self.search_results_screen)
-            
-        if limit > 50:
+            self.page_request_id = None
+            return
+        if self.page_request_id is None:
+            logger.warning("Songs page request was not queued")
+            return
+        self.search_results_screen.set_load_more_busy(True)
+
+    def _on_songs_page_fetched(self, page: dict):
+        self.page_request_id = None
+        self.search_results_screen.set_load_more_busy(False)
+        if not page:
+            return
+        self.songs_continuation = page.get("continuation")
+        self.search_results_screen.appendSongs(page.get("results", []))
+        if self.songs_continuation is None:
             self.search_results_screen.loadMoreButton.hide()
 
     def _fetch_search_data(self, query):
@@ -150,6 +180,8 @@ class SearchResultInterface(QStackedWidget):
     
     def clear_results(self):
         self.search_results_screen.clear_results()
+        self.page_request_id = None
+        self.songs_continuation = None
 
         
 category = ["Albums", "Songs", "Featured playlists", "Community playlists", "Artists"]
@@ -115,6 +115,18 @@ class SearchResultScreen(VerticalFrame):
     
         QTimer.singleShot(2000, self.set_cover_from_queue)
         
+    def appendSongs(self, songs: list):
+        """Append one page of song results below the cards already shown."""
+        for song in songs:
+            card = self.createAudioCard(song)
+            if card:
+                self.songsContainer.addWidget(card)
+        QTimer.singleShot(2000, self.set_cover_from_queue)
+
+    def set_load_more_busy(self, busy: bool):
+        self.loadMoreButton.setEnabled(not busy)
+        self.loadMoreButton.setText("Loading..." if busy else "Load More")
+
     def toggle_containers(self):
         contnaires = [self.artistsContainer
                     , self.albumsContainer,
@@ -285,6 +297,8 @@ class SearchResultScreen(VerticalFrame):
         self.query = None
         self.song_count = 1
         self.has_songs = False
+        self.set_load_more_busy(False)
+        self.loadMoreButton.show()
         
 
 if (__name__ == "__main__"):
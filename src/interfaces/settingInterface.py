@@ -3,7 +3,7 @@ import sys
 from PySide6.QtCore import QStandardPaths, Signal
 from PySide6.QtWidgets import QApplication
 from qfluentwidgets import FolderListSettingCard, SwitchSettingCard, OptionsSettingCard, HyperlinkCard, \
-    ComboBoxSettingCard, SettingCardGroup, PrimaryPushSettingCard
+    ComboBoxSettingCard, SettingCardGroup, PrimaryPushSettingCard, RangeSettingCard
 from qfluentwidgets import qconfig, FluentIcon
 
 
@@ -26,6 +26,7 @@ class SettingInterface(VerticalScrollWidget):
         appearance_group = SettingCardGroup("Interface", self)
         playback_group = SettingCardGroup("Playback", self)
         download_group = SettingCardGroup("Download", self)
+        storage_group = SettingCardGroup("Storage", self)
         about_group = SettingCardGroup("About", self)
         theme_card = OptionsSettingCard(
             cfg.theme,
@@ -99,6 +100,27 @@ class SettingInterface(VerticalScrollWidget):
             download_codec
         ])
         
+        thumbnail_quota_card = RangeSettingCard(
+            cfg.thumbnail_cache_quota,
+            FluentIcon.PHOTO,
+            "Thumbnail Cache Size (MB)",
+            "Least recently used thumbnails are removed above this size, liked and saved items are kept",
+            parent=storage_group
+        )
+
+        cover_memory_card = RangeSettingCard(
+            cfg.cover_memory_cache,
+            FluentIcon.SPEED_HIGH,
+            "Cover Memory Cache (MB)",
+            "Memory used to keep decoded covers for fast scrolling",
+            parent=storage_group
+        )
+
+        storage_group.addSettingCards([
+            thumbnail_quota_card,
+            cover_memory_card
+        ])
+
         github_card = HyperlinkCard(
             "https://github.com/dontknow492/BeatRoot.git",
             "GitHub",
@@ -130,6 +152,7 @@ class SettingInterface(VerticalScrollWidget):
             appearance_group,
             playback_group,
             download_group,
+            storage_group,
             about_group
         ])
         about_button.clicked.connect(self.aboutSignal.emit)
@@ -5,14 +5,17 @@ from src.interfaces.view.base.viewbase import ViewBase
 
 from qfluentwidgets import PrimaryPushButton
 
-from PySide6.QtCore import Qt
+from PySide6.QtCore import Qt, Signal
 from src.utility.enums import ImageFolder
+from src.utility.image_cache import ImageLoader
 
 from loguru import logger
 
 from pathlib import Path
 
 class PlaylistViewBase(ViewBase):
+    pageRetryRequested = Signal()  # load more was clicked after a later page failed
+    AUTO_LOAD_MARGIN = 300  # px from the bottom at which the next fetched tracks are shown
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setObjectName('PlaylistViewBase')
@@ -21,12 +24,16 @@ class PlaylistViewBase(ViewBase):
         self.loadMoreButton.setCursor(Qt.CursorShape.PointingHandCursor)
         self.loadMoreButton.clicked.connect(self.loadMore)
         self.loadMoreButton.hide()
+        self.all_tracks_fetched = False
+        self.page_failed = False
+        self.scrollArea.verticalScrollBar().valueChanged.connect(self._on_scrolled)
         
         
     
     
     def loadData(self, data: dict):
-        self.tracks = data.get("tracks", [])
+        # copied, later pages are appended and the fetched page stays cached as is
+        self.tracks = list(data.get("tracks", []))
         if len(self.tracks) == 0:
             self.errorOccurred.emit("No tracks found")
             return False
@@ -35,6 +42,8 @@ class PlaylistViewBase(ViewBase):
         self.artist = data.get("artist", [])
         
         self.thumbnail = Path(ImageFolder.PLAYLIST.path) / f"{self.view_id}.png"
+        self.all_tracks_fetched = data.get("continuation") is None
+        self.page_failed = False
         return True
         # self.update_view_card()
         
@@ -51,17 +60,55 @@ class PlaylistViewBase(ViewBase):
         logger.info(f"loaded tracks: {self.song_count}/{len(self.tracks)}")
         self.uiLoaded.emit()
         
+    def appendTracks(self, tracks: list):
+        """Add a later page of tracks, shown at once if every track before it is shown or the
+        view is scrolled near the bottom, through load more otherwise."""
+        waiting = self.song_count - 1 >= len(self.tracks)
+        self.tracks.extend(tracks)
+        self.page_failed = False
+        if self.song_count - 1 < len(self.tracks):
+            if self.loadMoreButton.isHidden():
+                self.addWidget(self.loadMoreButton, alignment=Qt.AlignmentFlag.AlignCenter)
+                self.loadMoreButton.show()
+            self.loadMoreButton.setEnabled(True)
+            self.loadMoreButton.setText("Load More")
+        logger.info(f"tracks available: {len(self.tracks)}")
+        if tracks and (waiting or self._near_bottom()):
+            self.loadMore()
+        
+    def _near_bottom(self) -> bool:
+        bar = self.scrollArea.verticalScrollBar()
+        return bar.value() >= bar.maximum() - self.AUTO_LOAD_MARGIN
+        
+    def _on_scrolled(self, value: int):
+        if self.tracks and self.song_count - 1 < len(self.tracks) and self._near_bottom():
+            self.loadMore()
+        
+    def setAllTracksFetched(self):
+        self.all_tracks_fetched = True
+        
+    def setPageFailed(self):
+        """A later page could not be fetched, load more asks for it again once every fetched track is shown."""
+        self.page_failed = True
+        if self.song_count - 1 >= len(self.tracks):
+            self.loadMoreButton.setEnabled(True)
+            self.loadMoreButton.setText("Retry")
+        
     def loadMore(self):
         logger.info("load more clicked")
         self.loadMoreButton.setEnabled(False)
         self.loadMoreButton.setText("Loading...")
         for x in range(self.song_count - 1, self.song_count + 20 -1):
-            if x >= len(self.tracks) - 1:
-                logger.info("All songs are loaded")
+            if x >= len(self.tracks):
+                logger.info("All fetched songs are loaded")
                 self.loadMoreButton.setEnabled(False)
-                self.loadMoreButton.setText("No more songs")
+                # later pages re-enable the button when they arrive
+                self.loadMoreButton.setText("No more songs" if self.all_tracks_fetched else "Loading...")
                 self.layout().removeWidget(self.loadMoreButton)
                 self.addWidget(self.loadMoreButton, alignment=Qt.AlignmentFlag.AlignCenter)
+                if self.page_failed and not self.all_tracks_fetched:
+                    self.page_failed = False
+                    self.pageRetryRequested.emit()
                 return
             card = self.createAudioCard(self.tracks[x])
             if card:
@@ -71,5 +118,18 @@ class PlaylistViewBase(ViewBase):
         self.loadMoreButton.setText("Load More")
         self.layout().removeWidget(self.loadMoreButton)
         self.addWidget(self.loadMoreButton, alignment=Qt.AlignmentFlag.AlignCenter)
+        self.prewarm_covers(self.song_count - 1)
+
+    def prewarm_covers(self, start: int, count: int = 20):
+        """Decode the stored covers of the next page so "Load More" shows them instantly."""
+        size = 64 * self.devicePixelRatioF()
+        entries = list()
+        for track in self.tracks[start:start + count]:
+            song_id = track.get("videoId", None)
+            if song_id:
+                path = Path(ImageFolder.SONG.path) / f"{song_id}.png"
+                if path.exists():
+                    entries.append((str(path), size))
+        ImageLoader.instance().prewarm(entries)
     
     
\ No newline at end of file
@@ -46,6 +46,7 @@ class ViewBase(VerticalScrollWidget):
         self.view_id = None
         self.thumbnails_downloader = ThumbnailDownloader(self)
         self.thumbnails_downloader.download_finished.connect(self.set_card_cover)
+        self.thumbnails_downloader.watch_scroll_area(self.scrollArea)
         self.thumbnail = None
         self.description = "Unknown"
         self.set_cover_queue = Queue()
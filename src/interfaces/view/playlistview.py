@@ -13,7 +13,7 @@ from src.interfaces.view.base.playlistbase import PlaylistViewBase
 from src.utility.database_utility import DatabaseManager
 from src.utility.duration_parse import seconds_to_duration
 from src.utility.enums import ImageFolder
-from src.api.data_fetcher import DataFetcherWorker, YTMusicMethod
+from src.api.data_fetcher import DataFetcherWorker, YTMusicMethod, RequestPriority
 from loguru import logger
 
 import asyncio
@@ -25,9 +25,60 @@ class PlaylistView(ViewInterface):
     def __init__(self, data_fetcher, database_manager:DatabaseManager, parent=None):
         super().__init__(data_fetcher, PlaylistViewBase, database_manager, parent)
         self.view_interface.viewCard.addToButton.hide()
+        self.page_request_id = None
+        self.page_continuation = None  # of the page requested last, asked again after it failed
+        self.data_fetcher.error_occurred.connect(self.on_fetching_error)
+        self.view_interface.pageRetryRequested.connect(self.retry_page)
         
     def fetch_view_data(self, playlist_id):
-        self.view_request_id = self.data_fetcher.add_request(YTMusicMethod.GET_PLAYLIST, playlist_id)
+        self.page_request_id = None
+        self.page_continuation = None
+        self.view_request_id = self.data_fetcher.add_request(YTMusicMethod.GET_PLAYLIST_PAGE, playlist_id)
+        
+    def on_fetching_finished(self, data, uid):
+        if uid == self.page_request_id:
+            self.on_page_fetched(data)
+            return
+        if uid != self.view_request_id:
+            return
+        super().on_fetching_finished(data, uid)
+        if data:
+            self.fetch_next_page(data.get("continuation"))
+            
+    def fetch_next_page(self, continuation: str | None):
+        """Request the next page of tracks in the background, or stop once the playlist is exhausted."""
+        self.page_continuation = continuation
+        if continuation is None:
+            self.page_request_id = None
+            self.view_interface.setAllTracksFetched()
+            return
+        self.page_request_id = self.data_fetcher.add_request(
+            YTMusicMethod.GET_PLAYLIST_PAGE, self.get_id(), continuation, priority=RequestPriority.LOW
+        )
+        if self.page_request_id is None:
+            self.on_page_failed("request not queued")
+            
+    def on_fetching_error(self, error: str, uid: str):
+        if uid and uid == self.page_request_id:
+            self.on_page_failed(error)
+            
+    def on_page_failed(self, error: str):
+        logger.error(f"Playlist page could not be fetched: {error}")
+        self.page_request_id = None
+        self.view_interface.setPageFailed()
+        
+    def retry_page(self):
+        if self.page_request_id is None and self.page_continuation is not None:
+            self.fetch_next_page(self.page_continuation)
+        
+    def on_page_fetched(self, page: dict):
+        if not page:
+            self.fetch_next_page(None)
+            return
+        tracks = page.get("tracks", [])
+        logger.info(f"Playlist page fetched: {len(tracks)} tracks")
+        self.view_interface.appendTracks(tracks)
+        self.fetch_next_page(page.get("continuation"))
         
     
     def ready_data(self):
@@ -0,0 +1,85 @@
+"""Check the vectorised border removal against the original PIL implementation.
+
+Usage:
+    python -m src.tools.crop_regression [folder of thumbnails ...]
+
+Without arguments a synthetic corpus of letterboxed and pillarboxed thumbnails is used
+(flat and noisy bars, JPEG artefacts, thin lines between proxy samples, flat images).
+Exits with status 1 if any crop differs.
+"""
+import random
+import sys
+import time
+from io import BytesIO
+from pathlib import Path
+
+from PIL import Image, ImageDraw
+
+from src.utility.crop_image_border import remove_borders, remove_borders_reference
+
+
+def _encode(img: Image.Image, format: str = "JPEG") -> bytes:
+    buffer = BytesIO()
+    img.save(buffer, format=format, quality=85)
+    return buffer.getvalue()
+
+
+def synthetic_corpus(seed: int = 492) -> list:
+    rng = random.Random(seed)
+    corpus = []
+    for index in range(60):
+        width, height = rng.choice([(1280, 720), (640, 480), (480, 360), (120, 90)])
+        bar = rng.choice([(0, 0, 0), (255, 255, 255), (20, 20, 24), tuple(rng.randrange(256) for _ in range(3))])
+        img = Image.new("RGB", (width, height), bar)
+        left = rng.randrange(0, width // 3)
+        upper = rng.randrange(0, height // 4) if index % 3 else 0
+        right = width - rng.randrange(0, width // 3)
+        lower = height - (rng.randrange(0, height // 4) if index % 3 else 0)
+        content = Image.effect_noise((right - left, lower - upper), rng.randrange(10, 90)).convert("RGB")
+        img.paste(content, (left, upper))
+        if index % 5 == 0:
+            # one pixel wide feature the strided proxy can step over
+            draw = ImageDraw.Draw(img)
+            x = rng.randrange(1, max(2, left)) if left > 1 else width - 2
+            draw.line((x, upper, x, lower - 1), fill=(255 - bar[0], 255 - bar[1], 255 - bar[2]))
+        corpus.append((f"synthetic_{index}", _encode(img, "PNG" if index % 4 == 0 else "JPEG")))
+    corpus.append(("flat", _encode(Image.new("RGB", (320, 180), (0, 0, 0)), "PNG")))
+    dot = Image.new("RGB", (320, 180), (0, 0, 0))
+    dot.putpixel((157, 91), (255, 255, 255))
+    corpus.append(("single_pixel", _encode(dot, "PNG")))
+    return corpus
+
+
+def folder_corpus(folder: Path) -> list:
+    return [
+        (file.name, file.read_bytes()) for file in sorted(folder.iterdir())
+        if file.suffix.lower() in (".jpg", ".jpeg", ".png", ".webp")
+    ]
+
+
+def main() -> int:
+    corpus = synthetic_corpus()
+    for folder in sys.argv[1:]:
+        corpus.extend(folder_corpus(Path(folder)))
+
+    mismatches = 0
+    reference_time = vectorised_time = 0.0
+    for name, data in corpus:
+        start = time.perf_counter()
+        expected = remove_borders_reference(data)
+        reference_time += time.perf_counter() - start
+        start = time.perf_counter()
+        result = remove_borders(data)
+        vectorised_time += time.perf_counter() - start
+        if expected.size != result.size or expected.tobytes() != result.tobytes():
+            mismatches += 1
+            print(f"MISMATCH {name}: expected {expected.size}, got {result.size}")
+
+    print(f"{len(corpus)} images, {mismatches} mismatches")
+    print(f"reference  {reference_time * 1000 / len(corpus):7.2f} ms/image")
+    print(f"vectorised {vectorised_time * 1000 / len(corpus):7.2f} ms/image")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
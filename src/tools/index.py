@@ -0,0 +1,137 @@
+"""Index local music folders into the library database without starting the app.
+
+Usage:
+    python -m src.tools.index <folder> [<folder> ...] [--db data/user/database.db] [--workers N]
+                              [--batch-size N] [--cover-workers N] [--no-covers]
+
+Every folder is added to the library like "Add folder" in the app and scanned by the same
+incremental scanner: tags are read by a pool of worker processes and stored in one
+transaction per batch, a folder that was indexed before only has its new and changed files
+read. Embedded covers missing from the artwork cache are extracted on worker threads while
+the scan goes on. Run it from the project root, where the app keeps its data.
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from PySide6.QtCore import QCoreApplication
+from loguru import logger
+
+from src.utility.cover_extractor import extract_cover, song_cover_path
+from src.utility.database_utility import DatabaseManager
+from src.utility.local_scanner import LocalScanner, MetadataPool
+from src.utility.song_utils import folder_uid
+from src.utility.thumbnail_cache import ThumbnailCacheManager
+
+
+class CoverQueue:
+    """Extracts the embedded covers of indexed songs that are not in the artwork cache yet."""
+
+    def __init__(self, workers: int):
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="index-covers")
+        self.futures = dict()  # {song_id: future}
+        self.extracted = 0
+        self.missing = 0
+
+    def submit(self, songs: dict):
+        """Queue ``{song_id: path}`` songs, songs already queued or stored are skipped."""
+        for song_id, path in songs.items():
+            cover_path = song_cover_path(song_id)
+            if song_id in self.futures or os.path.exists(cover_path):
+                continue
+            self.futures[song_id] = self.executor.submit(extract_cover, path, cover_path)
+
+    async def wait(self) -> float:
+        """Wait for every queued cover and return the seconds spent waiting."""
+        start = time.perf_counter()
+        await asyncio.to_thread(self.executor.shutdown, wait=True)
+        cache = ThumbnailCacheManager.instance()
+        for song_id, future in self.futures.items():
+            if future.exception() is None and not future.result():
+                self.extracted += 1
+                cache.record(song_cover_path(song_id))
+            else:
+                self.missing += 1
+        return time.perf_counter() - start
+
+
+async def index(folders: list[str], db_path: str, schema_path: str, workers: int, batch_size: int,
+                cover_workers: int):
+    database_manager = DatabaseManager(db_path, schema_path)
+    pool = MetadataPool(workers)
+    scanner = LocalScanner(database_manager, pool, batch_size)
+    covers = CoverQueue(cover_workers) if cover_workers else None
+    known = {row[0] for row in await database_manager.get_local_directories() or []}
+
+    def on_songs(songs):
+        if covers:
+            covers.submit({song["videoId"]: song["path"] for song in songs})
+
+    start = time.perf_counter()
+    summaries = list()
+    try:
+        for folder in folders:
+            folder_id = folder_uid(folder)
+            if folder_id not in known:
+                await database_manager.insert_local_directory(folder_id, folder)
+                known.add(folder_id)
+            summary = await scanner.scan(folder_id, folder, on_songs=on_songs)
+            if covers:
+                # songs indexed before still get their cover if it is not cached
+                covers.submit({song_id: path for path, song_id in summary.unchanged.items() if song_id})
+            summaries.append(summary)
+            print(summary)
+    finally:
+        pool.shutdown()
+    scanned = time.perf_counter() - start
+    cover_wait = await covers.wait() if covers else 0.0
+    await database_manager.close()
+    ThumbnailCacheManager.instance().shutdown()
+    elapsed = time.perf_counter() - start
+
+    read = sum(summary.added + summary.changed for summary in summaries)
+    failed = sum(summary.failed for summary in summaries)
+    total = sum(len(summary.unchanged) + summary.added + summary.changed - summary.failed for summary in summaries)
+    print(f"{len(summaries)} folders, {total} songs indexed in {elapsed:.2f}s")
+    print(f"  tags    {read:>8} files read, {failed} unreadable, {read / scanned if scanned else 0:8.1f} files/sec "
+          f"with {workers} workers in batches of {batch_size}")
+    if covers:
+        print(f"  covers  {covers.extracted:>8} extracted, {covers.missing} without a cover, "
+              f"{cover_wait:.2f}s after the scan")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("folders", nargs="+", help="music folders to add, scanned recursively")
+    parser.add_argument("--db", default="data/user/database.db", help="library database, created if missing")
+    parser.add_argument("--schema", default="data/user/schema.sql", help="schema of a new database")
+    parser.add_argument("--workers", type=int, default=max(1, (os.cpu_count() or 2) - 1),
+                        help="processes reading tags")
+    parser.add_argument("--batch-size", type=int, default=1024, help="files stored per transaction")
+    parser.add_argument("--cover-workers", type=int, default=4, help="threads extracting covers")
+    parser.add_argument("--no-covers", action="store_true", help="leave covers to the app")
+    parser.add_argument("--verbose", action="store_true", help="log every database write")
+    args = parser.parse_args()
+
+    folders = list()
+    for folder in args.folders:
+        if not os.path.isdir(folder):
+            parser.error(f"not a folder: {folder}")
+        folders.append(os.path.abspath(folder))
+    if not args.verbose:
+        logger.remove()
+        logger.add(sys.stderr, level="WARNING")
+
+    app = QCoreApplication(sys.argv)  # the thumbnail cache is a QObject with a flush timer
+    asyncio.run(index(
+        folders, args.db, args.schema, max(1, args.workers), max(1, args.batch_size),
+        0 if args.no_covers else max(1, args.cover_workers),
+    ))
+    app.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Benchmark tag extraction of local files, in process and through the metadata pool.
+
+Usage:
+    python -m src.tools.metadata_benchmark <music folder> [--workers N ...] [--limit N]
+
+Without a folder a set of short synthetic WAV files is generated.
+"""
+import argparse
+import asyncio
+import tempfile
+import time
+import wave
+from pathlib import Path
+
+from src.utility.local_scanner import MetadataPool, read_files, walk_audio_files
+
+
+def synthetic_library(folder: str, count: int = 2000) -> str:
+    for index in range(count):
+        path = Path(folder, f"album_{index % 50}", f"track_{index}.wav")
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with wave.open(str(path), "wb") as file:
+            file.setnchannels(2)
+            file.setsampwidth(2)
+            file.setframerate(44100)
+            file.writeframes(b"\0" * 4 * 4410)
+    return folder
+
+
+def run_inline(files: list) -> float:
+    """Read every file on the calling thread, as ``LocalView`` used to, and return files per second."""
+    start = time.perf_counter()
+    read_files(files)
+    return len(files) / (time.perf_counter() - start)
+
+
+async def run_pool(files: list, workers: int) -> tuple[float, float]:
+    """Read every file through a ``MetadataPool``.
+
+    Returns:
+        tuple: (files per second, seconds until the first chunk arrived)
+    """
+    pool = MetadataPool(workers)
+    # start the workers outside the measurement, the app keeps its pool alive
+    await asyncio.get_running_loop().run_in_executor(pool._executor(), read_files, [])
+    start = time.perf_counter()
+    first = None
+    count = 0
+    async for chunk in pool.read(files):
+        if first is None:
+            first = time.perf_counter() - start
+        count += len(chunk)
+    elapsed = time.perf_counter() - start
+    pool.shutdown()
+    return count / elapsed, first or 0.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("source", nargs="?", type=Path, help="folder of audio files, scanned recursively")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--limit", type=int, default=0, help="only read the first N files")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as folder:
+        source = str(args.source) if args.source else synthetic_library(folder)
+        files = list(walk_audio_files(source))
+        if args.limit:
+            files = files[:args.limit]
+        if not files:
+            parser.error(f"no audio files found in {source}")
+        print(f"{len(files)} files")
+        print(f"inline     {run_inline(files):8.1f} files/sec")
+        for workers in args.workers:
+            rate, first = asyncio.run(run_pool(files, workers))
+            print(f"workers={workers:<3} {rate:8.1f} files/sec, first chunk after {first * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
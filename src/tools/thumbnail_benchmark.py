@@ -0,0 +1,89 @@
+"""Benchmark thumbnail post-processing (decode, border crop, encode, atomic write, variants).
+
+Usage:
+    python -m src.tools.thumbnail_benchmark <image or folder> [--workers N] [--repeat N]
+
+Without arguments a set of synthetic letterboxed 1280x720 thumbnails is generated.
+Images are written to a temporary folder, not through the artwork store: the store would
+put them into the user's cache and skip repeated images, which would inflate the rate.
+"""
+import argparse
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from pathlib import Path
+
+from PIL import Image
+
+from src.utility.downloader.thumbnail_service import encode_thumbnail
+from src.utility.thumbnail_cache import generate_variants, write_atomic
+
+
+def synthetic_thumbnails(count: int = 16) -> list:
+    images = []
+    for index in range(count):
+        img = Image.new("RGB", (1280, 720), (0, 0, 0))
+        inner = Image.effect_noise((720, 720), 40 + index).convert("RGB")
+        img.paste(inner, (280, 0))
+        buffer = BytesIO()
+        img.save(buffer, format="JPEG", quality=90)
+        images.append(buffer.getvalue())
+    return images
+
+
+def load_images(source: Path) -> list:
+    files = [source] if source.is_file() else sorted(
+        file for file in source.iterdir() if file.suffix.lower() in (".jpg", ".jpeg", ".png", ".webp")
+    )
+    return [file.read_bytes() for file in files]
+
+
+def process(output_path: str, data: bytes) -> str:
+    """``process_thumbnail`` without the artwork store, every image is written with its variants."""
+    try:
+        data, image = encode_thumbnail(data, True)
+
+        def write(tmp_path):
+            with open(tmp_path, "wb") as file:
+                file.write(data)
+        write_atomic(output_path, write)
+        generate_variants(output_path, image)
+    except Exception as e:
+        return str(e) or e.__class__.__name__
+    return ""
+
+
+def run(images: list, workers: int, repeat: int) -> float:
+    """Process every image ``repeat`` times and return images per second."""
+    with tempfile.TemporaryDirectory() as output_dir:
+        jobs = [
+            (str(Path(output_dir, f"{run}_{index}.png")), data)
+            for run in range(repeat) for index, data in enumerate(images)
+        ]
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            errors = [e for e in executor.map(lambda job: process(*job), jobs) if e]
+        elapsed = time.perf_counter() - start
+    if errors:
+        print(f"{len(errors)} images failed: {errors[0]}")
+    return len(jobs) / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("source", nargs="?", type=Path, help="image file or folder of thumbnails")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--repeat", type=int, default=4)
+    args = parser.parse_args()
+
+    images = load_images(args.source) if args.source else synthetic_thumbnails()
+    if not images:
+        parser.error(f"no images found in {args.source}")
+    print(f"{len(images)} images x {args.repeat} runs")
+    for workers in args.workers:
+        print(f"workers={workers:<3} {run(images, workers, args.repeat):8.1f} images/sec")
+
+
+if __name__ == "__main__":
+    main()
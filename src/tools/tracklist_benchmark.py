@@ -0,0 +1,158 @@
+"""Benchmark opening a local folder view: the virtualised track list against a card per track.
+
+Usage:
+    python -m src.tools.tracklist_benchmark [--sizes 1000 10000 50000] [--cards 1000]
+
+Synthetic tracks are used, no files or database are needed. Open time covers building
+the list, showing it and the first paint; memory is the resident set growth of the process.
+Sorting and filtering of the opened list is timed too, the first sort of a type builds its
+order, the second one is served from the index.
+"""
+import argparse
+import ctypes
+import os
+import sys
+import time
+
+from PySide6.QtWidgets import QApplication
+
+from src.components.lists.trackList import TrackListModel, TrackProxyModel, TrackListView
+from src.utility.duration_parse import seconds_to_duration
+from src.utility.enums import SortType
+
+
+def synthetic_tracks(count: int) -> list[dict]:
+    return [
+        {
+            "videoId": f"{index:016x}",
+            "path": os.path.join("music", f"album_{index % 500}", f"track_{index}.mp3"),
+            "title": f"Track {index}",
+            "artists": f"Artist {index % 300}",
+            "album": f"Album {index % 500}",
+            "duration_sec": 120 + index % 240,
+            "duration": seconds_to_duration(120 + index % 240),
+            "mtime": 1_600_000_000 + (index * 7919) % count,
+        }
+        for index in range(count)
+    ]
+
+
+def rss_bytes() -> int:
+    """Resident set size of this process, 0 where it cannot be read."""
+    if sys.platform == "win32":
+        class Counters(ctypes.Structure):
+            _fields_ = [("cb", ctypes.c_ulong), ("PageFaultCount", ctypes.c_ulong)] + [
+                (name, ctypes.c_size_t) for name in (
+                    "PeakWorkingSetSize", "WorkingSetSize", "QuotaPeakPagedPoolUsage", "QuotaPagedPoolUsage",
+                    "QuotaPeakNonPagedPoolUsage", "QuotaNonPagedPoolUsage", "PagefileUsage", "PeakPagefileUsage",
+                )
+            ]
+        counters = Counters()
+        counters.cb = ctypes.sizeof(Counters)
+        process = ctypes.windll.kernel32.GetCurrentProcess()
+        ctypes.windll.psapi.GetProcessMemoryInfo(process, ctypes.byref(counters), counters.cb)
+        return counters.WorkingSetSize
+    try:
+        with open("/proc/self/statm") as file:
+            return int(file.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        return 0
+
+
+def open_list(tracks: list[dict]):
+    view = TrackListView()
+    model = TrackListModel(view)
+    model.set_tracks(tracks)
+    view.setModel(model)
+    return view
+
+
+def open_cards(tracks: list[dict]):
+    """One ``AudioCard`` per track in a scroll widget, how ``LocalView`` used to render."""
+    from src.common.myScroll import VerticalScrollWidget
+    from src.components.cards.audioCard import AudioCard
+    view = VerticalScrollWidget("cards")
+    for count, track in enumerate(tracks, 1):
+        card = AudioCard(False)
+        card.setCardInfo(track)
+        card.setCount(count)
+        view.addWidget(card)
+    return view
+
+
+def measure(app: QApplication, factory, tracks: list[dict]) -> tuple[float, int]:
+    """Open the view built by ``factory``.
+
+    Returns:
+        tuple: (seconds until the first paint is done, resident bytes it added)
+    """
+    app.processEvents()
+    before = rss_bytes()
+    start = time.perf_counter()
+    view = factory(tracks)
+    view.resize(960, 720)
+    view.show()
+    app.processEvents()
+    elapsed = time.perf_counter() - start
+    grown = rss_bytes() - before
+    view.close()
+    view.deleteLater()
+    app.processEvents()
+    return elapsed, grown
+
+
+def measure_sorting(app: QApplication, tracks: list[dict]) -> dict:
+    """Milliseconds of every sort, its repeat and a filter on a shown list.
+
+    Returns:
+        dict: {label: ms}
+    """
+    view = TrackListView()
+    model = TrackListModel(view)
+    proxy = TrackProxyModel(view)
+    proxy.set_source(model)
+    model.set_tracks(tracks)
+    view.setModel(proxy)
+    view.resize(960, 720)
+    view.show()
+    app.processEvents()
+    timings = dict()
+
+    def timed(label, action):
+        start = time.perf_counter()
+        action()
+        app.processEvents()
+        timings[label] = (time.perf_counter() - start) * 1000
+
+    timed("index", lambda: proxy.sort_by(None))
+    for sort_type in SortType:
+        timed(sort_type.name, lambda: proxy.sort_by(sort_type))
+        timed(f"{sort_type.name} again", lambda: proxy.sort_by(sort_type))
+    timed("filter 'artist 12'", lambda: proxy.set_filter("artist 12"))
+    timed("filter cleared", lambda: proxy.set_filter(""))
+    view.close()
+    view.deleteLater()
+    app.processEvents()
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 50000])
+    parser.add_argument("--cards", type=int, nargs="*", default=[1000],
+                        help="sizes to also open as one card per track, slow beyond a few thousand")
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv)
+    for size in args.sizes:
+        elapsed, grown = measure(app, open_list, synthetic_tracks(size))
+        print(f"list  {size:>6} tracks: opened in {elapsed * 1000:8.1f} ms, +{grown / 2**20:7.1f} MiB")
+        for label, ms in measure_sorting(app, synthetic_tracks(size)).items():
+            print(f"      {label:>20}: {ms:8.1f} ms")
+    for size in args.cards:
+        elapsed, grown = measure(app, open_cards, synthetic_tracks(size))
+        print(f"cards {size:>6} tracks: opened in {elapsed * 1000:8.1f} ms, +{grown / 2**20:7.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
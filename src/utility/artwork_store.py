@@ -0,0 +1,137 @@
+import os
+import shutil
+import sqlite3
+import threading
+import uuid
+from pathlib import Path
+
+import xxhash
+from loguru import logger
+
+from src.utility.enums import ImageFolder
+from src.utility.thumbnail_cache import write_atomic, INDEX_NAME, ARTWORK_FOLDER
+
+# magic bytes -> file suffix, anything else is stored as .png like the rest of the cache
+_SIGNATURES = (
+    (b"\xff\xd8\xff", ".jpg"),
+    (b"\x89PNG\r\n\x1a\n", ".png"),
+    (b"GIF8", ".gif"),
+    (b"BM", ".bmp"),
+)
+
+
+def _suffix_of(data: bytes) -> str:
+    if data[:4] == b"RIFF" and data[8:12] == b"WEBP":
+        return ".webp"
+    for signature, suffix in _SIGNATURES:
+        if data.startswith(signature):
+            return suffix
+    return ".png"
+
+
+def _link(source: str, link_path: str):
+    """Atomically point ``link_path`` at ``source``, hard link when the filesystem allows it."""
+    directory, name = os.path.split(link_path)
+    Path(directory or ".").mkdir(parents=True, exist_ok=True)
+    tmp_path = os.path.join(directory, f".{name}.{uuid.uuid4().hex[:8]}")
+    try:
+        os.link(source, tmp_path)
+    except OSError:
+        shutil.copyfile(source, tmp_path)
+    try:
+        os.replace(tmp_path, link_path)
+    except OSError:
+        os.remove(tmp_path)
+        raise
+
+
+class ArtworkStore:
+    """Content addressed artwork, one file per distinct image.
+
+    Images are stored once as ``artwork/{hash[:2]}/{hash}.{ext}`` (xxh3 of the stored bytes)
+    and the usual ``{folder}/{id}.png`` path becomes a hard link to it, so existing callers
+    keep working while album tracks sharing a cover only cost one file on disk. ``resolve``
+    maps an id path back to its blob so variants, decoding and the pixmap cache all work on
+    the shared file.
+
+    Thread safe, ``put`` is called from the thumbnail worker pool.
+    """
+
+    _instance = None
+
+    def __init__(self, root: str = ImageFolder.IMAGE_DIR.value):
+        self.root = os.path.join(root, ARTWORK_FOLDER)
+        self.index_path = os.path.join(root, INDEX_NAME)
+        self._lock = threading.Lock()
+        Path(self.root).mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(self.index_path, check_same_thread=False, timeout=10)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS artwork ("
+            "path TEXT PRIMARY KEY, item_id TEXT NOT NULL, hash TEXT NOT NULL, blob TEXT NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS idx_artwork_hash ON artwork(hash)")
+        self._db.commit()
+        self._blobs = dict(self._db.execute("SELECT path, blob FROM artwork"))  # {id path: blob path}
+
+    @classmethod
+    def instance(cls) -> "ArtworkStore":
+        if cls._instance is None:
+            cls._instance = ArtworkStore()
+        return cls._instance
+
+    def blob_path(self, digest: str, suffix: str) -> str:
+        return os.path.join(self.root, digest[:2], f"{digest}{suffix}")
+
+    def put(self, path: str, data: bytes) -> tuple[str, bool]:
+        """Store ``data`` as the artwork of ``path`` (``{folder}/{id}.png``).
+
+        Returns:
+            tuple: (blob path, True if this image was not stored before)
+        """
+        digest = xxhash.xxh3_64_hexdigest(data)
+        blob = self.blob_path(digest, _suffix_of(data))
+        created = not os.path.exists(blob)
+        if created:
+            Path(blob).parent.mkdir(parents=True, exist_ok=True)
+
+            def write(tmp_path):
+                with open(tmp_path, "wb") as file:
+                    file.write(data)
+            write_atomic(blob, write)
+        _link(blob, path)
+        with self._lock:
+            self._blobs[path] = blob
+            with self._db:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO artwork VALUES (?, ?, ?, ?)", (path, Path(path).stem, digest, blob)
+                )
+        return blob, created
+
+    def resolve(self, path: str) -> str:
+        """Blob behind an id path, the path itself for artwork stored outside the store."""
+        return self._blobs.get(path, path)
+
+    def forget(self, path: str) -> str | None:
+        """Drop the mapping of an evicted id path.
+
+        Returns:
+            str | None: the blob path if no other id references it any more, so it can be deleted.
+        """
+        with self._lock:
+            blob = self._blobs.pop(path, None)
+            if blob is None:
+                return None
+            with self._db:
+                self._db.execute("DELETE FROM artwork WHERE path = ?", (path,))
+                remaining = self._db.execute("SELECT COUNT(*) FROM artwork WHERE blob = ?", (blob,)).fetchone()[0]
+        return None if remaining else blob
+
+    def stats(self) -> dict:
+        with self._lock:
+            ids, blobs = self._db.execute("SELECT COUNT(*), COUNT(DISTINCT hash) FROM artwork").fetchone()
+        return {"ids": ids, "blobs": blobs}
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+        logger.debug("Artwork store closed")
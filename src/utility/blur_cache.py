@@ -0,0 +1,127 @@
+import os
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from PySide6.QtCore import QObject, Signal
+from PySide6.QtGui import QImage
+from PIL import Image, ImageFilter
+from loguru import logger
+
+from src.utility.enums import ImageFolder
+from src.utility.thumbnail_cache import write_atomic, cover_for_size, ThumbnailCacheManager
+
+BLUR_SIZE = 256  # longest side the blur is computed at, it is scaled up when painted
+BLUR_QUALITY = 90
+
+
+def blur_path(song_id: str, radius: int) -> str:
+    return os.path.join(ImageFolder.BLUR.path, f"{song_id}_{radius}.jpg")
+
+
+def _to_qimage(image: Image.Image) -> QImage:
+    image = image.convert("RGB")
+    data = image.tobytes()
+    return QImage(data, image.width, image.height, image.width * 3, QImage.Format.Format_RGB888).copy()
+
+
+def render_blur(cover_path: str, output_path: str, radius: int) -> tuple[QImage, bool]:
+    """Blurred copy of ``cover_path``, read from ``output_path`` if it was rendered before.
+
+    The cover is shrunk to ``BLUR_SIZE`` before blurring: a blurred image has no detail to
+    lose, so this looks the same once scaled up and costs a fraction of a full size blur.
+    Runs on a worker thread.
+
+    Returns:
+        tuple: (blurred image, True if it was rendered and written to ``output_path``)
+    """
+    if os.path.exists(output_path):
+        image = QImage(output_path)
+        if not image.isNull():
+            return image, False
+    with Image.open(cover_path) as img:
+        img.draft("RGB", (BLUR_SIZE, BLUR_SIZE))
+        image = img.convert("RGB")
+    image.thumbnail((BLUR_SIZE, BLUR_SIZE), Image.Resampling.BILINEAR)
+    # QGraphicsBlurEffect radius is roughly two standard deviations
+    image = image.filter(ImageFilter.GaussianBlur(radius / 2))
+    Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+    write_atomic(output_path, lambda tmp_path: image.save(tmp_path, "JPEG", quality=BLUR_QUALITY))
+    return _to_qimage(image), True
+
+
+class BlurCache(QObject):
+    """Blurred backgrounds per song id and radius, kept on disk and in memory.
+
+    ``get`` returns a cached image or renders it on a worker and emits ``ready`` once it is
+    available. Rendered files are accounted by the thumbnail cache, so they are evicted with
+    the rest of the artwork.
+    """
+    ready = Signal(str, int, QImage)  # song id, radius, blurred image
+    _rendered = Signal(str, int, QImage, str)  # song id, radius, image, written path; emitted from worker threads
+
+    MAX_ENTRIES = 8
+
+    _instance = None
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="blur")
+        self._images = OrderedDict()  # {(song id, radius): QImage}
+        self._pending = set()
+        self._rendered.connect(self._on_rendered)
+
+    @classmethod
+    def instance(cls) -> "BlurCache":
+        if cls._instance is None:
+            cls._instance = BlurCache()
+        return cls._instance
+
+    def get(self, song_id: str, cover_path: str, radius: int) -> QImage | None:
+        """Blurred cover of ``song_id`` if already in memory, otherwise None and ``ready``
+        is emitted when it has been loaded or rendered."""
+        key = (song_id, radius)
+        image = self._images.get(key)
+        if image is not None:
+            self._images.move_to_end(key)
+            ThumbnailCacheManager.instance().touch(blur_path(song_id, radius))
+            return image
+        self.prefetch(song_id, cover_path, radius)
+        return None
+
+    def prefetch(self, song_id: str, cover_path: str, radius: int):
+        """Load or render the blurred cover of ``song_id`` in the background, e.g. the next track."""
+        key = (song_id, radius)
+        if key in self._images or key in self._pending or not Path(cover_path).exists():
+            return
+        self._pending.add(key)
+        # the smallest variant still larger than the blur keeps decoding cheap
+        source = cover_for_size(cover_path, BLUR_SIZE)
+        future = self.executor.submit(render_blur, source, blur_path(song_id, radius), radius)
+        future.add_done_callback(lambda future: self._on_done(song_id, radius, future))
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    def _on_done(self, song_id: str, radius: int, future):
+        # worker thread
+        if future.cancelled():
+            return
+        if future.exception() is not None:
+            logger.warning(f"Failed to blur cover of {song_id}: {future.exception()}")
+            self._rendered.emit(song_id, radius, QImage(), "")
+            return
+        image, written = future.result()
+        self._rendered.emit(song_id, radius, image, blur_path(song_id, radius) if written else "")
+
+    def _on_rendered(self, song_id: str, radius: int, image: QImage, written_path: str):
+        key = (song_id, radius)
+        self._pending.discard(key)
+        if image.isNull():
+            return
+        if written_path:
+            ThumbnailCacheManager.instance().record(written_path)
+        self._images[key] = image
+        while len(self._images) > self.MAX_ENTRIES:
+            self._images.popitem(last=False)
+        self.ready.emit(song_id, radius, image)
@@ -0,0 +1,96 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from PySide6.QtCore import QObject, Signal
+from loguru import logger
+
+from src.utility.downloader.thumbnail_service import process_thumbnail
+from src.utility.enums import ImageFolder
+from src.utility.song_utils import get_cover_data
+from src.utility.thumbnail_cache import ThumbnailCacheManager
+
+
+def song_cover_path(song_id: str) -> str:
+    return f"{ImageFolder.SONG.path}\\{song_id}.png"
+
+
+def extract_cover(file_path: str, output_path: str) -> str:
+    """Read the embedded cover of ``file_path`` and store it at ``output_path`` with its variants.
+
+    Runs on a worker thread. Returns an empty string on success, the reason otherwise.
+    """
+    data = get_cover_data(file_path)
+    if not data:
+        return "no embedded cover"
+    return process_thumbnail(output_path, data, False)
+
+
+class CoverExtractor(QObject):
+    """Embedded covers of local songs, extracted on demand.
+
+    Tag parsing leaves the picture out so song metadata stays small; a cover is only read
+    from the file the first time a song is shown, stored once in the artwork cache under
+    the song id and referenced by path from then on. Requests for the same song are
+    coalesced and songs without a cover are not read again this session.
+    """
+    extracted = Signal(str, str)  # song id, cover path
+    _done = Signal(str, str, str)  # song id, cover path, error; emitted from worker threads
+
+    MAX_WORKERS = 2
+
+    _instance = None
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.executor = ThreadPoolExecutor(max_workers=self.MAX_WORKERS, thread_name_prefix="cover-extractor")
+        self._stored = set()   # song ids whose cover is known to be on disk
+        self._pending = set()  # song ids being extracted
+        self._missing = set()  # song ids whose file has no usable cover
+        self._done.connect(self._on_done)
+
+    @classmethod
+    def instance(cls) -> "CoverExtractor":
+        if cls._instance is None:
+            cls._instance = CoverExtractor()
+        return cls._instance
+
+    def request(self, song_id: str, file_path: str) -> str | None:
+        """Cover path of a local song, None while it still has to be extracted.
+
+        ``extracted`` is emitted once a missing cover is stored.
+        """
+        cover_path = song_cover_path(song_id)
+        if song_id in self._stored:
+            return cover_path
+        if song_id in self._pending or song_id in self._missing:
+            return None
+        if os.path.exists(cover_path):
+            # cheap enough to ask for on every paint
+            self._stored.add(song_id)
+            return cover_path
+        self._pending.add(song_id)
+        future = self.executor.submit(extract_cover, file_path, cover_path)
+        future.add_done_callback(lambda future: self._on_future_done(song_id, cover_path, future))
+        return None
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    def _on_future_done(self, song_id: str, cover_path: str, future):
+        # worker thread
+        if future.cancelled():
+            return
+        if future.exception() is not None:
+            self._done.emit(song_id, cover_path, str(future.exception()) or "extraction failed")
+            return
+        self._done.emit(song_id, cover_path, future.result())
+
+    def _on_done(self, song_id: str, cover_path: str, error: str):
+        self._pending.discard(song_id)
+        if error:
+            self._missing.add(song_id)
+            logger.debug(f"No cover for local song {song_id}: {error}")
+            return
+        self._stored.add(song_id)
+        ThumbnailCacheManager.instance().record(cover_path)
+        self.extracted.emit(song_id, cover_path)
@@ -1,35 +1,204 @@
 from PIL import Image, ImageChops
-import requests
+import numpy as np
 from io import BytesIO
 from collections import defaultdict
 
+PROXY_SIZE = 90  # shorter side of the proxy used to find the content box
+EDGE_BAND = 16  # JPEG ringing spreads up to one 16x16 MCU past the content edge
+
+
 def get_border_color(img):
     """Determine border color by sampling edges"""
     width, height = img.size
     samples = []
-    
+
     # Sample points along all edges
     step = max(1, min(width, height) // 20)  # Dynamic step size
-    
+
     # Top and bottom edges
     for x in range(0, width, step):
         samples.append(img.getpixel((x, 0)))
         samples.append(img.getpixel((x, height-1)))
-    
+
     # Left and right edges
     for y in range(0, height, step):
         samples.append(img.getpixel((0, y)))
         samples.append(img.getpixel((width-1, y)))
-    
+
     # Find most common color
     color_counts = defaultdict(int)
     for color in samples:
         color_counts[color] += 1
     return max(color_counts, key=lambda k: color_counts[k])
 
+
+def get_border_color_array(pixels: np.ndarray) -> np.ndarray:
+    """Vectorised ``get_border_color`` for an (height, width, 3) uint8 array.
+
+    Samples the same edge pixels in the same order, so ties resolve to the same colour.
+    """
+    height, width = pixels.shape[:2]
+    step = max(1, min(width, height) // 20)
+    xs = np.arange(0, width, step)
+    ys = np.arange(0, height, step)
+    horizontal = np.stack((pixels[0, xs], pixels[height - 1, xs]), axis=1).reshape(-1, 3)
+    vertical = np.stack((pixels[ys, 0], pixels[ys, width - 1]), axis=1).reshape(-1, 3)
+    samples = np.concatenate((horizontal, vertical))
+
+    packed = (samples[:, 0].astype(np.uint32) << 16) | (samples[:, 1].astype(np.uint32) << 8) | samples[:, 2]
+    colors, first_index, counts = np.unique(packed, return_index=True, return_counts=True)
+    # most common colour, earliest sample wins a tie
+    best = np.lexsort((first_index, -counts))[0]
+    return samples[first_index[best]]
+
+
+def _bounds(border_color: np.ndarray, threshold: int):
+    color = border_color.astype(np.int16)
+    high = np.minimum(color + threshold, 255).astype(np.uint8)
+    low = np.maximum(color - threshold, 0).astype(np.uint8)
+    return low, high
+
+
+def _content_mask(pixels: np.ndarray, border_color: np.ndarray, threshold: int) -> np.ndarray:
+    """Pixels whose greyscale difference to the border colour exceeds ``threshold``.
+
+    Matches ``ImageChops.difference`` followed by ``convert('L')`` (ITU-R 601-2 luma with
+    Pillow's fixed point rounding). The luma never exceeds the largest channel difference,
+    so rows within ``threshold`` on every channel are rejected with cheap uint8 compares
+    and the exact luma is only computed for the remaining rows.
+
+    ``pixels`` is (rows, width, 3); comparisons run on the interleaved (rows, width * 3)
+    layout against a tiled colour, which vectorises far better than broadcasting over the
+    trailing channel axis.
+    """
+    rows, width = pixels.shape[:2]
+    lines = pixels.reshape(rows, width * 3)
+    low, high = _bounds(border_color, threshold)
+    outside = (lines > np.tile(high, width)) | (lines < np.tile(low, width))
+    candidates = outside[:, 0::3] | outside[:, 1::3] | outside[:, 2::3]
+    hit_rows = np.flatnonzero(candidates.any(axis=1))
+    if hit_rows.size == 0:
+        return candidates
+    lines = lines[hit_rows]
+    color = np.tile(border_color.astype(np.uint8), width)
+    diff = (np.maximum(lines, color) - np.minimum(lines, color)).astype(np.uint32)
+    luma = (diff[:, 0::3] * 19595 + diff[:, 1::3] * 38470 + diff[:, 2::3] * 7471 + 0x8000) >> 16
+    candidates[hit_rows] &= luma > threshold
+    return candidates
+
+
+def _is_border(pixels: np.ndarray, low: np.ndarray, high: np.ndarray) -> bool:
+    """True if every channel of every pixel stays within ``threshold`` of the border colour."""
+    if pixels.size == 0:
+        return True
+    rows, width = pixels.shape[:2]
+    lines = pixels.reshape(rows, width * 3)
+    return not ((lines > np.tile(high, width)).any() or (lines < np.tile(low, width)).any())
+
+
+def _content_lines(strip: np.ndarray, axis: int, band: int, band_at_end: bool,
+                   border_color: np.ndarray, threshold: int) -> np.ndarray:
+    """Which rows (axis 0) or columns (axis 1) of ``strip`` hold content.
+
+    ``band`` lines next to the inner content box usually do, the rest of the strip is
+    normally plain border and is first cleared with a single pass of uint8 compares.
+    """
+    length = strip.shape[axis]
+    band = min(band, length)
+    split = length - band if band_at_end else band
+    outer = (slice(0, split) if band_at_end else slice(split, length))
+    inner = (slice(split, length) if band_at_end else slice(0, split))
+    index = (outer, slice(None)) if axis == 0 else (slice(None), outer)
+    if not _is_border(strip[index], *_bounds(border_color, threshold)):
+        return _content_mask(strip, border_color, threshold).any(axis=1 - axis)
+    lines = np.zeros(length, dtype=bool)
+    index = (inner, slice(None)) if axis == 0 else (slice(None), inner)
+    lines[inner] = _content_mask(strip[index], border_color, threshold).any(axis=1 - axis)
+    return lines
+
+
+def _first(flags: np.ndarray):
+    hits = np.flatnonzero(flags)
+    return int(hits[0]) if hits.size else None
+
+
+def _last(flags: np.ndarray):
+    hits = np.flatnonzero(flags)
+    return int(hits[-1]) if hits.size else None
+
+
+def find_content_box(pixels: np.ndarray, border_color: np.ndarray, threshold: int = 25):
+    """Bounding box (left, upper, right, lower) of non border pixels, same as ``getbbox``.
+
+    A strided proxy finds content pixels that are guaranteed to lie inside the box, then
+    only the full resolution strips between that inner box and the image edges are scanned.
+    Returns None if the image is a single flat colour.
+    """
+    height, width = pixels.shape[:2]
+    step = max(1, min(width, height) // PROXY_SIZE)
+    proxy = _content_mask(np.ascontiguousarray(pixels[::step, ::step]), border_color, threshold)
+    rows = proxy.any(axis=1)
+    if not rows.any():
+        # content may sit between proxy samples, fall back to the full image
+        mask = _content_mask(pixels, border_color, threshold)
+        rows = mask.any(axis=1)
+        if not rows.any():
+            return None
+        columns = mask.any(axis=0)
+        return _first(columns), _first(rows), _last(columns) + 1, _last(rows) + 1
+    columns = proxy.any(axis=0)
+    band = step + EDGE_BAND
+
+    # inner box in full resolution, every edge of it is a real content pixel
+    upper = _first(rows) * step
+    lower = _last(rows) * step + 1
+    left = _first(columns) * step
+    right = _last(columns) * step + 1
+
+    hit = _first(_content_lines(pixels[:upper], 0, band, True, border_color, threshold))
+    if hit is not None:
+        upper = hit
+    hit = _last(_content_lines(pixels[lower:], 0, band, False, border_color, threshold))
+    if hit is not None:
+        lower = lower + hit + 1
+    hit = _first(_content_lines(pixels[upper:lower, :left], 1, band, True, border_color, threshold))
+    if hit is not None:
+        left = hit
+    hit = _last(_content_lines(pixels[upper:lower, right:], 1, band, False, border_color, threshold))
+    if hit is not None:
+        right = right + hit + 1
+    return left, upper, right, lower
+
+
 def remove_borders(image_data, padding=3, threshold=25):
     """Improved border removal with error handling and padding"""
 
+    try:
+        img = Image.open(BytesIO(image_data)).convert('RGB')
+    except Exception as e:
+        print(f"Image processing error: {e}")
+        return None
+
+    pixels = np.asarray(img)
+    bbox = find_content_box(pixels, get_border_color_array(pixels), threshold)
+    if not bbox:
+        print("No borders detected")
+        return img
+
+    # Apply padding with boundary checks
+    left, upper, right, lower = bbox
+    left = max(0, left - padding)
+    upper = max(0, upper - padding)
+    right = min(img.width, right + padding)
+    lower = min(img.height, lower + padding)
+
+
+    return img.crop((left, upper, right, lower))
+
+
+def remove_borders_reference(image_data, padding=3, threshold=25):
+    """Original pure PIL implementation, kept to check ``remove_borders`` against."""
+
     try:
         img = Image.open(BytesIO(image_data)).convert('RGB')
     except Exception as e:
@@ -38,11 +207,11 @@ def remove_borders(image_data, padding=3, threshold=25):
 
     border_color = get_border_color(img)
     bg = Image.new(img.mode, img.size, border_color)
-    
+
     # Calculate difference with threshold
     diff = ImageChops.difference(img, bg)
     diff = diff.convert('L').point(lambda p: 255 if p > threshold else 0)
-    
+
     bbox = diff.getbbox()
     if not bbox:
         print("No borders detected")
@@ -54,6 +223,6 @@ def remove_borders(image_data, padding=3, threshold=25):
     upper = max(0, upper - padding)
     right = min(img.width, right + padding)
     lower = min(img.height, lower + padding)
-    
-    
-    return img.crop((left, upper, right, lower))
\ No newline at end of file
+
+
+    return img.crop((left, upper, right, lower))
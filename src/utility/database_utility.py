@@ -1,5 +1,6 @@
 
 import asyncio
+import os
 from pathlib import Path
 from typing import Dict
 
@@ -9,12 +10,162 @@ from loguru import logger
 
 from data.user.database import initialize_database
 from src.utility.duration_parse import seconds_to_duration
+from src.utility.song_utils import folder_uid, split_artists, tag_uid, track_uid
+from src.utility.track_index import collation_key
+
+
+def _stable_local_ids(folders: list, songs: list) -> tuple[dict, dict, list]:
+    """{old id: new id} of the given (id, path) folders and songs whose id changes, and the
+    paths of songs whose file is gone. Reads files."""
+    folder_ids = {folder_id: folder_uid(path) for folder_id, path in folders}
+    song_ids, missing = dict(), list()
+    for song_id, path in songs:
+        if song_id in song_ids:
+            continue
+        try:
+            song_ids[song_id] = track_uid(path)
+        except OSError:
+            # file is gone, nothing to hash
+            missing.append(path)
+    return (
+        {old: new for old, new in folder_ids.items() if old != new},
+        {old: new for old, new in song_ids.items() if old != new},
+        missing
+    )
+
+
+def _local_tag_rows(songs) -> tuple[list, list, list, list]:
+    """Rows of the derived local artist and album tables for ``(song_id, artists, album, duration)`` songs.
+
+    Artists are split out of the tag and, like albums, keyed by their case and accent folded
+    name, so "Artist", "artist" and "Ártist" are one entry shown with the first spelling seen.
+
+    Returns:
+        tuple: (artists, albums, song artists, album songs); artists are (id, key, name), albums
+            (id, key, name, artist), links (song id, artist or album id, duration)
+    """
+    artists, albums, song_artists, album_songs = dict(), dict(), list(), list()
+    for song_id, artist_tag, album, duration in songs:
+        duration = int(duration or 0)
+        names = dict()  # {artist id: artist}, "A; a" is one artist of the song
+        for name in split_artists(artist_tag):
+            key = collation_key(name)
+            names.setdefault(tag_uid(key), (key, name))
+        for artist_id, (key, name) in names.items():
+            artists.setdefault(artist_id, (artist_id, key, name))
+            song_artists.append((song_id, artist_id, duration))
+        if album and album != "Unknown":
+            key = collation_key(album)
+            album_id = tag_uid(key)
+            first_artist = next(iter(names.values()), (None, None))[1]
+            albums.setdefault(album_id, (album_id, key, album, first_artist))
+            album_songs.append((song_id, album_id, duration))
+    return list(artists.values()), list(albums.values()), song_artists, album_songs
 
 
 class DatabaseManager(QObject):
     error = Signal(str)
     fetched = Signal(list)
     closed = Signal()
+    # tables added to schema.sql after release, which only runs for new databases
+    MIGRATIONS = (
+        """CREATE TABLE IF NOT EXISTS local_files (
+            folder_id TEXT NOT NULL,
+            path TEXT NOT NULL,
+            song_id TEXT,
+            size INTEGER NOT NULL,
+            mtime REAL NOT NULL,
+            inode INTEGER,
+            scanned_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (folder_id, path),
+            FOREIGN KEY (folder_id) REFERENCES local_directories(id) ON DELETE CASCADE
+        )""",
+        """CREATE TABLE IF NOT EXISTS local_artists (
+            id TEXT PRIMARY KEY,
+            key TEXT NOT NULL,
+            name TEXT NOT NULL,
+            song_count INTEGER NOT NULL DEFAULT 0,
+            total_duration INTEGER NOT NULL DEFAULT 0
+        )""",
+        "CREATE INDEX IF NOT EXISTS idx_local_artists_key ON local_artists(key)",
+        """CREATE TABLE IF NOT EXISTS local_albums (
+            id TEXT PRIMARY KEY,
+            key TEXT NOT NULL,
+            name TEXT NOT NULL,
+            artist TEXT,
+            song_count INTEGER NOT NULL DEFAULT 0,
+            total_duration INTEGER NOT NULL DEFAULT 0
+        )""",
+        "CREATE INDEX IF NOT EXISTS idx_local_albums_key ON local_albums(key)",
+        """CREATE TABLE IF NOT EXISTS local_song_artists (
+            song_id TEXT NOT NULL,
+            artist_id TEXT NOT NULL,
+            duration INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (song_id, artist_id),
+            FOREIGN KEY (song_id) REFERENCES local_songs(id) ON DELETE CASCADE,
+            FOREIGN KEY (artist_id) REFERENCES local_artists(id) ON DELETE CASCADE
+        )""",
+        "CREATE INDEX IF NOT EXISTS idx_local_song_artists_artist_id ON local_song_artists(artist_id)",
+        """CREATE TABLE IF NOT EXISTS local_album_songs (
+            song_id TEXT PRIMARY KEY,
+            album_id TEXT NOT NULL,
+            duration INTEGER NOT NULL DEFAULT 0,
+            FOREIGN KEY (song_id) REFERENCES local_songs(id) ON DELETE CASCADE,
+            FOREIGN KEY (album_id) REFERENCES local_albums(id) ON DELETE CASCADE
+        )""",
+        "CREATE INDEX IF NOT EXISTS idx_local_album_songs_album_id ON local_album_songs(album_id)",
+        # counts and durations follow the links, an artist or album without songs is dropped
+        """CREATE TRIGGER IF NOT EXISTS local_song_artists_insert AFTER INSERT ON local_song_artists BEGIN
+            UPDATE local_artists SET song_count = song_count + 1, total_duration = total_duration + NEW.duration
+            WHERE id = NEW.artist_id;
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS local_song_artists_delete AFTER DELETE ON local_song_artists BEGIN
+            UPDATE local_artists SET song_count = song_count - 1, total_duration = total_duration - OLD.duration
+            WHERE id = OLD.artist_id;
+            DELETE FROM local_artists WHERE id = OLD.artist_id AND song_count <= 0;
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS local_album_songs_insert AFTER INSERT ON local_album_songs BEGIN
+            UPDATE local_albums SET song_count = song_count + 1, total_duration = total_duration + NEW.duration
+            WHERE id = NEW.album_id;
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS local_album_songs_delete AFTER DELETE ON local_album_songs BEGIN
+            UPDATE local_albums SET song_count = song_count - 1, total_duration = total_duration - OLD.duration
+            WHERE id = OLD.album_id;
+            DELETE FROM local_albums WHERE id = OLD.album_id AND song_count <= 0;
+        END""",
+        """CREATE TABLE IF NOT EXISTS local_duplicates (
+            song_id TEXT PRIMARY KEY,
+            group_id TEXT NOT NULL,
+            file_path TEXT
+        )""",
+        "CREATE INDEX IF NOT EXISTS idx_local_duplicates_group_id ON local_duplicates(group_id)",
+        """CREATE TABLE IF NOT EXISTS download_files (
+            path TEXT PRIMARY KEY,
+            size INTEGER NOT NULL,
+            mtime REAL NOT NULL,
+            song_id TEXT,
+            title TEXT,
+            artists TEXT,
+            duration REAL
+        )""",
+        """CREATE TABLE IF NOT EXISTS queue_state (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            shuffle_seed INTEGER
+        )""",
+        """CREATE TABLE IF NOT EXISTS queue_journal (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            op TEXT NOT NULL,
+            position INTEGER NOT NULL,
+            destination INTEGER,
+            song_id TEXT,
+            file_path TEXT,
+            shuffle_origin INTEGER,
+            track TEXT
+        )""",
+    )
+    # PRAGMA user_version steps, run once in order for databases older than the step
+    SCHEMA_VERSION = 5
+
     def __init__(self, db_path, sql_path, parent=None):
         super().__init__(parent=parent)
         self.db_path = db_path
@@ -22,6 +173,7 @@ class DatabaseManager(QObject):
             self.schema_sql = f.read()
             logger.info("Schema sql loaded succesfully:")
         self.db = None  # Initialize to None, will connect asynchronously
+        self._connect_lock = asyncio.Lock()
         logger.debug(f"Database initialized at {self.db_path}")
         
 
@@ -30,7 +182,6 @@ class DatabaseManager(QObject):
         try:
             logger.debug("Creating tables...")
             await initialize_database(self.db_path, self.schema_sql)  # Make sure the correct db_path is passed
-            self.db = await aiosqlite.connect(self.db_path)  # Re-establish connection after initialization
             # await self.db.execute("PRAGMA foreign_keys = ON;")
             logger.success("Tables created successfully.")
         except Exception as e:
@@ -38,19 +189,182 @@ class DatabaseManager(QObject):
 
     async def _connect_db(self):
         """Connect to the database asynchronously."""
+        async with self._connect_lock:
+            if self.db is None:
+                await self._open()
+
+    async def _open(self):
         try:
             if not Path(self.db_path).exists():
                 logger.info(f"Database not found at {self.db_path}. Creating a new database.")
                 await self.create_tables()
 
             logger.success(f"Connecting to database at {self.db_path}")
-            self.db = await aiosqlite.connect(self.db_path, check_same_thread=False)  # Await the connection
-            await self.db.execute("PRAGMA foreign_keys = ON;")
+            db = await aiosqlite.connect(self.db_path, check_same_thread=False)  # Await the connection
+            await db.execute("PRAGMA foreign_keys = ON;")
+            for statement in self.MIGRATIONS:
+                await db.execute(statement)
+            await db.commit()
+            await self._upgrade(db)
+            # only published once migrated, other callers wait on the lock meanwhile
+            self.db = db
         except aiosqlite.Error as e:
             logger.critical(f"Error connecting database: {e}")
             self.error.emit(str(e))
             self.db = None
 
+    async def _upgrade(self, db: aiosqlite.Connection):
+        async with db.execute("PRAGMA user_version") as cursor:
+            version = (await cursor.fetchone())[0]
+        if version < 1:
+            await self._migrate_local_ids(db)
+        if version < 2:
+            await self._rekey_directory_songs(db)
+        if version < 3:
+            await self._build_local_tags(db)
+        if version < 4:
+            await self._add_queue_shuffle(db)
+        if version < 5:
+            await self._add_queue_tracks(db)
+        if version < self.SCHEMA_VERSION:
+            await db.execute(f"PRAGMA user_version = {self.SCHEMA_VERSION}")
+            await db.commit()
+
+    async def _rekey_directory_songs(self, db: aiosqlite.Connection):
+        """
+        key local_directory_songs by file path, with content based song ids two copies of a
+        file in one folder share their song id
+        """
+        try:
+            # left over if a previous attempt was interrupted, DDL runs outside the transaction
+            await db.execute("DROP TABLE IF EXISTS local_directory_songs_by_path")
+            await db.execute("""CREATE TABLE local_directory_songs_by_path (
+                folder_id TEXT,
+                song_id TEXT,
+                file_path TEXT NOT NULL,
+                added_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                PRIMARY KEY (folder_id, file_path),
+                FOREIGN KEY (folder_id) REFERENCES local_directories(id) ON DELETE CASCADE,
+                FOREIGN KEY (song_id) REFERENCES local_songs(id) ON DELETE CASCADE
+            )""")
+            await db.execute(
+                """INSERT OR IGNORE INTO local_directory_songs_by_path (folder_id, song_id, file_path, added_at)
+                SELECT folder_id, song_id, file_path, added_at FROM local_directory_songs"""
+            )
+            await db.execute("DROP TABLE local_directory_songs")
+            await db.execute("ALTER TABLE local_directory_songs_by_path RENAME TO local_directory_songs")
+            await db.execute("CREATE INDEX IF NOT EXISTS idx_local_directory_songs_song_id ON local_directory_songs(song_id)")
+            await db.commit()
+        except aiosqlite.Error:
+            await db.rollback()
+            raise
+
+    async def _build_local_tags(self, db: aiosqlite.Connection):
+        """fill the local artist and album tables from the songs already in a folder"""
+        async with db.execute(
+            """SELECT id, artists, album, duration FROM local_songs
+            WHERE id IN (SELECT song_id FROM local_directory_songs)"""
+        ) as cursor:
+            songs = await cursor.fetchall()
+        try:
+            await self._link_local_tags(db, songs)
+            await db.commit()
+            logger.info(f"Indexed artists and albums of {len(songs)} local songs")
+        except aiosqlite.Error:
+            await db.rollback()
+            raise
+
+    async def _add_queue_shuffle(self, db: aiosqlite.Connection):
+        """store the position every queued song had before the queue was shuffled"""
+        async with db.execute("PRAGMA table_info(queue)") as cursor:
+            if "shuffle_origin" not in [row[1] for row in await cursor.fetchall()]:
+                await db.execute("ALTER TABLE queue ADD COLUMN shuffle_origin INTEGER")
+                await db.commit()
+
+    async def _add_queue_tracks(self, db: aiosqlite.Connection):
+        """store queued tracks with the queue, it is loaded without a lookup per song"""
+        async with db.execute("PRAGMA table_info(queue)") as cursor:
+            if "track" not in [row[1] for row in await cursor.fetchall()]:
+                await db.execute("ALTER TABLE queue ADD COLUMN track TEXT")
+                await db.commit()
+
+    async def _link_local_tags(self, db: aiosqlite.Connection, songs):
+        """
+        replace the artist and album links of ``(song_id, artists, album, duration)`` songs in
+        the current transaction, counts and durations follow through the triggers
+        """
+        ids = [(song[0],) for song in songs]
+        await db.executemany("DELETE FROM local_song_artists WHERE song_id = ?", ids)
+        await db.executemany("DELETE FROM local_album_songs WHERE song_id = ?", ids)
+        artists, albums, song_artists, album_songs = _local_tag_rows(songs)
+        await db.executemany("INSERT OR IGNORE INTO local_artists (id, key, name) VALUES (?, ?, ?)", artists)
+        await db.executemany("INSERT OR IGNORE INTO local_albums (id, key, name, artist) VALUES (?, ?, ?, ?)", albums)
+        await db.executemany(
+            "INSERT OR IGNORE INTO local_song_artists (song_id, artist_id, duration) VALUES (?, ?, ?)", song_artists
+        )
+        await db.executemany(
+            "INSERT OR IGNORE INTO local_album_songs (song_id, album_id, duration) VALUES (?, ?, ?)", album_songs
+        )
+
+    async def _unlink_local_tags(self, song_ids: set):
+        """drop the artist and album links of songs no folder lists any more, in the current transaction"""
+        rows = [(song_id, song_id) for song_id in song_ids]
+        orphan = "song_id = ? AND NOT EXISTS (SELECT 1 FROM local_directory_songs WHERE song_id = ?)"
+        await self.db.executemany(f"DELETE FROM local_song_artists WHERE {orphan}", rows)
+        await self.db.executemany(f"DELETE FROM local_album_songs WHERE {orphan}", rows)
+
+    async def _linked_song_ids(self, folder_id: str, paths: list[str]) -> set:
+        """song ids the given files of a folder are linked to"""
+        song_ids = set()
+        for start in range(0, len(paths), 500):
+            chunk = paths[start:start + 500]
+            async with self.db.execute(
+                f"SELECT song_id FROM local_directory_songs WHERE folder_id = ? AND file_path IN ({', '.join('?' * len(chunk))})",
+                (folder_id, *chunk)
+            ) as cursor:
+                song_ids.update(row[0] for row in await cursor.fetchall())
+        return song_ids
+
+    async def _migrate_local_ids(self, db: aiosqlite.Connection):
+        """
+        re-key local folders by their normalised path and local songs by their partial content
+        hash, the old ids depended on ctime and changed whenever a file was copied or restored
+
+        Songs whose file is gone keep their old id but leave their folder, the scanner never
+        recorded them and could not drop them later. History and queue entries follow the
+        new ids, covers are stored under the song id and are fetched again on the next scan.
+        """
+        async with db.execute("PRAGMA table_info(local_files)") as cursor:
+            if "inode" not in [row[1] for row in await cursor.fetchall()]:
+                await db.execute("ALTER TABLE local_files ADD COLUMN inode INTEGER")
+        async with db.execute("SELECT id, path FROM local_directories") as cursor:
+            folders = await cursor.fetchall()
+        async with db.execute("SELECT DISTINCT song_id, file_path FROM local_directory_songs") as cursor:
+            songs = await cursor.fetchall()
+        folder_ids, song_ids, missing = await asyncio.to_thread(_stable_local_ids, folders, songs)
+        logger.info(f"Migrating ids of {len(folder_ids)} local folders and {len(song_ids)} local songs")
+        try:
+            # children are re-pointed before or after their parent, check references at commit
+            await db.execute("PRAGMA defer_foreign_keys = ON")
+            for old, new in folder_ids.items():
+                await db.execute("UPDATE local_directory_songs SET folder_id = ? WHERE folder_id = ?", (new, old))
+                await db.execute("UPDATE local_files SET folder_id = ? WHERE folder_id = ?", (new, old))
+                await db.execute("UPDATE local_directories SET id = ? WHERE id = ?", (new, old))
+            for old, new in song_ids.items():
+                # copies of one file now share an id, the first one keeps the row
+                await db.execute("UPDATE OR IGNORE local_songs SET id = ? WHERE id = ?", (new, old))
+                await db.execute("UPDATE OR IGNORE local_directory_songs SET song_id = ? WHERE song_id = ?", (new, old))
+                await db.execute("DELETE FROM local_directory_songs WHERE song_id = ?", (old,))
+                await db.execute("DELETE FROM local_songs WHERE id = ?", (old,))
+                await db.execute("UPDATE local_files SET song_id = ? WHERE song_id = ?", (new, old))
+                await db.execute("UPDATE play_history SET song_id = ? WHERE song_id = ?", (new, old))
+                await db.execute("UPDATE OR IGNORE queue SET song_id = ? WHERE song_id = ?", (new, old))
+            await db.executemany("DELETE FROM local_directory_songs WHERE file_path = ?", [(path,) for path in missing])
+            await db.commit()
+        except aiosqlite.Error:
+            await db.rollback()
+            raise
+
     async def fetch_song(self, song_id):
         if self.db is None:
             await self._connect_db()
@@ -332,6 +646,81 @@ class DatabaseManager(QObject):
         except aiosqlite.Error as e:
             logger.error(f"Database Local Directory Error: {e}")
         
+    async def save_local_files(self, folder_id: str, files: list[dict]):
+        """
+        record scanned files of a folder and the tags of the readable ones in one transaction
+
+        Args:
+            files: {"path", "size", "mtime", "inode"} plus "videoId", "title", "album", "artists"
+                and "duration_sec" for files whose tags were read
+        """
+        if self.db is None:
+            await self._connect_db()
+        songs = [file for file in files if file.get("videoId")]
+        try:
+            previous = await self._linked_song_ids(folder_id, [file["path"] for file in files])
+            await self.db.executemany(
+                """INSERT INTO local_songs (id, title, album, artists, duration) VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT(id) DO UPDATE SET title = excluded.title, album = excluded.album,
+                artists = excluded.artists, duration = excluded.duration
+                """,
+                [
+                    (song["videoId"], self._normalize_string(str(song.get("title", "Unknown"))),
+                     song.get("album", "Unknown"), song.get("artists", "Unknown"), int(song.get("duration_sec") or 0))
+                    for song in songs
+                ]
+            )
+            # a re-encoded file gets a new song id, drop the link to the old one
+            await self.db.executemany(
+                "DELETE FROM local_directory_songs WHERE folder_id = ? AND file_path = ?",
+                [(folder_id, file["path"]) for file in files]
+            )
+            await self.db.executemany(
+                "INSERT OR REPLACE INTO local_directory_songs (folder_id, song_id, file_path) VALUES (?, ?, ?)",
+                [(folder_id, song["videoId"], song["path"]) for song in songs]
+            )
+            await self.db.executemany(
+                "INSERT OR REPLACE INTO local_files (folder_id, path, song_id, size, mtime, inode) VALUES (?, ?, ?, ?, ?, ?)",
+                [(folder_id, file["path"], file.get("videoId"), file["size"], file["mtime"], file.get("inode"))
+                 for file in files]
+            )
+            await self._link_local_tags(self.db, [
+                (song["videoId"], song.get("artists"), song.get("album"), song.get("duration_sec")) for song in songs
+            ])
+            await self._unlink_local_tags(previous - {song["videoId"] for song in songs})
+            await self.db.commit()
+        except aiosqlite.Error as e:
+            await self.db.rollback()
+            logger.error(f"Database local files: '{folder_id}' save Error: {e}")
+
+    async def remove_local_files(self, folder_id: str, paths: list[str]):
+        """forget files deleted from a folder since the last scan"""
+        if self.db is None:
+            await self._connect_db()
+        rows = [(folder_id, path) for path in paths]
+        try:
+            previous = await self._linked_song_ids(folder_id, paths)
+            await self.db.executemany("DELETE FROM local_directory_songs WHERE folder_id = ? AND file_path = ?", rows)
+            await self.db.executemany("DELETE FROM local_files WHERE folder_id = ? AND path = ?", rows)
+            await self._unlink_local_tags(previous)
+            await self.db.commit()
+        except aiosqlite.Error as e:
+            await self.db.rollback()
+            logger.error(f"Database local files: '{folder_id}' remove Error: {e}")
+
+    async def move_local_files(self, folder_id: str, moves: list[tuple[str, str]]):
+        """follow files moved or renamed inside a folder, their song ids and tags stay valid"""
+        if self.db is None:
+            await self._connect_db()
+        rows = [(new_path, folder_id, old_path) for old_path, new_path in moves]
+        try:
+            await self.db.executemany("UPDATE local_directory_songs SET file_path = ? WHERE folder_id = ? AND file_path = ?", rows)
+            await self.db.executemany("UPDATE local_files SET path = ? WHERE folder_id = ? AND path = ?", rows)
+            await self.db.commit()
+        except aiosqlite.Error as e:
+            await self.db.rollback()
+            logger.error(f"Database local files: '{folder_id}' move Error: {e}")
+
     async def insert_queue_song(self, song_id, position, path):
         if self.db is None:
             await self._connect_db()
@@ -518,7 +907,195 @@ class DatabaseManager(QObject):
                     return None
         except aiosqlite.Error as e:
             logger.error(f"Database Error: {e}")
+
+    async def get_directory_songs(self, folder_id: str) -> list[dict]:
+        """
+        every known song of a local folder with its stored tags, in one query
+
+        Returns:
+            list[dict]: same keys as ``get_local_song`` plus "path" and "mtime", ordered by path
+        """
+        if self.db is None:
+            await self._connect_db()
+        try:
+            async with self.db.execute(
+                """SELECT lds.file_path, ls.id, ls.title, ls.album, ls.artists, ls.duration, lf.mtime
+                FROM local_directory_songs lds JOIN local_songs ls ON ls.id = lds.song_id
+                LEFT JOIN local_files lf ON lf.folder_id = lds.folder_id AND lf.path = lds.file_path
+                WHERE lds.folder_id = ? ORDER BY lds.file_path""", (folder_id,)
+            ) as cursor:
+                return [
+                    {
+                        "path": path,
+                        "videoId": song_id,
+                        "title": title,
+                        "album": album,
+                        "artists": artists,
+                        "duration_sec": duration,
+                        "duration": seconds_to_duration(duration or 0),
+                        "mtime": mtime
+                    }
+                    for path, song_id, title, album, artists, duration, mtime in await cursor.fetchall()
+                ]
+        except aiosqlite.Error as e:
+            logger.error(f"Database local folder: '{folder_id}' songs Error: {e}")
+            return list()
                         
+    async def get_local_artists(self) -> list[dict]:
+        """
+        artists of the songs in local folders, ordered by name
+
+        Returns:
+            list[dict]: {"id", "name", "song_count", "duration_sec", "duration"}
+        """
+        if self.db is None:
+            await self._connect_db()
+        try:
+            async with self.db.execute(
+                "SELECT id, name, song_count, total_duration FROM local_artists ORDER BY key"
+            ) as cursor:
+                return [
+                    {
+                        "id": artist_id,
+                        "name": name,
+                        "song_count": song_count,
+                        "duration_sec": duration,
+                        "duration": seconds_to_duration(duration)
+                    }
+                    for artist_id, name, song_count, duration in await cursor.fetchall()
+                ]
+        except aiosqlite.Error as e:
+            logger.error(f"Database local artists Error: {e}")
+            return list()
+
+    async def get_local_albums(self) -> list[dict]:
+        """
+        albums of the songs in local folders, ordered by name
+
+        Returns:
+            list[dict]: {"id", "name", "artist", "song_count", "duration_sec", "duration", "cover_id"},
+                cover_id is one of its songs, whose cover stands for the album
+        """
+        if self.db is None:
+            await self._connect_db()
+        try:
+            async with self.db.execute(
+                """SELECT la.id, la.name, la.artist, la.song_count, la.total_duration,
+                (SELECT song_id FROM local_album_songs WHERE album_id = la.id LIMIT 1)
+                FROM local_albums la ORDER BY la.key"""
+            ) as cursor:
+                return [
+                    {
+                        "id": album_id,
+                        "name": name,
+                        "artist": artist,
+                        "song_count": song_count,
+                        "duration_sec": duration,
+                        "duration": seconds_to_duration(duration),
+                        "cover_id": cover_id
+                    }
+                    for album_id, name, artist, song_count, duration, cover_id in await cursor.fetchall()
+                ]
+        except aiosqlite.Error as e:
+            logger.error(f"Database local albums Error: {e}")
+            return list()
+
+    async def get_dedupe_songs(self) -> list[tuple]:
+        """
+        every song of the local folders with the tags duplicates are found by, songs of the
+        folders added first come first
+
+        Returns:
+            list[tuple]: (song_id, title, artists, duration, one of its files)
+        """
+        if self.db is None:
+            await self._connect_db()
+        try:
+            async with self.db.execute(
+                """SELECT ls.id, ls.title, ls.artists, ls.duration, MIN(lds.file_path)
+                FROM local_songs ls JOIN local_directory_songs lds ON lds.song_id = ls.id
+                GROUP BY ls.id ORDER BY MIN(lds.added_at), ls.id"""
+            ) as cursor:
+                return await cursor.fetchall()
+        except aiosqlite.Error as e:
+            logger.error(f"Database dedupe songs Error: {e}")
+            return list()
+
+    async def get_download_files(self) -> dict:
+        """
+        files of the download folders read by the last dedupe pass
+
+        Returns:
+            dict: {path: (size, mtime, song_id, title, artists, duration)}
+        """
+        if self.db is None:
+            await self._connect_db()
+        try:
+            async with self.db.execute(
+                "SELECT path, size, mtime, song_id, title, artists, duration FROM download_files"
+            ) as cursor:
+                return {row[0]: row[1:] for row in await cursor.fetchall()}
+        except aiosqlite.Error as e:
+            logger.error(f"Database download files Error: {e}")
+            return dict()
+
+    async def save_download_files(self, files: list[dict], removed: list[str]):
+        """
+        record read files of the download folders and forget deleted ones in one transaction
+
+        Args:
+            files: {"path", "size", "mtime"} plus "videoId", "title", "artists" and
+                "duration_sec" for files whose tags were read
+            removed: paths of files no longer in the download folders
+        """
+        if self.db is None:
+            await self._connect_db()
+        try:
+            await self.db.executemany("DELETE FROM download_files WHERE path = ?", [(path,) for path in removed])
+            await self.db.executemany(
+                """INSERT OR REPLACE INTO download_files (path, size, mtime, song_id, title, artists, duration)
+                VALUES (?, ?, ?, ?, ?, ?, ?)""",
+                [
+                    (file["path"], file["size"], file["mtime"], file.get("videoId"), file.get("title"),
+                     file.get("artists"), file.get("duration_sec"))
+                    for file in files
+                ]
+            )
+            await self.db.commit()
+        except aiosqlite.Error as e:
+            await self.db.rollback()
+            logger.error(f"Database download files save Error: {e}")
+
+    async def save_duplicates(self, duplicates: list[tuple]):
+        """
+        replace the stored duplicate groups in one transaction
+
+        Args:
+            duplicates: (song_id, group_id, file_path) of every song in a group
+        """
+        if self.db is None:
+            await self._connect_db()
+        try:
+            await self.db.execute("DELETE FROM local_duplicates")
+            await self.db.executemany(
+                "INSERT OR REPLACE INTO local_duplicates (song_id, group_id, file_path) VALUES (?, ?, ?)", duplicates
+            )
+            await self.db.commit()
+        except aiosqlite.Error as e:
+            await self.db.rollback()
+            logger.error(f"Database duplicates save Error: {e}")
+
+    async def get_duplicates(self) -> dict:
+        """{song_id: group_id} of the songs found to be duplicates by the last pass"""
+        if self.db is None:
+            await self._connect_db()
+        try:
+            async with self.db.execute("SELECT song_id, group_id FROM local_duplicates") as cursor:
+                return dict(await cursor.fetchall())
+        except aiosqlite.Error as e:
+            logger.error(f"Database duplicates Error: {e}")
+            return dict()
+
     async def get_playlist_songs(self, playlist_id, callback = None):
         """retrive song_id and position of a playlist
         Example:
@@ -609,6 +1186,32 @@ class DatabaseManager(QObject):
         except aiosqlite.Error as e:
             logger.error(f"Database Error: {e}")
             
+    async def get_local_files(self, folder_id: str, directory: str | None = None) -> dict:
+        """
+        files recorded by the last scan of a folder
+
+        Args:
+            directory: only the files below this directory of the folder
+
+        Returns:
+            dict: {path: (size, mtime, song_id, inode)}
+        """
+        if self.db is None:
+            await self._connect_db()
+        query = "SELECT path, size, mtime, song_id, inode FROM local_files WHERE folder_id = ?"
+        params = (folder_id,)
+        if directory:
+            # prefix match as a range on the primary key
+            prefix = directory.rstrip("\\/") + os.sep
+            query += " AND path >= ? AND path < ?"
+            params = (folder_id, prefix, prefix[:-1] + chr(ord(prefix[-1]) + 1))
+        try:
+            async with self.db.execute(query, params) as cursor:
+                return {row[0]: row[1:] for row in await cursor.fetchall()}
+        except aiosqlite.Error as e:
+            logger.error(f"Database Error: {e}")
+            return dict()
+
     async def get_album_info(self, album_id, callback = None):
         if self.db is None:
             await self._connect_db()
@@ -940,19 +1543,25 @@ class DatabaseManager(QObject):
         
     async def get_queue_songs(self, callback = None):
         """
-        return list of dict with keys id, position and pass results to callback if available
+        return list of dict with keys id, position, path, origin, the position before the
+        queue was shuffled, and track, the queued track as JSON or None if it was queued by an
+        older version, in queue order and pass results to callback if available
         """
         if self.db is None:
             await self._connect_db()
         try:
-            async with self.db.execute("SELECT * FROM queue") as cursor:
+            async with self.db.execute(
+                "SELECT song_id, play_position, file_path, shuffle_origin, track FROM queue ORDER BY play_position"
+            ) as cursor:
                 results = await cursor.fetchall()
                 queues = list()
                 for result in results:
                     data = {
                         "id": result[0],
                         "position": result[1],
-                        "path": result[2]
+                        "path": result[2],
+                        "origin": result[3],
+                        "track": result[4]
                     }
                     queues.append(data)
                 if callback:
@@ -972,6 +1581,90 @@ class DatabaseManager(QObject):
             logger.error(f"Database Error: {e}")
             
         
+    async def get_queue_state(self) -> dict:
+        """
+        state of the queue as a whole
+
+        Returns:
+            dict: {"shuffle_seed": seed of the shuffle, None if the queue is not shuffled}
+        """
+        if self.db is None:
+            await self._connect_db()
+        try:
+            async with self.db.execute("SELECT shuffle_seed FROM queue_state WHERE id = 1") as cursor:
+                row = await cursor.fetchone()
+                return {"shuffle_seed": row[0] if row else None}
+        except aiosqlite.Error as e:
+            logger.error(f"Database Error: {e}")
+            return {"shuffle_seed": None}
+
+    async def get_queue_journal(self) -> list[tuple]:
+        """
+        queue edits made after the queue table was written, in order
+
+        Returns:
+            list[tuple]: (op, position, destination, song_id, file_path, shuffle_origin, track)
+        """
+        if self.db is None:
+            await self._connect_db()
+        try:
+            async with self.db.execute(
+                """SELECT op, position, destination, song_id, file_path, shuffle_origin, track
+                FROM queue_journal ORDER BY seq"""
+            ) as cursor:
+                return await cursor.fetchall()
+        except aiosqlite.Error as e:
+            logger.error(f"Database Error: {e}")
+            return []
+
+    async def append_queue_journal(self, ops: list[tuple]) -> bool:
+        """
+        record ``(op, position, destination, song_id, file_path, shuffle_origin, track)`` queue
+        edits in one transaction, False if none was recorded
+        """
+        if self.db is None:
+            await self._connect_db()
+        try:
+            await self.db.executemany(
+                """INSERT INTO queue_journal (op, position, destination, song_id, file_path, shuffle_origin, track)
+                VALUES (?, ?, ?, ?, ?, ?, ?)""",
+                ops
+            )
+            await self.db.commit()
+            return True
+        except aiosqlite.Error as e:
+            await self.db.rollback()
+            logger.error(f"Database Queue Journal Error: {e}")
+            return False
+
+    async def save_queue_snapshot(self, rows: list[tuple], shuffle_seed: int | None) -> bool:
+        """
+        replace the stored queue with ``(song_id, play_position, file_path, shuffle_origin, track)``
+        rows and drop the journal they include, in one transaction so a crash keeps either
+        the old queue or the new one, False if it was not replaced
+        """
+        if self.db is None:
+            await self._connect_db()
+        try:
+            await self.db.execute("DELETE FROM queue")
+            await self.db.executemany(
+                """INSERT OR REPLACE INTO queue (song_id, play_position, file_path, shuffle_origin, track)
+                VALUES (?, ?, ?, ?, ?)""",
+                rows
+            )
+            await self.db.execute("DELETE FROM queue_journal")
+            await self.db.execute(
+                """INSERT INTO queue_state (id, shuffle_seed) VALUES (1, ?)
+                ON CONFLICT(id) DO UPDATE SET shuffle_seed = excluded.shuffle_seed""",
+                (shuffle_seed,)
+            )
+            await self.db.commit()
+            return True
+        except aiosqlite.Error as e:
+            await self.db.rollback()
+            logger.error(f"Database Queue Snapshot Error: {e}")
+            return False
+
     async def check_liked_album(self, album_id)->bool:
         if self.db is None:
             await self._connect_db()
@@ -1016,6 +1709,35 @@ class DatabaseManager(QObject):
             logger.error(f"Database Error: {e}")
             return False
         
+    async def get_protected_artwork_ids(self) -> set | None:
+        """
+        ids whose cached artwork must never be evicted: liked and saved songs, albums,
+        artists and playlists, and songs in the queue, queued since it was last written too
+
+        Returns:
+            set | None: None if they could not be read, nothing may be evicted then
+        """
+        if self.db is None:
+            await self._connect_db()
+        if self.db is None:
+            return None
+        query = """
+            SELECT song_id FROM liked_songs
+            UNION SELECT song_id FROM playlist_songs
+            UNION SELECT song_id FROM queue
+            UNION SELECT song_id FROM queue_journal WHERE op = 'insert'
+            UNION SELECT album_id FROM liked_albums
+            UNION SELECT artist_id FROM liked_artists
+            UNION SELECT playlist_id FROM liked_playlists
+            UNION SELECT id FROM playlists
+        """
+        try:
+            async with self.db.execute(query) as cursor:
+                return {row[0] for row in await cursor.fetchall() if row[0]}
+        except aiosqlite.Error as e:
+            logger.error(f"Database protected artwork Error: {e}")
+            return None
+
     async def get_recent_songs(self, limit: int = 1, callback = None):
         if self.db is None:
             await self._connect_db()
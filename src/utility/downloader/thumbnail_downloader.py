@@ -1,35 +1,45 @@
-from PySide6.QtCore import QObject, QUrl, Signal, QTimer
-from PySide6.QtNetwork import QNetworkAccessManager, QNetworkRequest, QNetworkReply
+from PySide6.QtCore import QObject, Signal, QTimer
 from typing import List
 from pathlib import Path
-from PySide6.QtWidgets import QApplication
+from PySide6.QtWidgets import QApplication, QAbstractScrollArea, QWidget
 
 import sys
 sys.path.append(r"D:\Program\Musify")
-from src.utility.crop_image_border import remove_borders
+from src.utility.downloader.thumbnail_service import ThumbnailService, ThumbnailPriority
+from src.utility.thumbnail_cache import ThumbnailCacheManager
 from src.utility.validator import is_youtube_thumbnail_url
 
 from loguru import logger
-from PIL import Image
 
 # Configure logger
 # logger.basicConfig(level=logger.INFO, format="%(message)s")
 
 class ThumbnailDownloader(QObject):
+    """Per-view handle on the shared ``ThumbnailService``.
+
+    Views keep their own downloader for the ``download_finished(path, uid)`` signal, while
+    the actual downloads are deduplicated and rate limited by the process-wide service.
+    """
     # Define custom signals
     download_finished = Signal(str, str)  # Emits the file path when download is successful
     download_error = Signal(str, str)  # Emits the file path and error message when download fails # Emits when all requests are completed
 
+    VISIBILITY_DELAY = 150  # ms, debounce for scroll driven priority updates
+
     def __init__(self, parent=None):
         super().__init__(parent)
-        self.init_network()
-
-    def init_network(self):
-        """Initialize the network manager."""
-        self.network_manager = QNetworkAccessManager(self)
-        # self.network_manager.finished.connect(self.on_download_finished)
-
-    def download_thumbnail(self, url: str, output_name: str, output_dir: str, uid: str | None = None):
+        self.service = ThumbnailService.instance()
+        self.service.finished.connect(self._on_service_finished)
+        self.service.failed.connect(self._on_service_failed)
+        self._waiting = dict()  # {output_path: set(uid)}
+
+        self.visibility_timer = QTimer(self)
+        self.visibility_timer.setSingleShot(True)
+        self.visibility_timer.setInterval(self.VISIBILITY_DELAY)
+        self.visibility_timer.timeout.connect(self.prioritize_visible)
+
+    def download_thumbnail(self, url: str, output_name: str, output_dir: str, uid: str | None = None,
+                           priority: ThumbnailPriority = ThumbnailPriority.NORMAL):
         """
         Download a thumbnail from the specified URL.
 
@@ -37,6 +47,8 @@ class ThumbnailDownloader(QObject):
             url (str): URL of the thumbnail to download.
             output_name (str): Name of the output file.
             output_dir (str): Directory to save the downloaded thumbnail.
+            uid (str, optional): id of the card waiting for the thumbnail, emitted back with the path.
+            priority (ThumbnailPriority): queue priority, cards on screen use VISIBLE.
         """
         if url is None:
             logger.error("URL is None")
@@ -44,66 +56,40 @@ class ThumbnailDownloader(QObject):
         path = Path(output_dir) / output_name
         if path.exists():
             # logger.info(f"Thumbnail already exists: {path}")
+            ThumbnailCacheManager.instance().touch(str(path))
             self.download_finished.emit(str(path), uid)  # Emit signal for existing file
             return
-        
-        Path(output_dir).mkdir(parents=True, exist_ok=True)
-        
-        # Create a QNetworkRequest with the URL
-        request = QNetworkRequest(QUrl(url))
-
-        # Send the request and get the reply
-        reply = self.network_manager.get(request)
-
-        # Store the output path in the reply object for later use
-        reply.output_path = str(Path(output_dir) / output_name)
-        reply.uid = uid
-        reply.crop = is_youtube_thumbnail_url(url)
-        # if reply.crop:
-            # logger.info(f"Need to Crop the image: {url}")
-        # Connect the finished signal to a slot
-        reply.finished.connect(lambda: self.handle_thumbnail_download_finished(reply))
-        
-
-    def handle_thumbnail_download_finished(self, reply: QNetworkReply):
-        """
-        Handle the finished signal for a thumbnail download.
 
-        Args:
-            reply (QNetworkReply): The reply object containing the downloaded data.
-        """
-        # self._increment_request_count()
-        try:
-            if reply.error() == QNetworkReply.NoError:
-                # Read the downloaded data
-                thumbnail_data = reply.readAll()
-
-                if reply.crop:
-                    cropped_image = remove_borders(thumbnail_data.data())
-                    if cropped_image and isinstance(cropped_image, Image.Image):
-                    # Save the processed image
-                        cropped_image.save(reply.output_path)
-                        logger.info(f"Coverd thumbnail saved to {reply.output_path}")
-                        self.download_finished.emit(reply.output_path, reply.uid)
-                    else:
-                        logger.error(f"Failed to process thumbnail: {reply.output_path}")
-                        self.download_error.emit(reply.output_path, "Border removal failed")
-                else:
-                # Save the thumbnail to the specified output path
-                    with open(reply.output_path, "wb") as file:
-                        file.write(thumbnail_data.data())
-
-                    # Emit the download_finished signal with the file path
-                    self.download_finished.emit(reply.output_path, reply.uid)
-                    logger.info(f"Thumbnail saved to {reply.output_path}")
-            else:
-                # Emit the download_error signal with the file path and error message
-                self.download_error.emit(reply.output_path, reply.errorString())
-                logger.error(f"Failed to download thumbnail: {reply.errorString()}")
-        finally:
-            # Clean up the reply object
-            reply.deleteLater()
-    # Reset the request count
+        output_path = str(path)
+        self._waiting.setdefault(output_path, set()).add(uid)
+        self.service.request(url, output_path, is_youtube_thumbnail_url(url), priority)
+        if self.parent() is not None:
+            self.visibility_timer.start()
+
+    def watch_scroll_area(self, scroll_area: QAbstractScrollArea):
+        """Re-prioritise pending thumbnails whenever the given scroll area moves."""
+        scroll_area.verticalScrollBar().valueChanged.connect(self.visibility_timer.start)
+        scroll_area.horizontalScrollBar().valueChanged.connect(self.visibility_timer.start)
+
+    def prioritize_visible(self):
+        """Move queued downloads of cards currently on screen to the front of the shared queue."""
+        parent = self.parent()
+        if parent is None:
+            return
+        for output_path, uids in self._waiting.items():
+            for uid in uids:
+                card = parent.findChild(QWidget, f"{uid}_card")
+                if card is not None and card.isVisible() and not card.visibleRegion().isEmpty():
+                    self.service.promote(output_path, ThumbnailPriority.VISIBLE)
+                    break
+
+    def _on_service_finished(self, output_path: str):
+        for uid in self._waiting.pop(output_path, ()):
+            self.download_finished.emit(output_path, uid)
+
+    def _on_service_failed(self, output_path: str, error: str):
+        if self._waiting.pop(output_path, None) is not None:
+            self.download_error.emit(output_path, error)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,195 @@
+import heapq
+import itertools
+import os
+from io import BytesIO
+from concurrent.futures import ThreadPoolExecutor
+from enum import Enum
+from pathlib import Path
+
+from PySide6.QtCore import QObject, QUrl, Signal
+from PySide6.QtNetwork import QNetworkAccessManager, QNetworkRequest, QNetworkReply
+from PIL import Image
+from loguru import logger
+
+from src.utility.crop_image_border import remove_borders
+from src.utility.artwork_store import ArtworkStore
+from src.utility.thumbnail_cache import generate_variants, ThumbnailCacheManager
+
+
+class ThumbnailPriority(Enum):
+    VISIBLE = 0
+    NORMAL = 1
+    LOW = 2
+
+
+def encode_thumbnail(data: bytes, crop: bool) -> tuple[bytes, Image.Image | None]:
+    """Bytes to store for a downloaded thumbnail, cropped and encoded as PNG if ``crop``.
+
+    Returns:
+        tuple: (bytes, the decoded image if it was cropped, None otherwise)
+
+    Raises:
+        ValueError: if the borders could not be removed
+    """
+    if not crop:
+        return data, None
+    image = remove_borders(data)
+    if not (image and isinstance(image, Image.Image)):
+        raise ValueError("Border removal failed")
+    buffer = BytesIO()
+    image.save(buffer, "PNG")
+    return buffer.getvalue(), image
+
+
+def process_thumbnail(output_path: str, data: bytes, crop: bool) -> str:
+    """Decode, optionally crop and encode a downloaded thumbnail, then store it in the
+    artwork store (linked at ``output_path``) together with its size bucketed variants.
+
+    Runs on a worker thread. Returns an empty string on success, the error message otherwise.
+    """
+    try:
+        data, image = encode_thumbnail(data, crop)
+        blob, created = ArtworkStore.instance().put(output_path, data)
+    except Exception as e:
+        return str(e) or e.__class__.__name__
+    if created:
+        # identical artwork already has its variants
+        _generate_variants(blob, image)
+    return ""
+
+
+def _generate_variants(output_path: str, image: Image.Image | None = None):
+    try:
+        generate_variants(output_path, image)
+    except Exception as e:
+        # the original is in place, cards fall back to it
+        logger.warning(f"Failed to generate thumbnail variants for {output_path}: {e}")
+
+
+class ThumbnailService(QObject):
+    """Process-wide thumbnail download queue.
+
+    Every ``ThumbnailDownloader`` forwards its requests here, so the application owns a
+    single ``QNetworkAccessManager``. Requests for the same output path are coalesced into
+    one download, at most ``MAX_CONCURRENT`` downloads run at once and queued jobs are
+    started in priority order. Cropping and encoding run on a small thread pool and
+    ``finished`` is only emitted once the file is in place.
+    """
+    finished = Signal(str)       # output path
+    failed = Signal(str, str)    # output path, error
+    _processed = Signal(str, bool, str)  # output path, cropped, error; emitted from worker threads
+    _variants_written = Signal(str)      # original path; emitted from worker threads
+
+    MAX_CONCURRENT = 6
+    MAX_WORKERS = max(2, min(4, (os.cpu_count() or 2) // 2))
+
+    _instance = None
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.network_manager = QNetworkAccessManager(self)
+        self._jobs = dict()        # {output_path: {"url", "crop", "priority"}} queued jobs
+        self._heap = list()        # [(priority, order, output_path)] may hold stale entries
+        self._order = itertools.count()
+        self._in_flight = dict()   # {output_path: QNetworkReply}
+        self._processing = set()   # output paths handed to the worker pool
+        self._variant_jobs = set()  # originals already sent for variant generation this session
+        self.executor = ThreadPoolExecutor(max_workers=self.MAX_WORKERS, thread_name_prefix="thumbnail")
+        self._processed.connect(self._on_processed)
+        self._variants_written.connect(ThumbnailCacheManager.instance().record)
+
+    @classmethod
+    def instance(cls) -> "ThumbnailService":
+        if cls._instance is None:
+            cls._instance = ThumbnailService()
+        return cls._instance
+
+    def request(self, url: str, output_path: str, crop: bool = False,
+                priority: ThumbnailPriority = ThumbnailPriority.NORMAL):
+        """Queue a download, joining any queued or running download of the same file."""
+        if output_path in self._in_flight or output_path in self._processing:
+            return
+        job = self._jobs.get(output_path)
+        if job is None:
+            self._jobs[output_path] = {"url": url, "crop": crop, "priority": priority}
+            heapq.heappush(self._heap, (priority.value, next(self._order), output_path))
+        elif priority.value < job["priority"].value:
+            self.promote(output_path, priority)
+        self._start_next()
+
+    def promote(self, output_path: str, priority: ThumbnailPriority = ThumbnailPriority.VISIBLE):
+        """Move a queued job ahead, e.g. because its card scrolled into view."""
+        job = self._jobs.get(output_path)
+        if job is None or job["priority"].value <= priority.value:
+            return
+        job["priority"] = priority
+        heapq.heappush(self._heap, (priority.value, next(self._order), output_path))
+
+    def is_pending(self, output_path: str) -> bool:
+        return output_path in self._jobs or output_path in self._in_flight or output_path in self._processing
+
+    def pending_count(self) -> int:
+        return len(self._jobs) + len(self._in_flight) + len(self._processing)
+
+    def _pop_job(self):
+        while self._heap:
+            priority, _, output_path = heapq.heappop(self._heap)
+            job = self._jobs.get(output_path)
+            # skip entries left behind by promote()
+            if job is not None and job["priority"].value == priority:
+                del self._jobs[output_path]
+                return output_path, job
+        return None, None
+
+    def _start_next(self):
+        while len(self._in_flight) < self.MAX_CONCURRENT:
+            output_path, job = self._pop_job()
+            if output_path is None:
+                return
+            Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+            reply = self.network_manager.get(QNetworkRequest(QUrl(job["url"])))
+            reply.output_path = output_path
+            reply.crop = job["crop"]
+            self._in_flight[output_path] = reply
+            reply.finished.connect(lambda reply=reply: self._on_reply_finished(reply))
+
+    def _on_reply_finished(self, reply: QNetworkReply):
+        output_path = reply.output_path
+        try:
+            if reply.error() == QNetworkReply.NoError:
+                self._save_thumbnail(output_path, reply.readAll().data(), reply.crop)
+            else:
+                logger.error(f"Failed to download thumbnail: {reply.errorString()}")
+                self.failed.emit(output_path, reply.errorString())
+        finally:
+            self._in_flight.pop(output_path, None)
+            reply.deleteLater()
+            self._start_next()
+
+    def _save_thumbnail(self, output_path: str, data: bytes, crop: bool):
+        self._processing.add(output_path)
+        future = self.executor.submit(process_thumbnail, output_path, data, crop)
+        future.add_done_callback(
+            lambda future: self._processed.emit(output_path, crop, future.result())
+        )
+
+    def _on_processed(self, output_path: str, cropped: bool, error: str):
+        self._processing.discard(output_path)
+        if error:
+            logger.error(f"Failed to process thumbnail {output_path}: {error}")
+            self.failed.emit(output_path, error)
+            return
+        logger.info(f"{'Cropped t' if cropped else 'T'}humbnail saved to {output_path}")
+        ThumbnailCacheManager.instance().record(output_path)
+        self.finished.emit(output_path)
+
+    def ensure_variants(self, original_path: str):
+        """Generate size variants for a thumbnail stored before variants existed."""
+        if original_path in self._variant_jobs or original_path in self._processing:
+            return
+        self._variant_jobs.add(original_path)
+        future = self.executor.submit(_generate_variants, original_path)
+        future.add_done_callback(lambda future: self._variants_written.emit(original_path))
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,173 @@
+import asyncio
+import os
+import re
+import time
+
+from PySide6.QtCore import QObject, QTimer, Signal
+from loguru import logger
+from qasync import asyncSlot
+
+from src.utility.database_utility import DatabaseManager
+from src.utility.local_scanner import MetadataPool, diff_files, walk_audio_files
+from src.utility.song_utils import split_artists
+from src.utility.track_index import tokenize
+
+DURATION_TOLERANCE = 1  # seconds two encodings of one song may differ by
+
+_BRACKETS = re.compile(r"[(\[][^)\]]*[)\]]")
+
+
+def tag_keys(title, artists) -> list[tuple]:
+    """Normalised ``(title, artist)`` pairs a song is looked up by, none for untagged songs.
+
+    Bracketed parts like "(Official Video)" are dropped and a title of the form
+    "Artist - Title", how downloads are named, also yields the pair it stands for.
+    """
+    title = str(title or "")
+    if title in ("", "Unknown"):
+        return []
+    names = split_artists(artists)
+    artist = " ".join(tokenize(names[0])) if names else ""
+    plain = _BRACKETS.sub(" ", title)
+    keys = list()
+    words = " ".join(tokenize(plain))
+    if words:
+        keys.append((words, artist))
+    head, separator, tail = plain.partition(" - ")
+    head, tail = " ".join(tokenize(head)), " ".join(tokenize(tail))
+    if separator and head and tail:
+        keys.append((tail, head))
+    return keys
+
+
+def find_duplicates(songs: list[tuple]) -> dict:
+    """Group likely duplicates among ``(song_id, title, artists, duration, path)`` songs.
+
+    Songs are put in hash buckets instead of being compared pairwise, so the cost grows
+    linearly with the library. The song id already is the partial content hash, copies of
+    a file share it and are one song; re-encoded or re-tagged copies meet in the bucket of
+    their normalised tags and duration in whole seconds, probing the neighbouring seconds
+    so durations within ``DURATION_TOLERANCE`` match.
+
+    Returns:
+        dict: {song_id: group id} for the songs of every group of two or more, the group id
+            is the song id of the group's earliest song in ``songs``
+    """
+    parents = dict()  # {song_id: parent song_id}, a disjoint set forest
+    rank = dict()     # {song_id: position in songs}, the earliest song roots its group
+
+    def find(song_id):
+        while parents[song_id] != song_id:
+            parents[song_id] = parents[parents[song_id]]
+            song_id = parents[song_id]
+        return song_id
+
+    def union(first, second):
+        first, second = find(first), find(second)
+        if first != second:
+            if rank[second] < rank[first]:
+                first, second = second, first
+            parents[second] = first
+
+    buckets = dict()  # {(title, artist, second): first song in it}
+    for song_id, title, artists, duration, _ in songs:
+        if song_id in parents:
+            continue
+        parents[song_id] = song_id
+        rank[song_id] = len(rank)
+        second = round(float(duration or 0))
+        if second <= 0:
+            # without a duration tags alone are too weak
+            continue
+        for title_key, artist in tag_keys(title, artists):
+            for probe in range(second - DURATION_TOLERANCE, second + DURATION_TOLERANCE + 1):
+                other = buckets.get((title_key, artist, probe))
+                if other is not None:
+                    union(song_id, other)
+            buckets.setdefault((title_key, artist, second), song_id)
+
+    groups = dict()  # {root: [song ids]}
+    for song_id in parents:
+        groups.setdefault(find(song_id), list()).append(song_id)
+    return {
+        song_id: group_id
+        for group_id, members in groups.items() if len(members) > 1
+        for song_id in members
+    }
+
+
+class DuplicateFinder(QObject):
+    """Background pass grouping likely duplicate songs of the local folders and downloads.
+
+    Songs of the library come from the database, files in the download folders are hashed
+    and tagged by ``MetadataPool``. Groups are stored in ``local_duplicates`` and announced
+    through ``finished`` as {song_id: group id} for views that collapse them. Tags of the
+    downloads are kept in ``download_files``, a pass only reads files that are new or whose
+    size or mtime changed. A pass is scheduled ``DELAY`` ms after the last library change
+    and never overlaps another one.
+    """
+    finished = Signal(dict)  # {song_id: group id}
+
+    DELAY = 30 * 1000  # ms
+
+    def __init__(self, database_manager: DatabaseManager, download_folders: list | None = None, parent=None):
+        super().__init__(parent)
+        self.database_manager = database_manager
+        self.download_folders = list(download_folders or [])
+        self.groups = dict()
+        self._lock = asyncio.Lock()
+
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(self.DELAY)
+        self.timer.timeout.connect(self.run)
+
+    def schedule(self, *_):
+        """Run a pass once the library stopped changing, extra arguments of signals are ignored."""
+        self.timer.start()
+
+    @asyncSlot()
+    async def run(self):
+        if self._lock.locked():
+            self.schedule()
+            return
+        async with self._lock:
+            start = time.perf_counter()
+            songs = await self.database_manager.get_dedupe_songs()
+            downloads = await self._download_songs()
+            groups = await asyncio.to_thread(find_duplicates, songs + downloads)
+            paths = {song[0]: song[4] for song in reversed(songs + downloads)}
+            await self.database_manager.save_duplicates(
+                [(song_id, group_id, paths.get(song_id)) for song_id, group_id in groups.items()]
+            )
+            self.groups = groups
+            logger.info(
+                f"Found {len(groups)} duplicates in {len(set(groups.values()))} groups among "
+                f"{len(songs)} local songs and {len(downloads)} downloads in {time.perf_counter() - start:.2f}s"
+            )
+            self.finished.emit(groups)
+
+    async def _download_songs(self) -> list[tuple]:
+        found = list()
+        for folder in self.download_folders:
+            if os.path.isdir(folder):
+                found.extend(await asyncio.to_thread(lambda: list(walk_audio_files(folder))))
+        stored = await self.database_manager.get_download_files()
+        added, changed, removed = diff_files(stored, found)
+        tags = {path: record[2:] for path, record in stored.items()}  # {path: (song_id, title, artists, duration)}
+        read = list()
+        async for chunk in MetadataPool.instance().read(added + changed):
+            read.extend(chunk)
+            tags.update(
+                (file["path"], (file.get("videoId"), file.get("title"), file.get("artists"), file.get("duration_sec")))
+                for file in chunk
+            )
+        if read or removed:
+            await self.database_manager.save_download_files(read, removed)
+            logger.info(f"Download folders: {len(read)} files read, {len(removed)} removed")
+        songs = list()
+        for path, _, _ in found:
+            song_id, title, artists, duration = tags[path]
+            if song_id:
+                songs.append((song_id, title, artists, duration, path))
+        return songs
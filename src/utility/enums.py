@@ -76,6 +76,7 @@ class ImageFolder(Enum):
     PLAYLIST = "playlist"
     SONG = "song"
     PLACEHOLDER = "placeholder"
+    BLUR = "blur"
 
     @property
     def path(self):
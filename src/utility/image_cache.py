@@ -0,0 +1,271 @@
+import os
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+
+import shiboken6
+from PySide6.QtCore import QObject, QSize, Qt, Signal
+from PySide6.QtGui import QImage, QImageReader
+from loguru import logger
+
+from src.utility.thumbnail_cache import SIZE_BUCKETS, bucket_for, cover_for_size
+
+
+def read_image(path: str, bucket: int) -> QImage:
+    """Decode ``path`` at most ``bucket`` px on its longest side, without decoding it at full size."""
+    reader = QImageReader(path)
+    reader.setAutoTransform(True)
+    size = reader.size()
+    if size.isValid() and max(size.width(), size.height()) > bucket:
+        reader.setScaledSize(size.scaled(QSize(bucket, bucket), Qt.AspectRatioMode.KeepAspectRatio))
+    image = reader.read()
+    if image.isNull():
+        logger.warning(f"Failed to decode image {path}: {reader.errorString()}")
+    return image
+
+
+def _bucket(size: float) -> int:
+    """Cache key size: the size bucket, or the exact size above the largest bucket."""
+    return bucket_for(size) if size <= SIZE_BUCKETS[-1] else int(size)
+
+
+class ImageCache(QObject):
+    """Application wide cache of decoded covers, keyed by path and size bucket.
+
+    Holds ``QImage`` rather than ``QPixmap`` since that is what ``ImageLabel`` keeps after
+    ``setImage``, so a hit costs no conversion. Least recently used images are dropped once
+    ``budget`` bytes are exceeded. Only used from the GUI thread, images are decoded by
+    ``ImageLoader``.
+    """
+    DEFAULT_BUDGET = 96 * 1024 * 1024
+
+    _instance = None
+
+    def __init__(self, budget: int = DEFAULT_BUDGET, parent=None):
+        super().__init__(parent)
+        self.budget = budget
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._images = OrderedDict()  # {(path, bucket): QImage}
+
+    @classmethod
+    def instance(cls) -> "ImageCache":
+        if cls._instance is None:
+            cls._instance = ImageCache()
+        return cls._instance
+
+    def set_budget(self, budget: int):
+        self.budget = budget
+        self._trim()
+
+    def get(self, path: str, size: float) -> QImage | None:
+        """Decoded image of ``path`` for a widget of ``size`` device pixels, None if not cached."""
+        key = (path, _bucket(size))
+        image = self._images.get(key)
+        if image is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._images.move_to_end(key)
+        return image
+
+    def insert(self, key: tuple, image: QImage):
+        if image.sizeInBytes() > self.budget:
+            return
+        old = self._images.pop(key, None)
+        if old is not None:
+            self.bytes -= old.sizeInBytes()
+        self._images[key] = image
+        self.bytes += image.sizeInBytes()
+        self._trim()
+
+    def contains(self, path: str, size: float) -> bool:
+        return (path, _bucket(size)) in self._images
+
+    def clear(self):
+        self._images.clear()
+        self.bytes = 0
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._images),
+            "bytes": self.bytes,
+            "budget": self.budget,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+    def _trim(self):
+        while self.bytes > self.budget and self._images:
+            _, image = self._images.popitem(last=False)
+            self.bytes -= image.sizeInBytes()
+
+
+
+
+def device_size(widget) -> float:
+    """Longest side of ``widget`` in device pixels."""
+    size = widget.size()
+    return max(size.width(), size.height()) * widget.devicePixelRatioF()
+
+
+class ImageLoader(QObject):
+    """Decodes covers on a thread pool and hands the ``QImage`` back on the GUI thread.
+
+    Every cover shown by a widget goes through ``load``: cached images are delivered
+    straight away, anything else is read with a scaled ``QImageReader`` on a worker and
+    stored in ``ImageCache`` once decoded. Requests for the same image are coalesced.
+    A receiver has at most one pending request, asking for another image or being
+    destroyed drops it, and decodes nobody waits for any more are cancelled if they have
+    not started yet. Prewarm requests only run while the pool is otherwise idle.
+    """
+    _decoded = Signal(object, QImage)  # (path, bucket), image; emitted from worker threads
+
+    MAX_WORKERS = max(2, min(4, (os.cpu_count() or 2) // 2))
+
+    _instance = None
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.cache = ImageCache.instance()
+        self.executor = ThreadPoolExecutor(max_workers=self.MAX_WORKERS, thread_name_prefix="image-loader")
+        self._futures = dict()   # {(path, bucket): Future} decodes submitted to the pool
+        self._waiters = dict()   # {(path, bucket): {receiver id: (receiver, callback)}}
+        self._requests = dict()  # {receiver id: (path, bucket)} pending request of every receiver
+        self._watched = set()    # ids of receivers whose destroyed signal is connected
+        self._prewarm_queue = deque()
+        self._decoded.connect(self._on_decoded)
+
+    @classmethod
+    def instance(cls) -> "ImageLoader":
+        if cls._instance is None:
+            cls._instance = ImageLoader()
+        return cls._instance
+
+    def load(self, cover_path: str, receiver: QObject, callback, size: float | None = None) -> bool:
+        """Deliver the cover at ``cover_path`` to ``callback(QImage)``.
+
+        Args:
+            cover_path (str): stored cover, the best matching size variant is decoded.
+            receiver (QObject): widget the cover is for, the request dies with it.
+            callback (callable): called on the GUI thread with the decoded image.
+            size (float, optional): device pixels to decode for, defaults to the size of ``receiver``.
+
+        Returns:
+            bool: True if the image was cached and ``callback`` already ran.
+        """
+        if size is None:
+            size = device_size(receiver)
+        path = cover_for_size(cover_path, size)
+        key = (path, _bucket(size))
+        receiver_id = id(receiver)
+        if self._requests.get(receiver_id) == key:
+            # already on its way
+            self._waiters[key][receiver_id] = (receiver, callback)
+            return False
+        self._drop(receiver_id)
+        if not path:
+            return False
+        image = self.cache.get(path, size)
+        if image is not None:
+            callback(image)
+            return True
+
+        if receiver_id not in self._watched:
+            self._watched.add(receiver_id)
+            receiver.destroyed.connect(lambda *_, receiver_id=receiver_id: self._forget(receiver_id))
+        self._waiters.setdefault(key, dict())[receiver_id] = (receiver, callback)
+        self._requests[receiver_id] = key
+        if key not in self._futures:
+            self._submit(key)
+        return False
+
+    def cancel(self, receiver: QObject):
+        """Drop the pending request of ``receiver``, if any."""
+        self._drop(id(receiver))
+
+    def prewarm(self, entries):
+        """Decode ``(cover path, device size)`` entries in the background, e.g. the covers of
+        the next cards to be shown, without holding up covers that are on screen."""
+        self._prewarm_queue.extend(entries)
+        self._pump()
+
+    def pending_count(self) -> int:
+        return len(self._futures)
+
+    def shutdown(self):
+        self._prewarm_queue.clear()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    def _submit(self, key: tuple):
+        future = self.executor.submit(read_image, *key)
+        self._futures[key] = future
+        future.add_done_callback(lambda future, key=key: self._on_done(key, future))
+
+    def _on_done(self, key: tuple, future):
+        # worker thread
+        if future.cancelled():
+            return
+        if future.exception() is not None:
+            logger.warning(f"Failed to decode image {key[0]}: {future.exception()}")
+            self._decoded.emit(key, QImage())
+            return
+        self._decoded.emit(key, future.result())
+
+    def _on_decoded(self, key: tuple, image: QImage):
+        self._futures.pop(key, None)
+        waiters = self._waiters.pop(key, dict())
+        if not image.isNull():
+            self.cache.insert(key, image)
+        for receiver_id, (receiver, callback) in waiters.items():
+            self._requests.pop(receiver_id, None)
+            if not image.isNull() and shiboken6.isValid(receiver):
+                callback(image)
+        self._pump()
+
+    def _pump(self):
+        """Start queued prewarm decodes while fewer than ``MAX_WORKERS`` decodes are running."""
+        while self._prewarm_queue and len(self._futures) < self.MAX_WORKERS:
+            path, size = self._prewarm_queue.popleft()
+            path = cover_for_size(path, size)
+            key = (path, _bucket(size))
+            if path and key not in self._futures and not self.cache.contains(path, size):
+                self._submit(key)
+
+    def _drop(self, receiver_id: int):
+        key = self._requests.pop(receiver_id, None)
+        if key is None:
+            return
+        waiters = self._waiters.get(key)
+        if waiters is None:
+            return
+        waiters.pop(receiver_id, None)
+        if not waiters:
+            del self._waiters[key]
+            future = self._futures.get(key)
+            if future is not None and future.cancel():
+                del self._futures[key]
+
+    def _forget(self, receiver_id: int):
+        self._watched.discard(receiver_id)
+        self._drop(receiver_id)
+
+
+def show_image(label, image: QImage):
+    """Put a decoded cover on an ``ImageLabel`` without letting it resize the label."""
+    size = label.size()
+    label.setImage(image)
+    label.setFixedSize(size)
+
+
+def load_cover(cover_path: str, label, callback=None) -> bool:
+    """Load the cover at ``cover_path`` into ``label``, or pass it to ``callback`` instead.
+
+    The single entry point for covers: decoding happens off the GUI thread at the size of
+    ``label`` and a label destroyed before its cover is ready never receives it.
+    """
+    if callback is None:
+        callback = lambda image, label=label: show_image(label, image)
+    return ImageLoader.instance().load(cover_path, label, callback)
@@ -0,0 +1,129 @@
+import asyncio
+import os
+
+from PySide6.QtCore import QObject, QFileSystemWatcher, QTimer, Signal
+from loguru import logger
+from qasync import asyncSlot
+
+from src.utility.database_utility import DatabaseManager
+from src.utility.local_scanner import LocalScanner
+
+
+def walk_directories(root: str) -> list:
+    """``root`` and every directory below it, skipping hidden and symlinked ones like the scanner."""
+    directories = list()
+    stack = [root]
+    while stack:
+        directory = stack.pop()
+        directories.append(directory)
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if not entry.name.startswith(".") and entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+        except OSError as e:
+            logger.warning(f"Cannot read directory {directory}: {e}")
+    return directories
+
+
+def outermost(directories: set) -> list:
+    """Drop directories that lie inside another one of the set, their subtree is scanned anyway."""
+    result = list()
+    for directory in sorted(directories):
+        if not result or not directory.startswith(result[-1] + os.sep):
+            result.append(directory)
+    return result
+
+
+class LibraryWatcher(QObject):
+    """Keeps local library folders in sync with the disk.
+
+    Every directory of every registered folder is watched with ``QFileSystemWatcher``
+    (directories only, a handle per file would not scale). Change notifications are
+    collected per folder and, once no new event arrived for ``DEBOUNCE`` ms, only the
+    directories that changed are rescanned by ``LocalScanner``. Results are stored in the
+    database and announced through ``songsChanged`` and ``songsRemoved`` for open views.
+    """
+    songsChanged = Signal(str, list)  # folder id, metadata of added or changed songs
+    songsRemoved = Signal(str, list)  # folder id, paths of deleted files
+
+    DEBOUNCE = 1500  # ms
+
+    def __init__(self, database_manager: DatabaseManager, parent=None):
+        super().__init__(parent)
+        self.scanner = LocalScanner(database_manager)
+        self.folders = dict()  # {folder_id: root path}
+        self._dirty = dict()   # {folder_id: set of changed directories}
+
+        self.watcher = QFileSystemWatcher(self)
+        self.watcher.directoryChanged.connect(self.on_directory_changed)
+
+        self.debounce_timer = QTimer(self)
+        self.debounce_timer.setSingleShot(True)
+        self.debounce_timer.setInterval(self.DEBOUNCE)
+        self.debounce_timer.timeout.connect(self.flush)
+
+    @asyncSlot()
+    async def watch(self, folder_id: str, root: str):
+        if folder_id in self.folders:
+            return
+        self.folders[folder_id] = root
+        directories = await asyncio.to_thread(walk_directories, root)
+        self._add_paths(directories)
+        logger.info(f"Watching {len(directories)} directories of {root}")
+
+    def unwatch(self, folder_id: str):
+        root = self.folders.pop(folder_id, None)
+        if root is None:
+            return
+        self._dirty.pop(folder_id, None)
+        watched = [path for path in self.watcher.directories() if path == root or path.startswith(root + os.sep)]
+        if watched:
+            self.watcher.removePaths(watched)
+
+    def _add_paths(self, directories: list):
+        watched = set(self.watcher.directories())
+        directories = [directory for directory in directories if directory not in watched]
+        if not directories:
+            return
+        failed = self.watcher.addPaths(directories)
+        if failed:
+            # e.g. the inotify watch limit, those directories are only picked up by a manual refresh
+            logger.warning(f"Could not watch {len(failed)} directories, first: {failed[0]}")
+
+    def folder_of(self, path: str) -> str | None:
+        for folder_id, root in self.folders.items():
+            if path == root or path.startswith(root + os.sep):
+                return folder_id
+        return None
+
+    def on_directory_changed(self, path: str):
+        folder_id = self.folder_of(path)
+        if folder_id is None:
+            return
+        self._dirty.setdefault(folder_id, set()).add(path)
+        # restart, a burst of events (copying an album) becomes one rescan
+        self.debounce_timer.start()
+
+    @asyncSlot()
+    async def flush(self):
+        dirty, self._dirty = self._dirty, dict()
+        for folder_id, directories in dirty.items():
+            root = self.folders.get(folder_id)
+            if root is None:
+                continue
+            for directory in outermost(directories):
+                await self._rescan(folder_id, root, directory)
+
+    async def _rescan(self, folder_id: str, root: str, directory: str):
+        if os.path.isdir(directory):
+            # new sub directories have to be watched too, already watched ones are ignored
+            self._add_paths(await asyncio.to_thread(walk_directories, directory))
+        # a deleted directory drops out of the watcher by itself, the rescan forgets its files
+        summary = await self.scanner.scan(
+            folder_id, root,
+            on_songs=lambda songs: self.songsChanged.emit(folder_id, songs),
+            on_removed=lambda paths: self.songsRemoved.emit(folder_id, paths),
+            subtree=directory
+        )
+        logger.debug(f"Watcher rescan of {summary}")
@@ -0,0 +1,309 @@
+import asyncio
+import os
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from loguru import logger
+
+from src.utility.database_utility import DatabaseManager
+from src.utility.song_utils import SUPPORTED_FORMATS, get_metadata, track_uid
+
+
+def walk_audio_files(root: str):
+    """Yield ``(path, size, mtime)`` for every supported audio file below ``root``.
+
+    Walks iteratively with ``os.scandir``, whose entries carry the stat results on Windows
+    and the file type everywhere, so a library of 100k files costs no extra syscalls per
+    directory entry. Hidden folders and symlinked folders (possible cycles) are skipped.
+    """
+    stack = [root]
+    while stack:
+        directory = stack.pop()
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if not entry.name.startswith("."):
+                                stack.append(entry.path)
+                        elif os.path.splitext(entry.name)[1].lower() in SUPPORTED_FORMATS and entry.is_file():
+                            stat = entry.stat()
+                            yield entry.path, stat.st_size, stat.st_mtime
+                    except OSError as e:
+                        logger.warning(f"Skipping {entry.path}: {e}")
+        except OSError as e:
+            logger.warning(f"Cannot read directory {directory}: {e}")
+
+
+def diff_files(stored: dict, found: list) -> tuple[list, list, list]:
+    """Compare a fresh walk against the files recorded by the last scan.
+
+    Args:
+        stored (dict): {path: (size, mtime, song_id, inode)} from the database.
+        found (list): ``(path, size, mtime)`` from ``walk_audio_files``.
+
+    Returns:
+        tuple: (added, changed, removed); added and changed are ``(path, size, mtime)``,
+            removed are paths.
+    """
+    added, changed = list(), list()
+    seen = set()
+    for file in found:
+        path, size, mtime = file
+        seen.add(path)
+        record = stored.get(path)
+        if record is None:
+            added.append(file)
+        elif record[0] != size or record[1] != mtime:
+            changed.append(file)
+    removed = [path for path in stored if path not in seen]
+    return added, changed, removed
+
+
+def find_moves(added: list, removed: list, stored: dict) -> list[tuple[str, str]]:
+    """Pair new files with deleted ones that are the same file moved or renamed.
+
+    A file keeps its inode, size and mtime when it is moved within a filesystem, so a match
+    on all three carries its stored song id and tags over without reading or hashing it.
+
+    Returns:
+        list: (old path, new path) of every move found.
+    """
+    candidates = {
+        (stored[path][3], stored[path][0], stored[path][1]): path
+        for path in removed if stored[path][3] and stored[path][2]
+    }
+    moves = list()
+    for path, size, mtime in added:
+        if not candidates:
+            break
+        try:
+            inode = os.stat(path).st_ino
+        except OSError:
+            continue
+        old_path = candidates.pop((inode, size, mtime), None)
+        if old_path is not None:
+            moves.append((old_path, path))
+    return moves
+
+
+def read_file(path: str, size: int, mtime: float) -> dict:
+    """Tags of one scanned file, only ``path``, ``size``, ``mtime`` and ``inode`` if they cannot be read."""
+    file = {"path": path, "size": size, "mtime": mtime, "inode": None}
+    try:
+        file["inode"] = os.stat(path).st_ino
+    except OSError:
+        return file
+    metadata = get_metadata(path)
+    if not metadata:
+        return file
+    try:
+        song_id = track_uid(path, size)
+    except OSError as e:
+        logger.warning(f"Cannot hash {path}: {e}")
+        return file
+    file.update(metadata)
+    file["videoId"] = song_id
+    return file
+
+
+def read_files(files: list) -> list:
+    """Tags of a chunk of files. Runs in the metadata worker processes."""
+    return [read_file(*file) for file in files]
+
+
+class MetadataPool:
+    """Worker processes reading tags of local files.
+
+    Tag parsing is pure Python (mutagen), threads would serialize on the GIL and stall the
+    event loop, so it runs in a process pool shared by every scan. Files are submitted in
+    chunks to amortize pickling, with only a few chunks per worker in flight so results
+    stream back while a large folder is still being read.
+    """
+    CHUNK_SIZE = 32
+    MAX_WORKERS = max(1, min(6, (os.cpu_count() or 2) - 1))
+    IN_FLIGHT = 2  # chunks per worker
+
+    _instance = None
+
+    def __init__(self, max_workers: int = MAX_WORKERS):
+        self.max_workers = max_workers
+        self.executor = None
+
+    @classmethod
+    def instance(cls) -> "MetadataPool":
+        if cls._instance is None:
+            cls._instance = MetadataPool()
+        return cls._instance
+
+    def _executor(self) -> ProcessPoolExecutor:
+        if self.executor is None:
+            self.executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        return self.executor
+
+    async def read(self, files: list, chunk_size: int = CHUNK_SIZE):
+        """Yield the results of ``read_files`` chunk by chunk, in completion order.
+
+        A file crashing its worker breaks the whole pool and fails every chunk in flight.
+        Those chunks are read again one at a time on a fresh pool, a chunk that still
+        crashes it on its own is halved until the file doing it is found; only that file
+        is reported without tags.
+
+        Args:
+            files (list): ``(path, size, mtime)`` of the files to read.
+        """
+        loop = asyncio.get_running_loop()
+        chunks = iter([files[index:index + chunk_size] for index in range(0, len(files), chunk_size)])
+        suspects = list()  # chunks in flight when a worker died
+        pending = dict()  # {future: (chunk, executor, isolated)}
+        while True:
+            if suspects:
+                if not pending:
+                    chunk, executor = suspects.pop(), self._executor()
+                    pending[loop.run_in_executor(executor, read_files, chunk)] = (chunk, executor, True)
+            else:
+                while len(pending) < self.max_workers * self.IN_FLIGHT:
+                    chunk = next(chunks, None)
+                    if chunk is None:
+                        break
+                    executor = self._executor()
+                    pending[loop.run_in_executor(executor, read_files, chunk)] = (chunk, executor, False)
+            if not pending:
+                return
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for future in done:
+                chunk, executor, isolated = pending.pop(future)
+                try:
+                    result = future.result()
+                except BrokenProcessPool as e:
+                    self._discard(executor)
+                    if not isolated:
+                        suspects.append(chunk)
+                        continue
+                    if len(chunk) > 1:
+                        middle = len(chunk) // 2
+                        suspects.extend([chunk[middle:], chunk[:middle]])
+                        continue
+                    path, size, mtime = chunk[0]
+                    logger.error(f"Metadata worker crashed reading {path}: {e}")
+                    result = [{"path": path, "size": size, "mtime": mtime, "inode": None}]
+                yield result
+
+    def _discard(self, executor: ProcessPoolExecutor):
+        """Drop a broken pool, the next chunk starts a fresh one."""
+        if self.executor is executor:
+            self.executor = None
+            logger.warning("Metadata worker crashed, restarting the pool")
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def shutdown(self):
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
+
+
+class ScanSummary:
+    """What a scan found, logged once the scan is done."""
+
+    def __init__(self, folder_id: str, path: str):
+        self.folder_id = folder_id
+        self.path = path
+        self.added = 0
+        self.changed = 0
+        self.removed = 0
+        self.moved = 0
+        self.failed = 0
+        self.unchanged = dict()  # {path: song_id} files whose stored tags are still valid
+        self.elapsed = 0.0
+
+    def __str__(self):
+        return (
+            f"{self.path}: {self.added} added, {self.changed} changed, {self.removed} removed, {self.moved} moved, "
+            f"{len(self.unchanged)} unchanged, {self.failed} unreadable in {self.elapsed:.2f}s"
+        )
+
+
+class LocalScanner:
+    """Incremental scanner for a local library folder.
+
+    The folder is walked recursively and compared against the ``local_files`` table: only
+    new files and files whose size or mtime changed have their tags read, files that
+    disappeared are dropped and files that were moved keep their song id. Tags are read by ``MetadataPool``,
+    every ``batch_size`` files read are stored in a single transaction and handed to ``on_songs``.
+    Scans of the same folder never overlap.
+    """
+    _locks = defaultdict(asyncio.Lock)  # {folder_id: Lock}
+
+    def __init__(self, database_manager: DatabaseManager, pool: MetadataPool | None = None,
+                 batch_size: int = MetadataPool.CHUNK_SIZE):
+        self.database_manager = database_manager
+        self.pool = pool or MetadataPool.instance()
+        # the app shows songs as soon as a chunk is read, a bulk index commits less often
+        self.batch_size = batch_size
+
+    async def scan(self, folder_id: str, directory_path: str, on_songs=None, on_removed=None,
+                   subtree: str | None = None) -> ScanSummary:
+        """Rescan ``directory_path``, or only the ``subtree`` directory inside it.
+
+        Args:
+            on_songs (callable, optional): called with the metadata of every chunk of added
+                or changed songs as soon as it is stored.
+            on_removed (callable, optional): called with the paths of deleted files.
+        """
+        async with self._locks[folder_id]:
+            return await self._scan(folder_id, subtree or directory_path, on_songs, on_removed, subtree is not None)
+
+    async def _scan(self, folder_id: str, directory_path: str, on_songs, on_removed, subtree: bool) -> ScanSummary:
+        start = time.perf_counter()
+        summary = ScanSummary(folder_id, directory_path)
+        stored = await self.database_manager.get_local_files(folder_id, directory_path if subtree else None)
+        found = await asyncio.to_thread(lambda: list(walk_audio_files(directory_path)))
+        added, changed, removed = diff_files(stored, found)
+        moves = await asyncio.to_thread(find_moves, added, removed, stored) if added and removed else []
+        moved_from, moved_to = {old for old, _ in moves}, {new for _, new in moves}
+        added = [file for file in added if file[0] not in moved_to]
+        removed = [path for path in removed if path not in moved_from]
+        summary.added, summary.changed, summary.removed = len(added), len(changed), len(removed)
+        summary.moved = len(moves)
+        skipped = {path for path, _, _ in changed}.union(removed, moved_from)
+        summary.unchanged = {path: record[2] for path, record in stored.items() if path not in skipped}
+
+        if moves:
+            await self.database_manager.move_local_files(folder_id, moves)
+            if on_removed:
+                on_removed([old for old, _ in moves])
+            songs = list()
+            for old_path, new_path in moves:
+                summary.unchanged[new_path] = stored[old_path][2]
+                metadata = await self.database_manager.get_local_song(stored[old_path][2])
+                if metadata:
+                    songs.append({**metadata, "path": new_path, "mtime": stored[old_path][1]})
+            if on_songs and songs:
+                on_songs(songs)
+
+        if removed:
+            await self.database_manager.remove_local_files(folder_id, removed)
+            if on_removed:
+                on_removed(removed)
+
+        batch = list()
+        async for chunk in self.pool.read(added + changed):
+            batch.extend(chunk)
+            if len(batch) >= self.batch_size:
+                await self._store(folder_id, batch, summary, on_songs)
+                batch = list()
+        if batch:
+            await self._store(folder_id, batch, summary, on_songs)
+
+        summary.elapsed = time.perf_counter() - start
+        logger.info(f"Scanned {summary}")
+        return summary
+
+    async def _store(self, folder_id: str, files: list, summary: ScanSummary, on_songs):
+        songs = [file for file in files if file.get("videoId")]
+        summary.failed += len(files) - len(songs)
+        await self.database_manager.save_local_files(folder_id, files)
+        if on_songs and songs:
+            on_songs(songs)
@@ -0,0 +1,281 @@
+import random
+
+
+class PlayQueue:
+    """Tracks of the play queue and the position of the one playing.
+
+    Tracks are kept in a list with a dict from song to row and a cursor on the current row,
+    so next, previous and the row of a song are O(1). A track is in the queue once: its
+    song id, or the group of ``groups`` it belongs to, is its key. Inserting, removing and
+    moving a track shifts the list with a single memmove; the rows of the songs behind it
+    are not rewritten then but on the next lookup that needs one of them, so a burst of
+    edits costs one pass over the tracks they moved at most.
+
+    Shuffling permutes the rows with a seeded generator and remembers the row every track
+    had before, its origin, so ``unshuffle`` puts the tracks back in O(n) and the origins
+    can be stored with the queue. Tracks queued while shuffled get an origin after every
+    other one and show up at the end once unshuffled.
+
+    ``listener`` is called after every edit with what changed: ``("insert", row, track,
+    origin)``, ``("remove", row)``, ``("move", source, destination)`` or ``("reset",)`` when
+    the queue was replaced or reordered as a whole, so a store can follow the queue without
+    writing all of it.
+    """
+
+    def __init__(self):
+        self.tracks = list()
+        self.current = -1    # row of the playing track, -1 before one is picked
+        self.groups = dict()  # {song_id: group id} of duplicates, set with ``set_groups``
+        self._keys = list()  # key of every row
+        self._rows = dict()  # {key: row}, rows from ``_stale`` on may be out of date
+        self._stale = 0
+        self.seed = None      # seed of the current shuffle
+        self.origins = None   # unshuffled row of every row while shuffled, None otherwise
+        self._next_origin = 0
+        self.listener = None  # called with (op, *args) after every edit
+
+    def __len__(self):
+        return len(self.tracks)
+
+    def __getitem__(self, row: int) -> dict:
+        return self.tracks[row]
+
+    def __contains__(self, song_id: str):
+        return self.key(song_id) in self._rows
+
+    def key(self, song_id: str) -> str:
+        return self.groups.get(song_id, song_id)
+
+    def row_of(self, song_id: str) -> int:
+        """Row of a song or of the queued song of its duplicate group, -1 if not queued."""
+        key = self.key(song_id)
+        row = self._rows.get(key)
+        if row is None:
+            return -1
+        if row >= self._stale:
+            self._reindex()
+            row = self._rows[key]
+        return row
+
+    @property
+    def shuffled(self) -> bool:
+        return self.origins is not None
+
+    def current_track(self) -> dict | None:
+        return self.tracks[self.current] if 0 <= self.current < len(self.tracks) else None
+
+    def reset(self, tracks: list[dict], current: int = 0) -> int:
+        """Replace the queue with ``tracks``, tracks without a song id and later copies of a
+        queued song are dropped. A negative ``current`` leaves the cursor before the first track.
+
+        Returns:
+            int: row of ``tracks[current]``, the cursor is put on it
+        """
+        self._clear()
+        picked = tracks[current] if 0 <= current < len(tracks) else None
+        for track in tracks:
+            song_id = track.get("videoId")
+            if song_id is None:
+                continue
+            key = self.key(song_id)
+            if key in self._rows:
+                continue
+            self._rows[key] = len(self.tracks)
+            self._keys.append(key)
+            self.tracks.append(track)
+        self._stale = len(self.tracks)
+        self.current = self.row_of(picked["videoId"]) if picked and picked.get("videoId") else -1
+        if self.current < 0 and self.tracks and current >= 0:
+            self.current = 0
+        self._notify("reset")
+        return self.current
+
+    def set_groups(self, groups: dict) -> int:
+        """Use new duplicate groups, queued tracks are keyed by them from now on. Of tracks that
+        end up in one group the first stays queued, the cursor moves to it if it was on another.
+
+        Returns:
+            int: tracks dropped
+        """
+        self.groups = groups
+        rows, keys, kept = dict(), list(), list()
+        for row, track in enumerate(self.tracks):
+            key = self.key(track["videoId"])
+            if key in rows:
+                continue
+            rows[key] = len(kept)
+            keys.append(key)
+            kept.append(row)
+        dropped = len(self.tracks) - len(kept)
+        if self.current >= 0:
+            self.current = rows[self.key(self.tracks[self.current]["videoId"])]
+        if dropped:
+            self.tracks = [self.tracks[row] for row in kept]
+            if self.origins is not None:
+                self.origins = [self.origins[row] for row in kept]
+        self._rows, self._keys, self._stale = rows, keys, len(keys)
+        if dropped:
+            self._notify("reset")
+        return dropped
+
+    def clear(self):
+        self._clear()
+        self._notify("reset")
+
+    def _clear(self):
+        self.tracks = list()
+        self._keys.clear()
+        self._rows.clear()
+        self._stale = 0
+        self.current = -1
+        self.seed = self.origins = None
+        self._next_origin = 0
+
+    def insert(self, track: dict, row: int = -1) -> int:
+        """Queue ``track`` at ``row``, at the end for -1.
+
+        Returns:
+            int: row it was queued at, -1 if it has no song id or is queued already
+        """
+        song_id = track.get("videoId")
+        if song_id is None or song_id in self:
+            return -1
+        if row < 0 or row > len(self.tracks):
+            row = len(self.tracks)
+        key = self.key(song_id)
+        self.tracks.insert(row, track)
+        self._keys.insert(row, key)
+        self._rows[key] = row
+        origin = None
+        if self.origins is not None:
+            origin = self._next_origin
+            self.origins.insert(row, origin)
+            self._next_origin += 1
+        if self._stale == row == len(self.tracks) - 1:
+            self._stale += 1  # appended behind rows that are up to date
+        else:
+            self._stale = min(self._stale, row)
+        if row <= self.current:
+            self.current += 1
+        self._notify("insert", row, track, origin)
+        return row
+
+    def remove(self, row: int) -> dict:
+        """Drop the track at ``row``. Removing the playing track puts the cursor on the track
+        before it, next is the track that followed the removed one."""
+        track = self.tracks.pop(row)
+        del self._rows[self._keys.pop(row)]
+        if self.origins is not None:
+            # leaves a gap in the origins, unshuffle skips it
+            self.origins.pop(row)
+        self._stale = min(self._stale, row)
+        if row <= self.current:
+            self.current -= 1
+        self._notify("remove", row)
+        return track
+
+    def move(self, source: int, destination: int) -> int:
+        """Move the track at ``source`` to ``destination``, the cursor stays on its track.
+
+        Returns:
+            int: row the track ended up at
+        """
+        destination = max(0, min(destination, len(self.tracks) - 1))
+        if source == destination:
+            return destination
+        self.tracks.insert(destination, self.tracks.pop(source))
+        self._keys.insert(destination, self._keys.pop(source))
+        if self.origins is not None:
+            self.origins.insert(destination, self.origins.pop(source))
+        self._stale = min(self._stale, source, destination)
+        if self.current == source:
+            self.current = destination
+        elif source < self.current <= destination:
+            self.current -= 1
+        elif destination <= self.current < source:
+            self.current += 1
+        self._notify("move", source, destination)
+        return destination
+
+    def select(self, row: int) -> dict | None:
+        if 0 <= row < len(self.tracks):
+            self.current = row
+            return self.tracks[row]
+        return None
+
+    def peek_next(self) -> dict | None:
+        row = self.current + 1
+        return self.tracks[row] if row < len(self.tracks) else None
+
+    def next(self) -> dict | None:
+        """Advance the cursor, the first track if none is playing, None at the end of the queue."""
+        return self.select(self.current + 1)
+
+    def previous(self) -> dict | None:
+        """Step the cursor back, None at the start of the queue."""
+        return self.select(self.current - 1) if self.current > 0 else None
+
+    def shuffle(self, seed: int | None = None) -> bool:
+        """Shuffle the queue with ``seed``, a new one if not given; the same tracks and seed give
+        the same order. The playing track moves to the top so every other track follows it.
+        Shuffling a shuffled queue reshuffles it, ``unshuffle`` still restores the order before
+        the first shuffle. False if there is nothing to shuffle.
+        """
+        count = len(self.tracks)
+        if count <= 1:
+            return False
+        self.seed = random.randrange(2 ** 32) if seed is None else seed
+        order = list(range(count))
+        random.Random(self.seed).shuffle(order)
+        if 0 <= self.current < count:
+            order.remove(self.current)
+            order.insert(0, self.current)
+        origins = self.origins if self.origins is not None else range(count)
+        self._permute(order)
+        self.origins = [origins[row] for row in order]
+        self._next_origin = max(self._next_origin, count)
+        self._notify("reset")
+        return True
+
+    def unshuffle(self) -> bool:
+        """Put the tracks back in the order they had before shuffling, the cursor stays on its
+        track. False if the queue is not shuffled."""
+        if self.origins is None:
+            return False
+        # origins are unique but have gaps where tracks were removed, one slot per origin
+        slots = [None] * (max(self.origins, default=-1) + 1)
+        for row, origin in enumerate(self.origins):
+            slots[origin] = row
+        self._permute([row for row in slots if row is not None])
+        self.seed = self.origins = None
+        self._next_origin = 0
+        self._notify("reset")
+        return True
+
+    def restore_shuffle(self, origins: list[int], seed: int | None) -> bool:
+        """Mark the queue as shuffled with stored ``origins``, ignored unless they fit the tracks."""
+        if len(origins) != len(self.tracks) or len(set(origins)) != len(origins) or min(origins, default=0) < 0:
+            return False
+        self.origins = list(origins)
+        self.seed = seed
+        self._next_origin = max(origins, default=-1) + 1
+        self._notify("reset")
+        return True
+
+    def _notify(self, op: str, *args):
+        if self.listener is not None:
+            self.listener(op, *args)
+
+    def _permute(self, order: list[int]):
+        """Rows in ``order``, the row at position i becomes ``order[i]``; the cursor stays on its track."""
+        self.tracks = [self.tracks[row] for row in order]
+        self._keys = [self._keys[row] for row in order]
+        self._stale = 0
+        if self.current >= 0:
+            self.current = order.index(self.current)
+
+    def _reindex(self):
+        rows, keys = self._rows, self._keys
+        for row in range(self._stale, len(keys)):
+            rows[keys[row]] = row
+        self._stale = len(keys)
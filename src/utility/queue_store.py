@@ -0,0 +1,156 @@
+import asyncio
+import json
+
+from PySide6.QtCore import QObject, QTimer
+from loguru import logger
+from qasync import asyncSlot
+
+from src.utility.database_utility import DatabaseManager
+from src.utility.misc import is_online_song
+from src.utility.play_queue import PlayQueue
+
+
+class QueueStore(QObject):
+    """Keeps the stored play queue in step with a ``PlayQueue`` as it is edited.
+
+    The ``queue`` table holds the queue as it was at some point and ``queue_journal`` the
+    inserts, removals and moves made since, every edit is one small row instead of a
+    rewrite of the queue. Edits are collected for ``DELAY`` ms and written in one
+    transaction, so a crash loses the last moment of edits at most and closing the app
+    only writes what is still pending. The journal is folded into the table, one
+    transaction replacing both, once it holds ``COMPACT_AFTER`` rows or when the queue was
+    replaced or reordered as a whole. Tracks are stored as JSON with the queue, loading it
+    needs no lookup per song.
+    """
+    DELAY = 500  # ms
+    COMPACT_AFTER = 1000  # journal rows
+
+    def __init__(self, database_manager: DatabaseManager, play_queue: PlayQueue, parent=None):
+        super().__init__(parent)
+        self.database_manager = database_manager
+        self.play_queue = play_queue
+        self._pending = list()  # journal rows not written yet
+        self._snapshot = False  # the whole queue has to be written
+        self._journaled = 0     # rows in queue_journal
+        self._lock = asyncio.Lock()
+
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(self.DELAY)
+        self.timer.timeout.connect(self.flush)
+
+    def attach(self, snapshot: bool = False):
+        """Follow the edits of the queue from now on, ``snapshot`` when the stored queue does
+        not match it any more and has to be written as a whole."""
+        self.play_queue.listener = self.record
+        if snapshot:
+            self.record("reset")
+
+    def record(self, op: str, *args):
+        """Listener of ``PlayQueue``, the edit is written with the next batch."""
+        if op == "reset":
+            # written from the queue as it is then, which includes every edit pending
+            self._snapshot = True
+            self._pending.clear()
+        elif not self._snapshot:
+            self._pending.append(self._journal_row(op, *args))
+        self.timer.start()
+
+    @asyncSlot()
+    async def flush(self):
+        """Write the edits made since the last batch, one transaction."""
+        async with self._lock:
+            self.timer.stop()
+            if self._snapshot or self._journaled + len(self._pending) >= self.COMPACT_AFTER:
+                # taken before anything is awaited, later edits go to the next batch
+                tracks, origins, seed = list(self.play_queue.tracks), self.play_queue.origins, self.play_queue.seed
+                origins = list(origins) if origins is not None else None
+                self._snapshot, self._pending = False, list()
+                rows = await asyncio.to_thread(self._snapshot_rows, tracks, origins)
+                if await self.database_manager.save_queue_snapshot(rows, seed):
+                    self._journaled = 0
+                    logger.info(f"Queue of {len(rows)} songs saved")
+                else:
+                    self._snapshot = True
+            elif self._pending:
+                ops, self._pending = self._pending, list()
+                if await self.database_manager.append_queue_journal(ops):
+                    self._journaled += len(ops)
+                    logger.debug(f"Queue journal: {len(ops)} edits saved")
+                else:
+                    # the stored queue may have missed edits, rewrite it
+                    self._snapshot = True
+            if self._snapshot:
+                self.timer.start()
+
+    async def load(self) -> tuple[list[dict], list[int] | None, int | None]:
+        """
+        the stored queue with the journal applied
+
+        Returns:
+            tuple: tracks, their origins if the queue is shuffled else None, and the shuffle seed
+        """
+        songs = await self.database_manager.get_queue_songs() or []
+        journal = await self.database_manager.get_queue_journal()
+        state = await self.database_manager.get_queue_state()
+        entries = list()  # [(track, origin)]
+        for song in songs:
+            track = self._decode(song.get("track")) or await self._fetch_song(song["id"], song.get("path"))
+            if track is not None:
+                entries.append((track, song.get("origin")))
+        for op, position, destination, _, _, origin, track in journal:
+            if op == "insert":
+                track = self._decode(track)
+                if track is not None:
+                    entries.insert(max(0, min(position, len(entries))), (track, origin))
+            elif not 0 <= position < len(entries):
+                logger.warning(f"Queue journal: {op} of row {position} out of range, skipped")
+            elif op == "remove":
+                entries.pop(position)
+            elif op == "move":
+                entries.insert(max(0, min(destination, len(entries) - 1)), entries.pop(position))
+        self._journaled = len(journal)
+        origins = [origin for _, origin in entries]
+        if not origins or None in origins:
+            origins = None
+        logger.info(f"Loaded queue of {len(entries)} songs, {len(journal)} edits from the journal")
+        return [track for track, _ in entries], origins, state.get("shuffle_seed")
+
+    async def _fetch_song(self, song_id: str, path: str | None) -> dict | None:
+        """song stored without its track, by versions before tracks were kept with the queue"""
+        if is_online_song(song_id):
+            return await self.database_manager.get_song(song_id)
+        song = await self.database_manager.get_local_song(song_id)
+        if song is not None:
+            song["path"] = path or ""
+        return song
+
+    @staticmethod
+    def _journal_row(op: str, *args) -> tuple:
+        if op == "insert":
+            row, track, origin = args
+            return op, row, None, track.get("videoId"), track.get("path"), origin, json.dumps(track, default=str)
+        if op == "move":
+            source, destination = args
+            return op, source, destination, None, None, None, None
+        return op, args[0], None, None, None, None, None
+
+    @staticmethod
+    def _snapshot_rows(tracks: list[dict], origins: list[int] | None) -> list[tuple]:
+        return [
+            (
+                track.get("videoId"), position, track.get("path"),
+                origins[position] if origins is not None else None, json.dumps(track, default=str)
+            )
+            for position, track in enumerate(tracks)
+        ]
+
+    @staticmethod
+    def _decode(track: str | None) -> dict | None:
+        if not track:
+            return None
+        try:
+            return json.loads(track)
+        except ValueError as e:
+            logger.error(f"Queue track could not be read: {e}")
+            return None
@@ -1,7 +1,7 @@
 from typing import Optional, Dict, Any, Union, List
 from mutagen import File
 from mutagen.mp3 import MP3
-from mutagen.flac import FLAC
+from mutagen.flac import FLAC, Picture
 from mutagen.mp4 import MP4
 from mutagen.ogg import OggFileType
 
@@ -9,6 +9,9 @@ from pathlib import Path
 from loguru import logger
 from PIL import Image
 from io import BytesIO
+import base64
+import os
+import re
 import xxhash
 import yt_dlp
 # import 
@@ -26,6 +29,14 @@ from src.utility.duration_parse import seconds_to_duration
 
 logger = logging.getLogger(__name__)
 
+# Supported formats for mutagen and QMediaPlayer
+SUPPORTED_FORMATS = frozenset((
+    # Mutagen-supported formats
+    ".mp3", ".flac", ".m4a", ".ogg", ".opus", ".wav", ".aiff", ".ape", ".wv", ".mp4", ".asf",
+    # QMediaPlayer-supported formats (common formats)
+    ".aac", ".alac", ".wma", ".m4b", ".m4r", ".3gp", ".3g2", ".amr", ".au", ".mid", ".midi"
+))
+
 def get_metadata(file_path: str) -> Optional[Dict[str, Any]]:
     """
     Extracts metadata from an audio file.
@@ -60,7 +71,6 @@ def get_metadata(file_path: str) -> Optional[Dict[str, Any]]:
             "bitrate": audio.info.bitrate,  # Bitrate in kbps
             "sample_rate": audio.info.sample_rate,  # Sample rate in Hz
             "channels": audio.info.channels,  # Number of audio channels
-            "cover": None  # Placeholder for cover art
         }
         if isinstance(audio, MP3):
             metadata["title"] = audio.tags.get("TIT2", "Unknown").text[0] if "TIT2" in audio else "Unknown"
@@ -82,20 +92,12 @@ def get_metadata(file_path: str) -> Optional[Dict[str, Any]]:
             metadata["artist"] = audio.get("ARTIST", ["Unknown"])[0]
             metadata["album"] = audio.get("ALBUM", ["Unknown"])[0]
 
-        # Extract cover art based on file format
-        if isinstance(audio, MP3):  # MP3 files
-            if 'APIC:' in audio.tags:
-                metadata["cover"] = audio.tags['APIC:'].data
-        elif isinstance(audio, FLAC):  # FLAC files
-            if audio.pictures:
-                metadata["cover"] = audio.pictures[0].data
-        elif isinstance(audio, MP4):  # M4A files (AAC, ALAC)
-            if 'covr' in audio.tags:
-                metadata["cover"] = audio.tags['covr'][0]
-        elif isinstance(audio, OggFileType):  # OGG files
-            if 'metadata_block_picture' in audio.tags:
-                metadata["cover"] = audio.tags['metadata_block_picture'][0]
+        artist = metadata.get("artist", "Unknown")
+        if isinstance(artist, list):
+            artist = ", ".join(artist) or "Unknown"
+        metadata["artist"] = metadata["artists"] = artist
 
+        # cover art is left to get_cover_data, it is only needed once per song
         return metadata
 
     except Exception as e:
@@ -103,6 +105,36 @@ def get_metadata(file_path: str) -> Optional[Dict[str, Any]]:
         return None
 
 
+def get_cover_data(file_path: str) -> Optional[bytes]:
+    """
+    Extracts the embedded cover art of an audio file.
+
+    Args:
+        file_path (str): Path to the audio file.
+
+    Returns:
+        Optional[bytes]: The encoded image, or None if the file has no cover or cannot be read.
+    """
+    try:
+        audio = File(file_path)
+        if audio is None or audio.tags is None:
+            return None
+        if isinstance(audio, MP3):  # MP3 files, any APIC frame whatever its description
+            pictures = audio.tags.getall("APIC")
+            return pictures[0].data if pictures else None
+        elif isinstance(audio, FLAC):  # FLAC files
+            return audio.pictures[0].data if audio.pictures else None
+        elif isinstance(audio, MP4):  # M4A files (AAC, ALAC)
+            covers = audio.tags.get("covr")
+            return bytes(covers[0]) if covers else None
+        elif isinstance(audio, OggFileType):  # OGG files, a base64 encoded FLAC picture block
+            pictures = audio.tags.get("metadata_block_picture")
+            return Picture(base64.b64decode(pictures[0])).data if pictures else None
+    except Exception as e:
+        logger.warning(f"Error extracting cover from {file_path}: {e}")
+    return None
+
+
 def get_songs_from_dir(dir_path: str, limit: int = -1) -> List[str]:
     """
     Returns a list of all songs in the given directory.
@@ -113,20 +145,12 @@ def get_songs_from_dir(dir_path: str, limit: int = -1) -> List[str]:
     Returns:
         List[str]: A list of file paths for all songs in the directory.
     """
-    # Supported formats for mutagen and QMediaPlayer
-    supported_formats = [
-        # Mutagen-supported formats
-        "mp3", "flac", "m4a", "ogg", "opus", "wav", "aiff", "ape", "wv", "mp4", "asf",
-        # QMediaPlayer-supported formats (common formats)
-        "aac", "alac", "wma", "m4b", "m4r", "3gp", "3g2", "amr", "au", "mid", "midi"
-    ]
-
     count = 0
     songs: List[str] = []
     try:
         # Iterate through all files in the directory
         for file in Path(dir_path).iterdir():
-            if file.is_file() and file.suffix.lower()[1:] in supported_formats:
+            if file.is_file() and file.suffix.lower() in SUPPORTED_FORMATS:
                 songs.append(str(file.absolute()))  # Use absolute path
                 if count == limit:
                     break
@@ -234,6 +258,52 @@ def generate_xxhash_uid(path: str) -> str:
         print(f"Error generating UID for {path}: {e}")
         return None
 
+PARTIAL_HASH_SIZE = 64 * 1024  # bytes hashed at each end of a file by track_uid
+
+
+def folder_uid(path: str) -> str:
+    """Id of a library folder: xxh3 of its normalised absolute path.
+
+    The same folder always gets the same id, however it was picked (trailing separator,
+    ``..`` segments or letter case on Windows), so adding it twice is a no-op.
+    """
+    path = os.path.normcase(os.path.abspath(os.path.normpath(str(path))))
+    return xxhash.xxh3_64(path.encode("utf-8", "surrogatepass")).hexdigest()
+
+
+def track_uid(path: str, size: int | None = None) -> str:
+    """Id of a local track: xxh3 of its size and of the first and last ``PARTIAL_HASH_SIZE`` bytes.
+
+    Reads at most 128 KiB whatever the file size, yet moving, renaming or copying a file
+    keeps its id, while re-encoding it does not. Raises ``OSError`` if the file cannot be read.
+    """
+    with open(path, "rb") as f:
+        if size is None:
+            size = os.fstat(f.fileno()).st_size
+        digest = xxhash.xxh3_64(size.to_bytes(8, "little"))
+        digest.update(f.read(PARTIAL_HASH_SIZE))
+        if size > 2 * PARTIAL_HASH_SIZE:
+            f.seek(size - PARTIAL_HASH_SIZE)
+        digest.update(f.read(PARTIAL_HASH_SIZE))
+    return digest.hexdigest()
+
+
+# separators of several artists in one tag: "A, B", "A; B", "A / B", "A feat. B", "A (ft. B)";
+# a bare "/" or "&" is usually part of the name (AC/DC, Simon & Garfunkel)
+_ARTIST_SEPARATOR = re.compile(r"\s*(?:[;,\x00]|\s/\s|[\s(](?:feat|ft|featuring|vs)\.?\s)\s*", re.IGNORECASE)
+
+
+def split_artists(artists: str | None) -> list[str]:
+    """Artist names of an artist tag, without the "Unknown" placeholder of untagged files."""
+    names = (name.strip(" ()[]") for name in _ARTIST_SEPARATOR.split(str(artists or "")))
+    return [name for name in names if name and name != "Unknown"]
+
+
+def tag_uid(key: str) -> str:
+    """Id of a local artist or album: xxh3 of its case folded name, the same name keeps its id."""
+    return xxhash.xxh3_64(key.encode("utf-8", "surrogatepass")).hexdigest()
+
+
 def get_stream_url(video_url):
     ydl_opts = {
         # "quiet": True,
@@ -0,0 +1,380 @@
+import os
+import sqlite3
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from PySide6.QtCore import QObject, QTimer, Signal
+from PIL import Image, features
+from loguru import logger
+
+from src.utility.enums import ImageFolder
+
+# size buckets (px, longest side) stored next to every original under ImageFolder
+SIZE_BUCKETS = (64, 128, 256, 512)
+VARIANT_FORMAT = "WEBP" if features.check("webp") else "JPEG"
+VARIANT_SUFFIX = ".webp" if VARIANT_FORMAT == "WEBP" else ".jpg"
+VARIANT_QUALITY = 85
+
+INDEX_NAME = "index.db"
+INDEX_VERSION = 1  # PRAGMA user_version of the index, 1: shared artwork is accounted once per blob
+ARTWORK_FOLDER = "artwork"
+CACHED_FOLDERS = (ImageFolder.SONG, ImageFolder.ALBUM, ImageFolder.ARTIST, ImageFolder.PLAYLIST, ImageFolder.BLUR)
+
+
+def write_atomic(output_path: str, write) -> None:
+    """Call ``write(tmp_path)`` on a temp file next to ``output_path`` and move it into place.
+
+    Readers never see a half written image: the file either does not exist yet or is complete.
+    """
+    directory, name = os.path.split(output_path)
+    fd, tmp_path = tempfile.mkstemp(prefix=f".{name}.", suffix=Path(name).suffix, dir=directory or None)
+    os.close(fd)
+    try:
+        write(tmp_path)
+        os.replace(tmp_path, output_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def bucket_for(size: float) -> int:
+    """Smallest bucket covering ``size`` device pixels, the largest bucket for bigger sizes."""
+    for bucket in SIZE_BUCKETS:
+        if size <= bucket:
+            return bucket
+    return SIZE_BUCKETS[-1]
+
+
+def variant_path(original_path: str, bucket: int) -> str:
+    """``.cache/thumbnail/song/{id}.png`` -> ``.cache/thumbnail/song/{bucket}/{id}.webp``"""
+    original = Path(original_path)
+    return str(original.parent / str(bucket) / f"{original.stem}{VARIANT_SUFFIX}")
+
+
+def generate_variants(original_path: str, image: Image.Image | None = None) -> list:
+    """Write every bucket smaller than the original image. Runs on worker threads.
+
+    Args:
+        original_path (str): stored full size thumbnail.
+        image (Image.Image, optional): already decoded original, avoids decoding it again.
+
+    Returns:
+        list: paths of the variants written.
+    """
+    if image is None:
+        with Image.open(original_path) as img:
+            image = img.convert("RGB")
+    elif image.mode != "RGB":
+        image = image.convert("RGB")
+
+    written = []
+    longest = max(image.size)
+    # largest first so every resize starts from the closest bigger image
+    source = image
+    for bucket in reversed(SIZE_BUCKETS):
+        if bucket >= longest:
+            continue
+        path = variant_path(original_path, bucket)
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        resized = source.copy()
+        resized.thumbnail((bucket, bucket), Image.Resampling.LANCZOS)
+        write_atomic(path, lambda tmp_path: resized.save(tmp_path, VARIANT_FORMAT, quality=VARIANT_QUALITY))
+        written.append(path)
+        source = resized
+    return written
+
+
+def is_cached_thumbnail(path: str) -> bool:
+    """True for images stored under ``ImageFolder.IMAGE_DIR``, the only ones with variants."""
+    root = os.path.abspath(ImageFolder.IMAGE_DIR.value)
+    return os.path.abspath(path).startswith(root + os.sep)
+
+
+def has_variants(original_path: str) -> bool:
+    return Path(variant_path(original_path, SIZE_BUCKETS[0])).exists()
+
+
+def cover_for_size(cover_path: str, size: float) -> str:
+    """Path of the stored image best matching a widget of ``size`` device pixels.
+
+    Falls back to the next bigger bucket and finally the original. Originals stored before
+    variants existed get their variants generated in the background for the next lookup.
+    """
+    if not cover_path or size > SIZE_BUCKETS[-1] or not is_cached_thumbnail(cover_path):
+        return cover_path
+    from src.utility.artwork_store import ArtworkStore
+    ThumbnailCacheManager.instance().touch(cover_path)
+    blob = ArtworkStore.instance().resolve(cover_path)
+    if blob != cover_path and os.path.exists(blob):
+        cover_path = blob
+    index = SIZE_BUCKETS.index(bucket_for(size))
+    for bucket in SIZE_BUCKETS[index:]:
+        path = variant_path(cover_path, bucket)
+        if os.path.exists(path):
+            return path
+    if not has_variants(cover_path) and os.path.exists(cover_path):
+        from src.utility.downloader.thumbnail_service import ThumbnailService
+        ThumbnailService.instance().ensure_variants(cover_path)
+    return cover_path
+
+
+def widget_cover(cover_path: str, widget) -> str:
+    """``cover_for_size`` for the current size and pixel ratio of ``widget``."""
+    size = widget.size()
+    return cover_for_size(cover_path, max(size.width(), size.height()) * widget.devicePixelRatioF())
+
+
+def _files_of(original_path: str) -> list:
+    """The original thumbnail and every variant stored for it."""
+    return [original_path] + [variant_path(original_path, bucket) for bucket in SIZE_BUCKETS]
+
+
+def _stored_size(original_path: str, linked_to: str | None = None) -> int:
+    """Bytes of an original and its variants, the original is not counted when it is a hard
+    link to ``linked_to``, the blob that accounts for those bytes."""
+    size = 0
+    for path in _files_of(original_path):
+        try:
+            if path == original_path and linked_to and os.path.samefile(path, linked_to):
+                continue
+            size += os.stat(path).st_size
+        except OSError:
+            pass
+    return size
+
+
+def _remove_files(paths: list) -> int:
+    """Delete ``paths`` and return the bytes actually freed, a hard link only frees them as the last one."""
+    freed = 0
+    for path in paths:
+        try:
+            stat = os.stat(path)
+            os.remove(path)
+            if stat.st_nlink <= 1:
+                freed += stat.st_size
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning(f"Failed to evict thumbnail {path}: {e}")
+    return freed
+
+
+class ThumbnailCacheManager(QObject):
+    """Size accounting and LRU eviction for ``ImageFolder.IMAGE_DIR``.
+
+    A small sqlite index keeps one row per stored thumbnail (variants are counted with
+    their original) with its size and last access. Artwork shared through ``ArtworkStore``
+    is accounted once per blob, with the blob's variants, in a table of its own: a
+    thumbnail linked to a blob only counts the bytes it does not share, and blobs are never
+    evicted by themselves but deleted with the last thumbnail referencing them. Accesses
+    are buffered in memory on the GUI thread and flushed in batches; the index and all file
+    deletions live on a single worker thread. ``trim`` evicts the least recently used
+    thumbnails until the cache is back under 90% of the quota, skipping every id in
+    ``protected_ids``.
+    """
+    trimmed = Signal(int, int)  # thumbnails removed, bytes freed
+
+    FLUSH_INTERVAL = 30 * 1000  # ms
+    TRIM_TARGET = 0.9
+
+    _instance = None
+
+    def __init__(self, root: str = ImageFolder.IMAGE_DIR.value, parent=None):
+        super().__init__(parent)
+        self.root = root
+        self.index_path = os.path.join(root, INDEX_NAME)
+        self.artwork_root = os.path.join(root, ARTWORK_FOLDER)
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="thumbnail-cache")
+        self._db = None  # only used on the executor thread
+        self._accessed = dict()  # {path: timestamp}
+        self._written = set()
+
+        self.flush_timer = QTimer(self)
+        self.flush_timer.setInterval(self.FLUSH_INTERVAL)
+        self.flush_timer.timeout.connect(self.flush)
+        self.flush_timer.start()
+
+    @classmethod
+    def instance(cls) -> "ThumbnailCacheManager":
+        if cls._instance is None:
+            cls._instance = ThumbnailCacheManager()
+        return cls._instance
+
+    def touch(self, path: str):
+        """Mark a thumbnail as used, cheap enough to call on every cover load."""
+        self._accessed[path] = time.time()
+
+    def record(self, path: str):
+        """Account for a thumbnail or artwork blob (and its variants) that was just written."""
+        self._written.add(path)
+        self._accessed[path] = time.time()
+
+    def flush(self):
+        if not self._accessed and not self._written:
+            return
+        accessed, self._accessed = self._accessed, dict()
+        written, self._written = self._written, set()
+        self.executor.submit(self._apply, accessed, written)
+
+    def trim(self, protected_ids: set, quota_bytes: int):
+        """Evict least recently used thumbnails in the background until under quota."""
+        self.flush()
+        future = self.executor.submit(self._evict, set(protected_ids), quota_bytes)
+        future.add_done_callback(lambda future: self._on_trimmed(future))
+
+    def shutdown(self):
+        self.flush_timer.stop()
+        self.flush()
+        self.executor.submit(self._close)
+        self.executor.shutdown(wait=True)
+
+    def _on_trimmed(self, future):
+        if future.exception() is not None:
+            logger.error(f"Thumbnail cache trim failed: {future.exception()}")
+            return
+        removed, freed = future.result()
+        if removed:
+            self.trimmed.emit(removed, freed)
+
+    # worker thread
+    def _connect(self) -> sqlite3.Connection:
+        if self._db is None:
+            Path(self.root).mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(self.index_path)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS thumbnails ("
+                "path TEXT PRIMARY KEY, item_id TEXT NOT NULL, size INTEGER NOT NULL, last_access REAL NOT NULL)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS idx_thumbnails_access ON thumbnails(last_access)")
+            self._db.execute("CREATE TABLE IF NOT EXISTS artwork_sizes (blob TEXT PRIMARY KEY, size INTEGER NOT NULL)")
+            version = self._db.execute("PRAGMA user_version").fetchone()[0]
+            if self._db.execute("SELECT COUNT(*) FROM thumbnails").fetchone()[0] == 0:
+                self._rebuild()
+            elif version < 1:
+                self._reaccount()
+            if version < INDEX_VERSION:
+                self._db.execute(f"PRAGMA user_version = {INDEX_VERSION}")
+        return self._db
+
+    def _is_blob(self, path: str) -> bool:
+        return os.path.abspath(path).startswith(os.path.abspath(self.artwork_root) + os.sep)
+
+    def _size_row(self, path: str) -> tuple[int, str | None]:
+        """Bytes only ``path`` accounts for and the artwork blob it shares, None if it has none."""
+        from src.utility.artwork_store import ArtworkStore
+        blob = ArtworkStore.instance().resolve(path)
+        blob = blob if blob != path else None
+        return _stored_size(path, blob), blob
+
+    def _rebuild(self):
+        """Index thumbnails stored before the index existed, using mtime as last access."""
+        rows = []
+        for folder in CACHED_FOLDERS:
+            try:
+                entries = list(os.scandir(folder.path))
+            except OSError:
+                continue
+            for entry in entries:
+                if entry.is_file() and not entry.name.startswith("."):
+                    stat = entry.stat()
+                    rows.append((entry.path, Path(entry.name).stem, self._size_row(entry.path)[0], stat.st_mtime))
+        with self._db:
+            self._db.executemany("INSERT OR REPLACE INTO thumbnails VALUES (?, ?, ?, ?)", rows)
+            self._rebuild_blobs()
+        logger.info(f"Thumbnail cache index built: {len(rows)} thumbnails")
+
+    def _reaccount(self):
+        """Move the sizes of an index that counted shared artwork once per id to one count per blob."""
+        paths = [row[0] for row in self._db.execute("SELECT path FROM thumbnails")]
+        with self._db:
+            self._db.executemany(
+                "DELETE FROM thumbnails WHERE path = ?", [(path,) for path in paths if self._is_blob(path)]
+            )
+            self._db.executemany(
+                "UPDATE thumbnails SET size = ? WHERE path = ?",
+                [(self._size_row(path)[0], path) for path in paths if not self._is_blob(path)]
+            )
+            self._rebuild_blobs()
+        logger.info(f"Thumbnail cache index re-accounted: {len(paths)} thumbnails")
+
+    def _rebuild_blobs(self):
+        rows = []
+        try:
+            shards = [entry.path for entry in os.scandir(self.artwork_root) if entry.is_dir()]
+        except OSError:
+            shards = []
+        for shard in shards:
+            for entry in os.scandir(shard):
+                if entry.is_file() and not entry.name.startswith("."):
+                    rows.append((entry.path, _stored_size(entry.path)))
+        self._db.execute("DELETE FROM artwork_sizes")
+        self._db.executemany("INSERT INTO artwork_sizes VALUES (?, ?)", rows)
+
+    def _apply(self, accessed: dict, written: set):
+        db = self._connect()
+        thumbnails, blobs = [], set()
+        for path in written:
+            if self._is_blob(path):
+                blobs.add(path)
+                continue
+            size, blob = self._size_row(path)
+            thumbnails.append((path, Path(path).stem, size, accessed.get(path, time.time())))
+            if blob is not None:
+                blobs.add(blob)
+        with db:
+            db.executemany("INSERT OR REPLACE INTO thumbnails VALUES (?, ?, ?, ?)", thumbnails)
+            db.executemany(
+                "INSERT OR REPLACE INTO artwork_sizes VALUES (?, ?)",
+                [(blob, _stored_size(blob)) for blob in blobs if os.path.exists(blob)]
+            )
+            db.executemany(
+                "UPDATE thumbnails SET last_access = ? WHERE path = ?",
+                [(timestamp, path) for path, timestamp in accessed.items() if path not in written]
+            )
+
+    def _evict(self, protected_ids: set, quota_bytes: int):
+        from src.utility.artwork_store import ArtworkStore
+        db = self._connect()
+        total = (
+            db.execute("SELECT COALESCE(SUM(size), 0) FROM thumbnails").fetchone()[0]
+            + db.execute("SELECT COALESCE(SUM(size), 0) FROM artwork_sizes").fetchone()[0]
+        )
+        if total <= quota_bytes:
+            return 0, 0
+        target = quota_bytes * self.TRIM_TARGET
+        removed, freed, evicted, blobs = 0, 0, [], []
+        rows = db.execute("SELECT path, item_id FROM thumbnails ORDER BY last_access").fetchall()
+        for path, item_id in rows:
+            if total - freed <= target:
+                break
+            if item_id in protected_ids:
+                continue
+            # a linked id path only frees what it does not share, the blob goes with its last id
+            freed += _remove_files(_files_of(path))
+            blob = ArtworkStore.instance().forget(path)
+            if blob is not None:
+                freed += _remove_files(_files_of(blob))
+                blobs.append((blob,))
+            evicted.append((path,))
+            removed += 1
+        with db:
+            db.executemany("DELETE FROM thumbnails WHERE path = ?", evicted)
+            db.executemany("DELETE FROM artwork_sizes WHERE blob = ?", blobs)
+        logger.info(
+            f"Thumbnail cache trimmed: {removed} thumbnails, {len(blobs)} artwork blobs, {freed / 2**20:.1f} MiB freed"
+        )
+        return removed, freed
+
+    def _close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+
+if __name__ == "__main__":
+    for size in (32, 64, 84, 150, 168, 300, 1280):
+        print(size, bucket_for(size), variant_path(r".cache/thumbnail/song/abc.png", bucket_for(size)))
+    print(f"variant format: {VARIANT_FORMAT}")
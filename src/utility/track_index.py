@@ -0,0 +1,162 @@
+import bisect
+import re
+import unicodedata
+
+from src.utility.enums import SortType
+
+_WORD = re.compile(r"\w+")
+
+
+def collation_key(text) -> str:
+    """Case and accent insensitive form of ``text``, compared with plain string ordering."""
+    text = str(text or "").strip()
+    if text.isascii():
+        return text.casefold()
+    text = unicodedata.normalize("NFKD", text).casefold()
+    return "".join(char for char in text if not unicodedata.combining(char))
+
+
+def tokenize(text: str) -> list[str]:
+    return _WORD.findall(collation_key(text))
+
+
+class TrackKeys:
+    """Everything sorting and filtering needs of one track, computed once."""
+    __slots__ = ("track", "title", "artist", "album", "duration", "mtime", "path", "words")
+
+    def __init__(self, track: dict):
+        self.track = track
+        self.title = collation_key(track.get("title"))
+        self.artist = collation_key(track.get("artists"))
+        self.album = collation_key(track.get("album"))
+        self.duration = float(track.get("duration_sec") or 0)
+        self.mtime = float(track.get("mtime") or 0)
+        self.path = track.get("path") or ""
+        # " word word ...", a query token matches a word it starts
+        self.words = " " + " ".join(_WORD.findall(f"{self.title} {self.artist} {self.album}"))
+
+    def sort_key(self, sort_type: SortType):
+        """Ascending key of ``sort_type``, descending types use the key of their ascending one.
+
+        Text keys are one string with the fields joined by NUL, which orders like the tuple of
+        fields but is compared in a single C call instead of field by field.
+        """
+        if sort_type is SortType.ARTIST:
+            return f"{self.artist}\0{self.album}\0{self.title}\0{self.path}"
+        if sort_type is SortType.ALBUM:
+            return f"{self.album}\0{self.artist}\0{self.title}\0{self.path}"
+        if sort_type is SortType.NEWEST or sort_type is SortType.OLDEST:
+            return self.mtime, f"{self.title}\0{self.artist}\0{self.path}"
+        if sort_type is SortType.DURATION:
+            return self.duration, f"{self.title}\0{self.artist}\0{self.path}"
+        return f"{self.title}\0{self.artist}\0{self.path}"
+
+
+class TrackIndex:
+    """Sort and filter index over the rows of a track list.
+
+    Keys are computed once per track. The order of every ``SortType`` is built with a
+    single sort the first time it is asked for and then kept up to date: appended rows are
+    inserted by bisection, removed rows are dropped with the rows behind them shifted, so
+    switching sorts or adding the next chunk of a scan never sorts the whole list again.
+    Descending sorts are served by reading the ascending order backwards.
+    """
+    # descending sort -> ascending sort it is read backwards from
+    DESCENDING = {SortType.Z2A: SortType.A2Z, SortType.NEWEST: SortType.OLDEST}
+    # sorted by a number, ties in A to Z order
+    NUMERIC = {SortType.OLDEST: "mtime", SortType.DURATION: "duration"}
+
+    def __init__(self, tracks: list[dict] | None = None):
+        self._keys = list()    # TrackKeys per row
+        self._orders = dict()  # {SortType: rows in ascending order}
+        if tracks:
+            self.reset(tracks)
+
+    def __len__(self):
+        return len(self._keys)
+
+    def reset(self, tracks: list[dict]):
+        # keys of unchanged tracks are reused, the same dict means the same tags
+        known = {id(keys.track): keys for keys in self._keys}
+        self._keys = [known.get(id(track)) or TrackKeys(track) for track in tracks]
+        self._orders.clear()
+
+    def append(self, tracks: list[dict]):
+        first = len(self._keys)
+        self._keys.extend(TrackKeys(track) for track in tracks)
+        for sort_type, order in self._orders.items():
+            for row in range(first, len(self._keys)):
+                bisect.insort(order, row, key=self._row_key(sort_type))
+
+    def update(self, row: int, track: dict):
+        old, keys = self._keys[row], TrackKeys(track)
+        self._keys[row] = keys
+        for sort_type, order in self._orders.items():
+            if old.sort_key(sort_type) == keys.sort_key(sort_type):
+                continue
+            order.remove(row)
+            bisect.insort(order, row, key=self._row_key(sort_type))
+
+    def remove(self, rows: list[int]):
+        """Drop ``rows``, the rows after them move up like in the list model."""
+        removed = set(rows)
+        if not removed:
+            return
+        # new row of every old row, -1 for removed ones; the rows between two removed rows
+        # move up by the same count and are filled in as one slice
+        count = len(self._keys)
+        moved, previous = [-1] * count, -1
+        for shift, row in enumerate(sorted(removed) + [count]):
+            moved[previous + 1:row] = range(previous + 1 - shift, row - shift)
+            previous = row
+        self._keys = [keys for row, keys in enumerate(self._keys) if moved[row] >= 0]
+        for order in self._orders.values():
+            order[:] = [moved[row] for row in order if moved[row] >= 0]
+
+    def order(self, sort_type: SortType | None) -> list[int]:
+        """Rows in ``sort_type`` order, in list order for None."""
+        if sort_type is None:
+            return list(range(len(self._keys)))
+        ascending = self.DESCENDING.get(sort_type, sort_type)
+        order = self._orders.get(ascending)
+        if order is None:
+            order = self._orders[ascending] = self._sort(ascending)
+        return order[::-1] if ascending is not sort_type else list(order)
+
+    def _sort(self, sort_type: SortType) -> list[int]:
+        field = self.NUMERIC.get(sort_type)
+        if field is None:
+            sort_keys = [keys.sort_key(sort_type) for keys in self._keys]
+            return sorted(range(len(sort_keys)), key=sort_keys.__getitem__)
+        # a stable sort of the A to Z order keeps it for equal numbers
+        values = [getattr(keys, field) for keys in self._keys]
+        return sorted(self.order(SortType.A2Z), key=values.__getitem__)
+
+    def _row_key(self, sort_type: SortType):
+        keys = self._keys
+        return lambda row: keys[row].sort_key(sort_type)
+
+    def matches(self, query: str) -> set[int] | None:
+        """Rows whose title, artist or album has a word starting with every token of ``query``,
+        None if the query has no tokens and every row matches."""
+        tokens = [" " + token for token in tokenize(query)]
+        if not tokens:
+            return None
+        keys = self._keys
+        # narrowed token by token, later tokens only test the rows left
+        rows = [row for row, row_keys in enumerate(keys) if tokens[0] in row_keys.words]
+        for token in tokens[1:]:
+            rows = [row for row in rows if token in keys[row].words]
+        return set(rows)
+
+    def collapse(self, rows: list[int], groups: dict) -> list[int]:
+        """``rows`` with only the first row of every song, rows of one song id or of one
+        duplicate group in ``groups`` ({song_id: group id}) count as one song."""
+        keys, seen, result = self._keys, set(), list()
+        for row in rows:
+            song_id = keys[row].track.get("videoId")
+            song = groups.get(song_id, song_id)
+            if song not in seen:
+                seen.add(song)
+                result.append(row)
+        return result
@@ -0,0 +1,54 @@
+from src.utility.play_queue import PlayQueue
+
+
+def queue_of(*song_ids: str) -> PlayQueue:
+    queue = PlayQueue()
+    queue.reset([{"videoId": song_id} for song_id in song_ids])
+    return queue
+
+
+def song_ids(queue: PlayQueue) -> list[str]:
+    return [track["videoId"] for track in queue.tracks]
+
+
+def test_groups_set_after_queueing_key_the_queued_tracks():
+    queue = queue_of("B", "C")
+    queue.set_groups({"A": "A", "B": "A"})
+    assert queue.row_of("B") == 0
+    assert queue.row_of("A") == 0
+    assert "B" in queue and "A" in queue
+    assert queue.insert({"videoId": "B"}) == -1
+    assert queue.insert({"videoId": "A"}) == -1
+    assert song_ids(queue) == ["B", "C"]
+
+
+def test_groups_set_after_queueing_collapse_to_the_first_track():
+    events = list()
+    queue = queue_of("B", "C", "A", "D")
+    queue.select(2)
+    queue.listener = lambda op, *args: events.append(op)
+    assert queue.set_groups({"A": "A", "B": "A"}) == 1
+    assert song_ids(queue) == ["B", "C", "D"]
+    assert queue.current == 0
+    assert [queue.row_of(song_id) for song_id in ("A", "B", "C", "D")] == [0, 0, 1, 2]
+    assert events == ["reset"]
+
+
+def test_groups_set_while_shuffled_keep_the_origins_of_kept_tracks():
+    queue = queue_of("A", "B", "C")
+    queue.shuffle(seed=1)
+    origins = dict(zip(song_ids(queue), queue.origins))
+    queue.set_groups({"C": "A", "A": "A"})
+    assert len(queue) == 2
+    assert queue.origins == [origins[song_id] for song_id in song_ids(queue)]
+    kept = sorted(song_ids(queue), key=origins.get)
+    queue.unshuffle()
+    assert song_ids(queue) == kept
+
+
+def test_groups_dropped_split_the_group_again():
+    queue = queue_of("B", "C")
+    queue.set_groups({"A": "A", "B": "A"})
+    queue.set_groups(dict())
+    assert "A" not in queue
+    assert queue.insert({"videoId": "A"}) == 2